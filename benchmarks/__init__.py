@@ -0,0 +1,3 @@
+"""
+Benchmarks of jadoc. Run ``python -m benchmarks`` or ``bin/bench``.
+"""
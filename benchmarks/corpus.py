@@ -0,0 +1,245 @@
+"""
+A synthetic Japanese corpus for scale and throughput testing.
+
+Sentences are built from templates over a small lexicon with words of every
+conjugation type of jadoc. The conjugated forms are written out by hand rather
+than generated by jadoc, so the corpus does not depend on the code under test.
+The same seed always gives the same corpus.
+
+Usage: python -m benchmarks.corpus [-h]
+"""
+
+import argparse
+import random
+import sys
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.word.ctype import ALL_CTYPE, Nothing
+from jadoc.word.word import Word
+
+
+class Verb(NamedTuple):
+    """The forms of a verb that the templates use."""
+
+    plain: str  # 終止形
+    renyo: str  # 連用形, before ます
+    mizen: str  # 未然形, before ない
+    te: str
+    ta: str
+    katei: str  # 仮定形, before ば
+    ishi: str  # 意志推量形
+
+
+class Adjective(NamedTuple):
+    plain: str
+    ku: str
+    katta: str
+    katei: str
+
+
+VERBS: Dict[str, List[Verb]] = {
+    "Godan": [
+        Verb("話す", "話し", "話さ", "話して", "話した", "話せ", "話そう"),
+        Verb("出す", "出し", "出さ", "出して", "出した", "出せ", "出そう"),
+    ],
+    "GodanI": [
+        Verb("書く", "書き", "書か", "書いて", "書いた", "書け", "書こう"),
+        Verb("歩く", "歩き", "歩か", "歩いて", "歩いた", "歩け", "歩こう"),
+        Verb("泳ぐ", "泳ぎ", "泳が", "泳いで", "泳いだ", "泳げ", "泳ごう"),
+    ],
+    "GodanZ": [
+        Verb("待つ", "待ち", "待た", "待って", "待った", "待て", "待とう"),
+        Verb("作る", "作り", "作ら", "作って", "作った", "作れ", "作ろう"),
+        Verb("買う", "買い", "買わ", "買って", "買った", "買え", "買おう"),
+    ],
+    "GodanN": [
+        Verb("読む", "読み", "読ま", "読んで", "読んだ", "読め", "読もう"),
+        Verb("遊ぶ", "遊び", "遊ば", "遊んで", "遊んだ", "遊べ", "遊ぼう"),
+        Verb("休む", "休み", "休ま", "休んで", "休んだ", "休め", "休もう"),
+    ],
+    "GodanU": [
+        Verb("問う", "問い", "問わ", "問うて", "問うた", "問え", "問おう"),
+    ],
+    "Rahen": [
+        Verb("ある", "あり", "", "あって", "あった", "あれ", "あろう"),
+    ],
+    "Ichidan": [
+        Verb("見る", "見", "見", "見て", "見た", "見れ", "見よう"),
+        Verb("食べる", "食べ", "食べ", "食べて", "食べた", "食べれ", "食べよう"),
+        Verb("調べる", "調べ", "調べ", "調べて", "調べた", "調べれ", "調べよう"),
+    ],
+    "Kahen": [
+        Verb("来る", "来", "来", "来て", "来た", "来れ", "来よう"),
+    ],
+    "Sahen": [
+        Verb("する", "し", "し", "して", "した", "すれ", "しよう"),
+        Verb(
+            "勉強する",
+            "勉強し",
+            "勉強し",
+            "勉強して",
+            "勉強した",
+            "勉強すれ",
+            "勉強しよう",
+        ),
+    ],
+}
+ADJECTIVES = [
+    Adjective("美しい", "美しく", "美しかった", "美しけれ"),
+    Adjective("楽しい", "楽しく", "楽しかった", "楽しけれ"),
+    Adjective("高い", "高く", "高かった", "高けれ"),
+    Adjective("新しい", "新しく", "新しかった", "新しけれ"),
+]
+PERSONS = ["私", "彼", "先生", "学生", "母", "田中さん"]
+PLACES = ["学校", "図書館", "公園", "駅", "家", "会社"]
+TIMES = ["今日", "昨日", "明日", "毎日", "朝", "夜"]
+NOUNS = ["本", "手紙", "映画", "料理", "山", "海", "花", "写真"]
+
+# {v} is a Verb and {a} an Adjective. Verbs other than ある follow an agent,
+# and ある follows the place where something is.
+VERB_ENDINGS = [
+    "{v.plain}。",
+    "{v.renyo}ます。",
+    "{v.renyo}ました。",
+    "{v.renyo}ません。",
+    "{v.renyo}ましょう。",
+    "{v.mizen}ない。",
+    "{v.mizen}なかった。",
+    "{v.ta}。",
+    "{v.te}いる。",
+    "{v.te}ください。",
+    "{v.ishi}。",
+    "{v.katei}ば、{a.plain}。",
+    "{v.ta}ので、{a.katta}です。",
+]
+AGENT = ["{person}は{place}で", "{time}、{person}は", "{time}は{place}で"]
+EXISTENCE = ["{place}に{noun}が", "{time}は{place}に{noun}が"]
+OTHER_TEMPLATES = [
+    "{noun}は{a.plain}。",
+    "{noun}はとても{a.plain}です。",
+    "{noun}は{a.ku}ない。",
+    "{time}の{noun}は{a.katta}。",
+    "{a.katei}ば、{person}は{place}に来る。",
+    "{person}は{noun}だ。",
+    "{person}は{noun}だった。",
+    "{noun}は{place}です。",
+    "{noun}は{place}でした。",
+    "{noun}なら{place}でしょう。",
+    "{a.plain}{noun}だろう。",
+]
+
+
+class CorpusGenerator:
+    """
+    A deterministic generator of synthetic sentences.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Seed of the random numbers (the default is 0).
+    duplicate_rate : float, optional
+        The probability that a sentence repeats one generated before (the
+        default is 0.0).
+
+    Examples
+    --------
+    >>> generator = CorpusGenerator(seed=1)
+    >>> assert generator.sentences(3) == CorpusGenerator(seed=1).sentences(3)
+    """
+
+    def __init__(self, seed: int = 0, duplicate_rate: float = 0.0) -> None:
+        if not 0.0 <= duplicate_rate <= 1.0:
+            raise ValueError("duplicate_rate must be between 0 and 1.")
+        self.random = random.Random(seed)
+        self.duplicate_rate = duplicate_rate
+        self._generated: List[str] = []
+        self._verbs = [v for ctype in sorted(VERBS) for v in VERBS[ctype]]
+
+    def _fill(self, template: str, verb: Optional[Verb] = None) -> str:
+        choice = self.random.choice
+        return template.format(
+            v=verb or choice(self._verbs),
+            a=choice(ADJECTIVES),
+            person=choice(PERSONS),
+            place=choice(PLACES),
+            time=choice(TIMES),
+            noun=choice(NOUNS),
+        )
+
+    def _new_sentence(self) -> str:
+        if self.random.random() < 0.25:
+            return self._fill(self.random.choice(OTHER_TEMPLATES))
+        verb = self.random.choice(self._verbs)
+        head = EXISTENCE if verb.plain == "ある" else AGENT
+        template = self.random.choice(head) + self.random.choice(VERB_ENDINGS)
+        if verb.plain == "ある":
+            template = template.replace("{v.mizen}ない", "ない")
+        return self._fill(template, verb)
+
+    def sentence(self) -> str:
+        """Generate a sentence, which may be a duplicate."""
+        if self._generated and self.random.random() < self.duplicate_rate:
+            return self.random.choice(self._generated)
+        sentence = self._new_sentence()
+        self._generated.append(sentence)
+        return sentence
+
+    def sentences(self, n: int) -> List[str]:
+        return [self.sentence() for _ in range(n)]
+
+    def documents(self, n: int, sentences_per_document: int = 10) -> Iterator[str]:
+        """Generate ``n`` documents of ``sentences_per_document`` sentences."""
+        for _ in range(n):
+            yield "".join(self.sentences(sentences_per_document))
+
+
+def ctype_counts(
+    sentences: List[str], tokenize: Callable[[str], List[Word]]
+) -> Counter:
+    """Count the words of each conjugation type in ``sentences``."""
+    counts: Counter = Counter()
+    for sentence in sentences:
+        for word in tokenize(sentence):
+            if word.has_conjugation:
+                counts[type(word.c_type).__name__] += 1
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="bench-corpus", description="Print a synthetic corpus, one per line."
+    )
+    parser.add_argument("-n", "--size", type=int, default=1000, help="sentences")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--per-line",
+        type=int,
+        default=1,
+        help="sentences per line, i.e. per document (the default is 1)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print the words of each conjugation type instead",
+    )
+    args = parser.parse_args(argv)
+
+    generator = CorpusGenerator(args.seed, args.duplicate_rate)
+    sentences = generator.sentences(args.size)
+    if args.stats:
+        counts = ctype_counts(sentences, generate_tokenizer())
+        for ctype in ALL_CTYPE:
+            if ctype is not Nothing:
+                print(f"{ctype.__name__:<16}{counts[ctype.__name__]:>10}")
+        print(f"{'unique':<16}{len(set(sentences)):>10}")
+        return 0
+    for i in range(0, len(sentences), args.per_line):
+        print("".join(sentences[i : i + args.per_line]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Benchmarks of ``Doc.update`` and the equivalent ``insert`` followed by ``delete``.
+
+A sentence in the middle of a document is edited and the edit is undone, so
+that every call sees the same document.
+"""
+
+from typing import Any, Callable, List
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.word.word import Word
+
+from .harness import benchmark
+
+SENTENCE = "本を書きました。毎日とても歩きます。"
+EDITED = range(2, 4)  # 書き/まし
+SIZES = (10, 1_000, 10_000)  # sentences
+
+_conjugation = Conjugation(generate_tokenizer())
+
+
+def _insert_and_delete(doc: Doc, interval: range, words: List[Word]) -> None:
+    n = len(words)
+    doc.insert(interval.start, words)
+    doc.delete(range(interval.start + n, interval.stop + n))
+
+
+def _setup(
+    edit: Callable[[Doc, range, List[Word]], None], size: int
+) -> Callable[[], Any]:
+    doc = Doc(SENTENCE * size, _conjugation, history_size=2)
+    n = len(_conjugation.tokenize(SENTENCE))
+    start = n * (size // 2)
+    interval = range(start + EDITED.start, start + EDITED.stop)
+    words = _conjugation.tokenize("読む")
+
+    def run() -> None:
+        checkpoint = doc.checkpoint()
+        edit(doc, interval, words)
+        doc.undo(checkpoint)
+
+    return run
+
+
+def _register(name: str, edit: Callable[[Doc, range, List[Word]], None]) -> None:
+    for size in SIZES:
+        benchmark(f"edit.{name}_{size}")(lambda size=size: _setup(edit, size))
+
+
+_register("update", Doc.update)
+_register("insert_delete", _insert_and_delete)
@@ -0,0 +1,210 @@
+"""
+Registry, timing, and baseline comparison of the benchmarks.
+
+Run ``python -m benchmarks -h`` (or ``bin/bench -h``) for the options.
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import jadoc
+
+Setup = Callable[[], Callable[[], Any]]
+
+BENCHMARKS: Dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register a benchmark.
+
+    The decorated function prepares the inputs and returns the function to be
+    timed, so that the preparation is not measured.
+    """
+
+    def register(setup: Setup) -> Setup:
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark: {name}")
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+class Stats(NamedTuple):
+    """Seconds per call."""
+
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    number: int
+    repeat: int
+
+
+def _time(func: Callable[[], Any], number: int) -> float:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        begin = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - begin
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure(
+    func: Callable[[], Any], repeat: int = 7, warmup: int = 1, min_time: float = 0.05
+) -> Stats:
+    """Time ``func``.
+
+    After ``warmup`` calls, the number of calls per repetition is raised in the
+    sequence 1, 2, 5, 10, 20, ... until a repetition takes ``min_time`` seconds.
+    The garbage collector is disabled while timing, as in ``timeit``.
+    """
+    for _ in range(warmup):
+        func()
+    number = 1
+    for i in range(30):
+        number = (1, 2, 5)[i % 3] * 10 ** (i // 3)
+        if _time(func, number) >= min_time:
+            break
+    times = [_time(func, number) / number for _ in range(repeat)]
+    return Stats(
+        min=min(times),
+        median=statistics.median(times),
+        mean=statistics.mean(times),
+        stdev=statistics.stdev(times) if repeat > 1 else 0.0,
+        number=number,
+        repeat=repeat,
+    )
+
+
+def select(patterns: List[str]) -> List[str]:
+    """Get the names of the benchmarks that match any of the glob ``patterns``."""
+    if not patterns:
+        return sorted(BENCHMARKS)
+    return sorted(
+        name
+        for name in BENCHMARKS
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+    )
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{unit}"
+    return f"{seconds / 1e-9:.3g}ns"
+
+
+def environment() -> Dict[str, str]:
+    """Describe where the benchmarks are run, to be saved with the results."""
+    return {
+        "jadoc": jadoc.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run(
+    names: List[str], repeat: int = 7, warmup: int = 1, min_time: float = 0.05
+) -> Dict[str, Any]:
+    """Run the benchmarks and print their median times.
+
+    Returns
+    -------
+    dict
+        The environment under ``meta`` and the ``Stats`` of each benchmark under
+        ``results``, ready to be saved as JSON.
+    """
+    results = {}
+    for name in names:
+        stats = measure(BENCHMARKS[name](), repeat, warmup, min_time)
+        results[name] = stats._asdict()
+        print(f"{name:<40} {format_time(stats.median):>10} ± {stats.stdev:.1e}s")
+    return {"meta": environment(), "results": results}
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[Tuple[str, float]]:
+    """Compare the median times with ``baseline``.
+
+    Returns
+    -------
+    list of tuple
+        The names and time ratios of the benchmarks that are slower than the
+        baseline by more than ``threshold``, e.g. 0.1 for 10%.
+    """
+    regressions = []
+    print(f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, stats in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = stats["median"] / base["median"]
+        mark = ""
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+            mark = "  REGRESSION"
+        elif ratio < 1 / (1 + threshold):
+            mark = "  improved"
+        print(
+            f"{name:<40} {format_time(base['median']):>10}"
+            f" {format_time(stats['median']):>10} {ratio:>7.2f}{mark}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="bench", description="Run the benchmarks of jadoc."
+    )
+    parser.add_argument(
+        "patterns", nargs="*", help="glob patterns of benchmark names, e.g. 'conj.*'"
+    )
+    parser.add_argument("-l", "--list", action="store_true", help="list benchmarks")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="seconds per repetition"
+    )
+    parser.add_argument("-o", "--output", help="save the results as JSON")
+    parser.add_argument("-b", "--baseline", help="compare with saved results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown reported as a regression (the default is 0.1 for 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    names = select(args.patterns)
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        parser.error("no benchmark matches the patterns")
+
+    results = run(names, args.repeat, args.warmup, args.min_time)
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s)", file=sys.stderr)
+            return 1
+    return 0
@@ -0,0 +1,127 @@
+"""
+Memory footprint of words, documents, and conjugation tables.
+
+Sizes are measured in two ways: ``jadoc.utils.deep_getsizeof`` of the objects,
+and the allocations traced by ``tracemalloc`` while they are built, which also
+include the garbage collector headers and allocator overhead. Memory allocated
+by MeCab itself is not visible to either.
+
+Usage: python -m benchmarks.memory [-h]
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.utils import deep_getsizeof
+from jadoc.word.word import Word
+
+from .corpus import CorpusGenerator
+from .harness import environment
+
+ATTRIBUTES = ("surface", "base", "pos", "c_type", "c_form")
+
+
+def traced(func: Callable[[], Any]) -> Tuple[Any, int, int]:
+    """Call ``func`` under ``tracemalloc``.
+
+    Returns
+    -------
+    tuple
+        The result, and the bytes that are still allocated and at the peak.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current - before, peak - before
+
+
+def word_breakdown(words: List[Word]) -> Dict[str, float]:
+    """The mean bytes of a word and of each of its attributes.
+
+    An object shared by several words, such as an interned string, is counted
+    for the first word only. The names of the attributes are not counted.
+    """
+    seen = {id(None), id(True), id(False)}
+    totals = dict.fromkeys(("object",) + ATTRIBUTES, 0)
+    for word in words:
+        totals["object"] += sys.getsizeof(word) + sys.getsizeof(word.__dict__)
+        seen.update((id(word), id(word.__dict__)))
+        for name in ATTRIBUTES:
+            totals[name] += deep_getsizeof(getattr(word, name), seen)
+    n = max(len(words), 1)
+    breakdown = {name: size / n for name, size in totals.items()}
+    breakdown["total"] = sum(breakdown.values())
+    return breakdown
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="bench-memory", description="Measure the memory footprint of jadoc."
+    )
+    parser.add_argument("-n", "--size", type=int, default=2000, help="sentences")
+    parser.add_argument("--per-document", type=int, default=10, help="sentences")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="save the results as JSON")
+    args = parser.parse_args(argv)
+
+    generator = CorpusGenerator(args.seed)
+    n_documents = max(1, args.size // args.per_document)
+    documents = list(generator.documents(n_documents, args.per_document))
+
+    tokenize = generate_tokenizer()
+    conjugation, conj_bytes, _ = traced(lambda: Conjugation(tokenize))
+    ending_dic = deep_getsizeof(conjugation._ending_dic)
+
+    words, word_bytes, word_peak = traced(
+        lambda: [word for text in documents for word in conjugation.tokenize(text)]
+    )
+    breakdown = word_breakdown(words)
+    n_words = len(words)
+    del words
+
+    docs, doc_bytes, doc_peak = traced(lambda: [Doc(t, conjugation) for t in documents])
+    for doc in docs:
+        doc.get_text()
+        doc.word_to_char(0)
+    usages = [doc.memory_usage() for doc in docs]
+    usage = {key: sum(u[key] for u in usages) / len(usages) for key in usages[0]}
+
+    results = {
+        "conjugation": {"traced": conj_bytes, "ending_dic": ending_dic},
+        "word": {
+            "traced": word_bytes / n_words,
+            "traced_peak": word_peak / n_words,
+            **{f"deep_{k}": v for k, v in breakdown.items()},
+        },
+        "doc": {
+            "words": n_words / len(docs),
+            "traced": doc_bytes / len(docs),
+            "traced_peak": doc_peak / len(docs),
+            **{f"memory_usage_{k}": v for k, v in usage.items()},
+        },
+    }
+    print(f"{n_words} words in {len(docs)} documents")
+    for group, values in results.items():
+        print(group)
+        for key, value in values.items():
+            print(f"  {key:<28}{value:>12,.0f}")
+
+    if args.output is not None:
+        meta = dict(environment(), size=args.size, per_document=args.per_document)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
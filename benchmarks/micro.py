@@ -0,0 +1,166 @@
+"""
+Microbenchmarks of tokenization, normalization, and conjugation.
+
+The inputs are fixed, so that results of different revisions can be compared.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.matcher import Matcher
+from jadoc.mecab.tokenizer import (
+    _find_node_format,
+    _mecab_tagger,
+    generate_tokenizer,
+    node_to_word,
+)
+from jadoc.script import compile_script
+from jadoc.word.cform import get_normalized_cform
+from jadoc.word.ctype import Godan, get_normalized_ctype
+from jadoc.word.pos import get_normalized_pos
+from jadoc.word.word import Word
+
+from .harness import benchmark
+
+TEXT = (
+    "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。"
+    "何でも薄暗いじめじめした所でニャーニャー泣いていた事だけは記憶している。"
+)
+
+# at least one word of each conjugation type
+LEMMAS = (
+    "書く 泳ぐ 話す 待つ 死ぬ 遊ぶ 読む 帰る 買う 問う 行く ある 見る 来る する "
+    "美しい だ です ます ない"
+).split()
+
+_tokenize = generate_tokenizer()
+_conjugation = Conjugation(_tokenize)
+
+
+def _node_lines() -> List[str]:
+    tagger = _mecab_tagger(node_format=_find_node_format())
+    return tagger.parse(TEXT).splitlines()[:-1]  # without EOS
+
+
+def _word_args() -> List[Tuple[str, List[str], str, str, str]]:
+    args = []
+    for line in _node_lines():
+        attrs = line.split(",")
+        args.append((attrs[0], attrs[1].split("-"), attrs[2], attrs[3], attrs[4]))
+    return args
+
+
+def _lemma_words() -> Dict[str, List[Word]]:
+    """Group the words of ``LEMMAS`` by the name of their conjugation type."""
+    words = defaultdict(list)
+    for lemma in LEMMAS:
+        for word in _tokenize(lemma):
+            if word.has_conjugation:
+                words[type(word.c_type).__name__].append(word)
+    return words
+
+
+@benchmark("tokenize.parse")
+def tokenize_parse() -> Callable[[], Any]:
+    tagger = _mecab_tagger(node_format=_find_node_format())
+    return lambda: tagger.parse(TEXT)
+
+
+@benchmark("tokenize.node_to_word")
+def tokenize_node_to_word() -> Callable[[], Any]:
+    lines = _node_lines()
+    return lambda: [node_to_word(line) for line in lines]
+
+
+@benchmark("tokenize.full")
+def tokenize_full() -> Callable[[], Any]:
+    return lambda: _tokenize(TEXT)
+
+
+@benchmark("word.init")
+def word_init() -> Callable[[], Any]:
+    args = _word_args()
+    return lambda: [Word(*a) for a in args]
+
+
+@benchmark("word.normalize_pos")
+def word_normalize_pos() -> Callable[[], Any]:
+    args = _word_args()
+    return lambda: [get_normalized_pos(pos_info) for _, pos_info, _, _, _ in args]
+
+
+@benchmark("word.normalize_ctype")
+def word_normalize_ctype() -> Callable[[], Any]:
+    args = _word_args()
+    return lambda: [get_normalized_ctype(p, b, t) for _, p, b, t, _ in args]
+
+
+@benchmark("word.normalize_cform")
+def word_normalize_cform() -> Callable[[], Any]:
+    args = _word_args()
+    return lambda: [get_normalized_cform(s, p, f) for s, p, _, _, f in args]
+
+
+@benchmark("conj.init")
+def conj_init() -> Callable[[], Any]:
+    return lambda: Conjugation(_tokenize)
+
+
+def _conjugate_all(words: List[Word]) -> Callable[[], Any]:
+    c_forms = []
+    for word in words:
+        for cform in _conjugation._ending_dic[type(word.c_type)]:
+            c_forms.append((word, cform(value="")))
+
+    def conjugate_all() -> None:
+        for word, c_form in c_forms:
+            _conjugation.conjugate(word, c_form)
+
+    return conjugate_all
+
+
+def _register_conjugate() -> None:
+    # one benchmark per conjugation type, registered when the module is imported
+    for name, words in sorted(_lemma_words().items()):
+        benchmark(f"conj.conjugate.{name}")(lambda words=words: _conjugate_all(words))
+
+
+_register_conjugate()
+
+
+@benchmark("ctype.godan_conjugate")
+def ctype_godan_conjugate() -> Callable[[], Any]:
+    pairs = [
+        (base, ending)
+        for base in ("書く", "泳ぐ", "話す", "待つ", "死ぬ", "遊ぶ", "読む", "帰る")
+        for ending in _conjugation._ending_dic[Godan].values()
+    ]
+    return lambda: [Godan.conjugate(base, ending) for base, ending in pairs]
+
+
+# the same patterns as a matcher and as an edit script
+PATTERNS = [
+    "pos=Verb c_form=Renyo surface=て",
+    "pos=Noun base=は",
+    "base=何 base=で base=も",
+    "pos=Adjective c_form=Shushi",
+]
+
+
+@benchmark("matcher.find")
+def matcher_find() -> Callable[[], Any]:
+    matcher = Matcher()
+    for i, pattern in enumerate(PATTERNS):
+        matcher.add(str(i), pattern)
+    words = _tokenize(TEXT * 10)
+    return lambda: matcher.find(words)
+
+
+@benchmark("script.matches")
+def script_matches() -> Callable[[], Any]:
+    script = compile_script("\n".join("delete " + p for p in PATTERNS), _conjugation)
+    doc = Doc(TEXT * 10, _conjugation)
+    doc.find(base="は")  # build the index outside the loop
+    return lambda: script.matches(doc)
@@ -0,0 +1,209 @@
+"""
+How the edit operations of ``Doc`` scale with the number of words.
+
+Each operation is timed on documents of increasing size, and the exponent ``k``
+of ``time ~ n^k`` is estimated by a least squares fit in log-log space: about 0
+for constant time, 1 for linear time and 2 for quadratic time.
+
+Usage: python -m benchmarks.scaling [-h]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.utils import ENV_DEBUG
+
+from .harness import compare, environment, format_time
+
+PARAGRAPH = (
+    "本を書きました。毎日とても歩きます。昨日は雨が降ったので、家で静かに読んだ。"
+)
+SIZES = (100, 1_000, 10_000, 100_000)
+
+# An operation is set up on a document and returns the edit to be timed and the
+# edit that undoes it, so that every call sees a document of the same size.
+Operation = Callable[[Doc, int], Tuple[Callable[[], object], Callable[[], object]]]
+
+
+def _insert(doc: Doc, i: int):
+    words = doc.conjugation.tokenize("本")
+    return (
+        lambda: doc.insert(i, words),
+        lambda: doc.delete(range(i, i + len(words))),
+    )
+
+
+def _delete(doc: Doc, i: int):
+    words = list(doc.words[i : i + 1])  # 本
+    return (
+        lambda: doc.delete(i),
+        lambda: doc.insert(i, words),
+    )
+
+
+def _update(doc: Doc, i: int):
+    old = list(doc.words[i + 2 : i + 3])  # 書き
+    new = doc.conjugation.tokenize("読む")
+    return (
+        lambda: doc.update(i + 2, new),
+        lambda: doc.update(i + 2, old),
+    )
+
+
+def _update_surfaces(doc: Doc, i: int):
+    text = doc.get_text()
+    return (
+        lambda: doc.update_surfaces(i, "手紙"),
+        lambda: doc.retokenize(text),
+    )
+
+
+def _get_text(doc: Doc, i: int):
+    def invalidate() -> None:
+        doc._text = None  # as after any edit
+
+    return doc.get_text, invalidate
+
+
+def _simple_view(doc: Doc, i: int):
+    return doc.simple_view, lambda: None
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "insert": _insert,
+    "delete": _delete,
+    "update": _update,
+    "update_surfaces": _update_surfaces,
+    "get_text": _get_text,
+    "simple_view": _simple_view,
+}
+
+
+def build_docs(
+    sizes: List[int], conjugation: Conjugation, chunked: bool = False
+) -> Dict[int, Tuple[Doc, int]]:
+    """Build a document of at least ``n`` words for each size ``n``.
+
+    Returns
+    -------
+    dict
+        The document and the position of a sentence in its middle, by size.
+    """
+    unit = conjugation.tokenize(PARAGRAPH)
+    docs = {}
+    for n in sizes:
+        count = max(1, math.ceil(n / len(unit)))
+        words = [word for _ in range(count) for word in unit]
+        doc = Doc.from_words(words, conjugation, chunked=chunked)
+        docs[n] = (doc, (count // 2) * len(unit))
+    return docs
+
+
+def time_operation(
+    edit: Callable[[], object],
+    restore: Callable[[], object],
+    repeat: int = 3,
+    min_time: float = 0.05,
+) -> float:
+    """Get the median time of ``edit`` in seconds, without the time of ``restore``."""
+    edit()
+    restore()
+    times = []
+    number = 1
+    for _ in range(repeat):
+        while True:
+            elapsed = 0.0
+            for _ in range(number):
+                begin = time.perf_counter()
+                edit()
+                elapsed += time.perf_counter() - begin
+                restore()
+            if elapsed >= min_time or number >= 1_000_000:
+                break
+            number *= 10 if elapsed < min_time / 10 else 2
+        times.append(elapsed / number)
+    return statistics.median(times)
+
+
+def exponent(sizes: List[int], times: List[float]) -> float:
+    """The slope of the least squares line of ``log(time)`` against ``log(n)``."""
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(t) for t in times]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    return sxy / sxx if sxx else 0.0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="bench-scaling", description="Time Doc edits as the document grows."
+    )
+    parser.add_argument("operations", nargs="*", help="any of " + ", ".join(OPERATIONS))
+    parser.add_argument("-n", "--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--chunked", action="store_true", help="use chunked Docs")
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="enable the debug mode, which snapshots the Doc around each edit",
+    )
+    parser.add_argument("-o", "--output", help="save the results as JSON")
+    parser.add_argument("-b", "--baseline", help="compare with saved results")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+    operations = args.operations or list(OPERATIONS)
+    unknown = [name for name in operations if name not in OPERATIONS]
+    if unknown:
+        parser.error("unknown operations: " + ", ".join(unknown))
+    sizes = sorted(args.sizes)
+
+    conjugation = Conjugation(generate_tokenizer())
+    if args.debug:
+        os.environ[ENV_DEBUG] = "true"
+
+    columns = "".join(f"{n:>10}" for n in sizes)
+    print(f"{'operation':<16}{columns}  exponent")
+    results = {}
+    for name in operations:
+        times = []
+        for n, (doc, i) in build_docs(sizes, conjugation, args.chunked).items():
+            with contextlib.redirect_stdout(io.StringIO()):  # the debug output
+                t = time_operation(
+                    *OPERATIONS[name](doc, i), args.repeat, args.min_time
+                )
+            times.append(t)
+            results[f"{name}@{n}"] = {"median": t, "size": n}
+        k = exponent(sizes, times) if len(sizes) > 1 else math.nan
+        row = "".join(f"{format_time(t):>10}" for t in times)
+        print(f"{name:<16}{row}  {k:8.2f}")
+        results[f"{name}@exponent"] = {"exponent": k}
+
+    meta = dict(environment(), chunked=args.chunked, debug=args.debug)
+    saved = {"meta": meta, "results": results}
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(saved, f, indent=2, ensure_ascii=False)
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        timings = {k: v for k, v in results.items() if "median" in v}
+        if compare({"results": timings}, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
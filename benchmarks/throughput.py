@@ -0,0 +1,167 @@
+"""
+End-to-end throughput on a synthetic corpus, in sentences and words per second.
+
+The corpus is generated by ``benchmarks.corpus``, so no data has to be
+downloaded and the same options always give the same input.
+
+Usage: python -m benchmarks.throughput [-h]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.replace import LemmaReplacer
+from jadoc.script import compile_script
+from jadoc.style import StyleConverter
+
+from .corpus import CorpusGenerator
+from .harness import compare, environment
+
+SCRIPT = """
+replace base=読む -> 眺める
+replace base=書く -> 記す
+cform base=歩く -> 命令形
+delete base=とても
+"""
+MAPPING = {"食べる": "頂く", "見る": "ご覧になる", "高い": "安い"}
+
+
+def _tokenize(conjugation: Conjugation, documents: List[str]) -> Callable[[], None]:
+    def run() -> None:
+        for text in documents:
+            conjugation.tokenize(text)
+
+    return run
+
+
+def _build(conjugation: Conjugation, documents: List[str]) -> Callable[[], None]:
+    def run() -> None:
+        for text in documents:
+            Doc(text, conjugation).get_text()
+
+    return run
+
+
+def _script(conjugation: Conjugation, documents: List[str]) -> Callable[[], None]:
+    script = compile_script(SCRIPT, conjugation)
+    words = [conjugation.tokenize(text) for text in documents]
+
+    def run() -> None:
+        for w in words:
+            doc = Doc.from_words(w, conjugation)
+            script.apply(doc)
+            doc.get_text()
+
+    return run
+
+
+def _replace(conjugation: Conjugation, documents: List[str]) -> Callable[[], None]:
+    replacer = LemmaReplacer(MAPPING, conjugation)
+    words = [conjugation.tokenize(text) for text in documents]
+
+    def run() -> None:
+        for w in words:
+            doc = Doc.from_words(w, conjugation)
+            replacer.replace(doc)
+            doc.get_text()
+
+    return run
+
+
+def _plain(conjugation: Conjugation, documents: List[str]) -> Callable[[], None]:
+    converter = StyleConverter("plain", conjugation)
+    words = [conjugation.tokenize(text) for text in documents]
+
+    def run() -> None:
+        for w in words:
+            doc = Doc.from_words(w, conjugation)
+            converter.convert(doc)
+            doc.get_text()
+
+    return run
+
+
+# The bulk edits start from tokenized words, so that they do not include the
+# time of tokenization.
+STAGES: Dict[str, Callable[[Conjugation, List[str]], Callable[[], None]]] = {
+    "tokenize": _tokenize,
+    "doc_build": _build,
+    "edit_script": _script,
+    "lemma_replace": _replace,
+    "to_plain": _plain,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="bench-throughput", description="Measure throughput on a synthetic corpus."
+    )
+    parser.add_argument("stages", nargs="*", help="any of " + ", ".join(STAGES))
+    parser.add_argument("-n", "--size", type=int, default=10_000, help="sentences")
+    parser.add_argument("--per-document", type=int, default=10, help="sentences")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", help="save the results as JSON")
+    parser.add_argument("-b", "--baseline", help="compare with saved results")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+    stages = args.stages or list(STAGES)
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error("unknown stages: " + ", ".join(unknown))
+
+    generator = CorpusGenerator(args.seed, args.duplicate_rate)
+    n_documents = max(1, args.size // args.per_document)
+    documents = list(generator.documents(n_documents, args.per_document))
+    n_sentences = n_documents * args.per_document
+    conjugation = Conjugation(generate_tokenizer())
+    n_words = sum(len(conjugation.tokenize(text)) for text in documents)
+    print(f"{n_documents} documents, {n_sentences} sentences, {n_words} words")
+    print(f"{'stage':<16}{'time':>10}{'sentences/s':>14}{'words/s':>14}")
+
+    results = {}
+    for name in stages:
+        run = STAGES[name](conjugation, documents)
+        times = []
+        for _ in range(args.repeat):
+            begin = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - begin)
+        t = statistics.median(times)
+        results[name] = {
+            "median": t,
+            "sentences_per_s": n_sentences / t,
+            "words_per_s": n_words / t,
+        }
+        print(f"{name:<16}{t:>9.3f}s{n_sentences / t:>14.0f}{n_words / t:>14.0f}")
+
+    meta = dict(
+        environment(),
+        size=n_sentences,
+        words=n_words,
+        per_document=args.per_document,
+        seed=args.seed,
+        duplicate_rate=args.duplicate_rate,
+    )
+    saved = {"meta": meta, "results": results}
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(saved, f, indent=2, ensure_ascii=False)
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(saved, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+from typing import TYPE_CHECKING, Optional
+
 __title__ = "jadoc"
 __description__ = "Tokenizes Japanese documents to enable CRUD operations."
 __url__ = "https://github.com/poyo46/jadoc"
@@ -6,3 +8,15 @@ __author__ = "poyo46"
 __author_email__ = "poyo4rock@gmail.com"
 __license__ = "Apache-2.0"
 __copyright__ = "Copyright 2021 poyo46"
+
+if TYPE_CHECKING:
+    from .conj import Conjugation
+
+
+def preload(
+    dicdir: Optional[str] = None, node_format: Optional[str] = None, freeze: bool = True
+) -> "Conjugation":
+    """Build the state shared by forked processes. See ``jadoc.warm.preload``."""
+    from .warm import preload
+
+    return preload(dicdir, node_format, freeze)
@@ -0,0 +1,178 @@
+from collections.abc import MutableSequence
+from typing import TYPE_CHECKING, Any, Iterable, List, NamedTuple, Union
+
+from .word.cform import ConjugationForm
+from .word.word import Word
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .doc import Doc
+
+
+class GapBuffer(MutableSequence):
+    """
+    A list with a movable gap.
+
+    Edits at the gap cost only the size of the edit, and moving the gap costs the
+    distance it moves, so a series of edits that proceeds in one direction costs
+    time linear in the length of the list.
+    Slicing returns a plain ``list``.
+
+    Examples
+    --------
+    >>> items = GapBuffer(range(6))
+    >>> del items[4:5]
+    >>> items[1:2] = ["a", "b"]
+    >>> assert list(items) == [0, "a", "b", 2, 3, 5]
+    """
+
+    def __init__(self, iterable: Iterable[Any] = ()) -> None:
+        self._head: List[Any] = list(iterable)
+        self._tail: List[Any] = []  # elements after the gap, in reverse order
+
+    def __len__(self) -> int:
+        return len(self._head) + len(self._tail)
+
+    def _normalize_index(self, i: int) -> int:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("GapBuffer index out of range")
+        return i
+
+    def _move_gap(self, i: int) -> None:
+        n = len(self._head)
+        if i < n:
+            self._tail.extend(reversed(self._head[i:]))
+            del self._head[i:]
+        elif i > n:
+            k = i - n
+            moved = self._tail[-k:]
+            del self._tail[-k:]
+            self._head.extend(reversed(moved))
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = self._normalize_index(i)
+        n = len(self._head)
+        if i < n:
+            return self._head[i]
+        return self._tail[len(self._tail) - 1 - (i - n)]
+
+    def __setitem__(self, i: Union[int, slice], value: Any) -> None:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                raise ValueError("GapBuffer does not support extended slices.")
+            self.splice(start, max(start, stop), value)
+            return
+        i = self._normalize_index(i)
+        self.splice(i, i + 1, (value,))
+
+    def __delitem__(self, i: Union[int, slice]) -> None:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                raise ValueError("GapBuffer does not support extended slices.")
+            self.splice(start, max(start, stop), ())
+            return
+        i = self._normalize_index(i)
+        self.splice(i, i + 1, ())
+
+    def insert(self, i: int, value: Any) -> None:
+        n = len(self)
+        if i < 0:
+            i = max(0, i + n)
+        self.splice(min(i, n), min(i, n), (value,))
+
+    def splice(self, start: int, stop: int, items: Iterable[Any]) -> None:
+        """Replace the elements in ``[start, stop)`` with ``items``."""
+        self._move_gap(start)
+        if stop > start:
+            del self._tail[len(self._tail) - (stop - start) :]
+        self._head.extend(items)
+
+    def to_list(self) -> List[Any]:
+        return self._head + self._tail[::-1]
+
+
+class Edit(NamedTuple):
+    method: str
+    start: int
+    stop: int
+    args: tuple
+    seq: int
+
+
+class Batch:
+    """
+    Edits collected by ``Doc.batch`` and applied together.
+
+    The indices of every edit refer to the document as it was when the batch
+    started. On commit the edits are applied one by one from the last position to
+    the first, so that no index is shifted by another edit, on a ``GapBuffer``
+    that follows the edit position. The result is the same as calling the
+    ``Doc`` methods in that order, in time linear in the length of the document.
+
+    Raises
+    ------
+    ValueError
+        On commit, if two edits overlap.
+    """
+
+    def __init__(self, doc: "Doc") -> None:
+        self.doc = doc
+        self.edits: List[Edit] = []
+
+    def _add(self, method: str, start: int, stop: int, *args: Any) -> None:
+        self.edits.append(Edit(method, start, stop, args, len(self.edits)))
+
+    def insert(self, i: int, words: Union[Word, List[Word]]) -> None:
+        if i < 0 or i > len(self.doc.words):
+            raise IndexError("Batch.insert index out of range")
+        self._add("insert", i, i, i, words)
+
+    def delete(self, interval: Union[int, range]) -> None:
+        if type(interval) == int:
+            interval = range(interval, interval + 1)
+        if self.doc.is_within_range(interval):
+            self._add("delete", interval.start, interval.stop, interval)
+
+    def update(
+        self, interval: Union[int, range], words: Union[Word, List[Word]]
+    ) -> None:
+        if type(interval) == int:
+            interval = range(interval, interval + 1)
+        if self.doc.is_within_range(interval):
+            self._add("update", interval.start, interval.stop, interval, words)
+
+    def conjugate(self, i: int, c_form: ConjugationForm) -> None:
+        if self.doc.is_within_range(i):
+            self._add("conjugate", i, i + 1, i, c_form)
+
+    def _ordered_edits(self) -> List[Edit]:
+        # from right to left; at the same start, ranges go before insertions, and
+        # insertions go in reverse so that they end up in the order they were added
+        edits = sorted(
+            self.edits, key=lambda e: (e.start, e.stop > e.start, e.seq), reverse=True
+        )
+        for right, left in zip(edits, edits[1:]):
+            if left.stop > right.start:
+                raise ValueError(f"Overlapping edits: {left} and {right}")
+        return edits
+
+    def commit(self) -> None:
+        edits = self._ordered_edits()
+        if not edits:
+            return
+        doc = self.doc
+        buffer = GapBuffer(doc.words)
+        doc._offsets = None
+        doc._words = buffer
+        doc._words_shared = False
+        try:
+            for edit in edits:
+                getattr(doc, edit.method)(*edit.args)
+        finally:
+            doc._words = doc._word_list(buffer.to_list())
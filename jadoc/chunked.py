@@ -0,0 +1,429 @@
+from collections.abc import MutableSequence
+from copy import copy
+from itertools import chain
+from typing import Any, Iterable, Iterator, List, Set, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+class FenwickTree:
+    """
+    Binary indexed tree over a fixed number of integers, which must be
+    non-negative for ``search``.
+
+    See Also
+    --------
+    ``https://en.wikipedia.org/wiki/Fenwick_tree``
+    """
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        tree = [0] + list(values)
+        size = len(tree) - 1
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def copy(self) -> "FenwickTree":
+        tree = copy(self)
+        tree._tree = list(self._tree)
+        return tree
+
+    def add(self, i: int, delta: int) -> None:
+        """Add ``delta`` to the ``i``-th value."""
+        i += 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, i: int) -> int:
+        """Sum of the first ``i`` values."""
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, k: int) -> Tuple[int, int]:
+        """Find the value that contains the ``k``-th unit.
+
+        Parameters
+        ----------
+        k : int
+            Zero-based position in the concatenation of all units.
+
+        Returns
+        -------
+        tuple of int
+            The index of the value and ``k`` relative to the start of that value.
+            If ``k`` is not less than the total, the index is ``len(self)``.
+        """
+        i = 0
+        step = 1 << self._size.bit_length()
+        while step > 0:
+            j = i + step
+            if j <= self._size and self._tree[j] <= k:
+                i = j
+                k -= self._tree[j]
+            step >>= 1
+        return i, k
+
+
+class ChunkedList(MutableSequence):
+    """
+    A list stored as a sequence of small chunks.
+
+    Positional ``insert`` and ``del`` only shift the elements of a single chunk,
+    and chunks are located through a ``FenwickTree`` of their lengths. A chunk
+    that grows too large is split into the nearest empty chunk, which is moved
+    next to it, and emptied chunks are kept, so the tree is updated in place.
+    It is rebuilt only when the chunks are rebalanced, with an empty chunk after
+    each one, if no empty chunk is near a split or most chunks are empty.
+    Slicing returns a plain ``list``.
+
+    ``fork`` makes a copy in constant time. The copies share their chunks and
+    copy a chunk only when they modify it.
+
+    Parameters
+    ----------
+    iterable : iterable, optional
+        Initial elements.
+    chunk_size : int, optional
+        The preferred number of elements per chunk.
+
+    Examples
+    --------
+    >>> items = ChunkedList(range(5), chunk_size=2)
+    >>> items[1:3] = ["a", "b", "c"]
+    >>> del items[0]
+    >>> assert list(items) == ["a", "b", "c", 3, 4]
+    """
+
+    def __init__(
+        self, iterable: Iterable[Any] = (), chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive.")
+        self._chunk_size = chunk_size
+        self._chunks: List[List[Any]] = []
+        self._len = 0
+        self._tree = FenwickTree()
+        self._shared = False  # whether the chunk list may be shared with a fork
+        self._owned: Set[int] = set()  # ids of the chunks that are not shared
+        self._reset(list(iterable))
+
+    def _reset(self, items: List[Any]) -> None:
+        size = self._chunk_size
+        self._chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        self._len = len(items)
+        self._shared = False
+        self._owned = {id(chunk) for chunk in self._chunks}
+        self._rebuild()
+
+    def fork(self) -> "ChunkedList":
+        """Make a copy that shares the chunks with this list until modified."""
+        other = copy(self)
+        self._shared = other._shared = True
+        self._owned = set()
+        other._owned = set()
+        return other
+
+    def _copy_spine(self) -> None:
+        self._chunks = list(self._chunks)
+        self._tree = self._tree.copy()
+
+    def _writable(self, c: int) -> List[Any]:
+        """Get the ``c``-th chunk, copying what is shared with a fork."""
+        if self._shared:
+            self._copy_spine()
+            self._shared = False
+        chunk = self._chunks[c]
+        if id(chunk) not in self._owned:
+            chunk = list(chunk)
+            self._chunks[c] = chunk
+            self._owned.add(id(chunk))
+        return chunk
+
+    def _rebuild(self) -> None:
+        """Rebalance the chunks, with an empty spare after each one."""
+        chunks: List[List[Any]] = []
+        for chunk in self._chunks:
+            if chunk:
+                spare: List[Any] = []
+                self._owned.add(id(spare))
+                chunks.extend((chunk, spare))
+        self._chunks = chunks
+        self._tree = FenwickTree(len(chunk) for chunk in self._chunks)
+
+    def _chunk_updated(
+        self, c: int, removed: Iterable[Any], added: Iterable[Any]
+    ) -> None:
+        """Called when elements of the ``c``-th chunk are replaced in place."""
+        pass
+
+    def _normalize_index(self, i: int) -> int:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("ChunkedList index out of range")
+        return i
+
+    def _locate(self, i: int) -> Tuple[int, int]:
+        """Return the chunk index and the offset in it of the ``i``-th element."""
+        return self._tree.search(i)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._chunks)
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._len)
+            if step != 1:
+                return list(self)[i]
+            return self._slice(start, stop)
+        c, k = self._locate(self._normalize_index(i))
+        return self._chunks[c][k]
+
+    def _slice(self, start: int, stop: int) -> List[Any]:
+        if start >= stop:
+            return []
+        c, k = self._locate(start)
+        result: List[Any] = []
+        remaining = stop - start
+        while remaining > 0:
+            piece = self._chunks[c][k : k + remaining]
+            result.extend(piece)
+            remaining -= len(piece)
+            c, k = c + 1, 0
+        return result
+
+    def __setitem__(self, i: Union[int, slice], value: Any) -> None:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._len)
+            if step != 1:
+                items = list(self)
+                items[i] = value
+                self._reset(items)
+                return
+            self.splice(start, max(start, stop), value)
+            return
+        c, k = self._locate(self._normalize_index(i))
+        chunk = self._writable(c)
+        old = chunk[k]
+        chunk[k] = value
+        self._chunk_updated(c, (old,), (value,))
+
+    def __delitem__(self, i: Union[int, slice]) -> None:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._len)
+            if step != 1:
+                items = list(self)
+                del items[i]
+                self._reset(items)
+                return
+            self.splice(start, max(start, stop), ())
+            return
+        i = self._normalize_index(i)
+        self.splice(i, i + 1, ())
+
+    def insert(self, i: int, value: Any) -> None:
+        if i < 0:
+            i = max(0, i + self._len)
+        i = min(i, self._len)
+        self.splice(i, i, (value,))
+
+    def splice(self, start: int, stop: int, items: Iterable[Any]) -> None:
+        """Replace the elements in ``[start, stop)`` with ``items``.
+
+        Parameters
+        ----------
+        start : int
+            Non-negative index of the first element to be replaced.
+        stop : int
+            Non-negative index after the last element to be replaced.
+        items : iterable
+            New elements.
+        """
+        items = list(items)
+        if start < stop:
+            self._delete(start, stop)
+        if items:
+            self._insert(start, items)
+
+    def _delete(self, start: int, stop: int) -> None:
+        c, k = self._locate(start)
+        remaining = stop - start
+        structural = False
+        while remaining > 0:
+            chunk = self._writable(c)
+            n = min(len(chunk) - k, remaining)
+            removed = chunk[k : k + n]
+            del chunk[k : k + n]
+            self._tree.add(c, -n)
+            self._chunk_updated(c, removed, ())
+            remaining -= n
+            structural = structural or not chunk
+            c, k = c + 1, 0
+        self._len -= stop - start
+        # the emptied chunks are spares, unless most chunks have become empty
+        if structural and len(self._chunks) > 4 * (self._len // self._chunk_size + 1):
+            self._rebuild()
+
+    def _swap_chunks(self, a: int, b: int) -> None:
+        """Swap the ``a``-th chunk with the empty ``b``-th one."""
+        chunks = self._chunks
+        chunk = chunks[a]
+        chunks[a], chunks[b] = chunks[b], chunk
+        self._tree.add(a, -len(chunk))
+        self._tree.add(b, len(chunk))
+        self._chunk_updated(a, chunk, ())
+        self._chunk_updated(b, (), chunk)
+
+    def _move_spare_after(self, c: int) -> int:
+        """Move the nearest empty chunk after the ``c``-th one.
+
+        Returns
+        -------
+        int
+            The new index of the ``c``-th chunk, or -1 if there is no empty chunk
+            within the square root of the number of chunks.
+        """
+        chunks = self._chunks
+        for d in range(1, max(8, int(len(chunks) ** 0.5)) + 1):
+            if c + d < len(chunks) and not chunks[c + d]:
+                for j in range(c + d - 1, c, -1):
+                    self._swap_chunks(j, j + 1)
+                return c
+            if c - d >= 0 and not chunks[c - d]:
+                for j in range(c - d + 1, c + 1):
+                    self._swap_chunks(j, j - 1)
+                return c - 1
+        return -1
+
+    def _insert(self, i: int, items: List[Any]) -> None:
+        if not self._chunks:
+            self._reset(items)
+            return
+        if i == self._len:
+            c = len(self._chunks) - 1
+            k = len(self._chunks[c])
+        else:
+            c, k = self._locate(i)
+        chunk = self._writable(c)
+        chunk[k:k] = items
+        self._len += len(items)
+        self._tree.add(c, len(items))
+        self._chunk_updated(c, (), items)
+        size = self._chunk_size
+        if len(chunk) <= 2 * size:
+            return
+        moved_to = self._move_spare_after(c) if len(chunk) <= 4 * size else -1
+        if moved_to >= 0:
+            c = moved_to
+            moved = chunk[len(chunk) // 2 :]
+            del chunk[len(chunk) // 2 :]
+            self._writable(c + 1).extend(moved)
+            self._tree.add(c, -len(moved))
+            self._tree.add(c + 1, len(moved))
+            self._chunk_updated(c, moved, ())
+            self._chunk_updated(c + 1, (), moved)
+            return
+        pieces = [chunk[j : j + size] for j in range(0, len(chunk), size)]
+        self._owned.update(id(piece) for piece in pieces)
+        self._chunks[c : c + 1] = pieces
+        self._rebuild()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+class PrefixSumList(ChunkedList):
+    """
+    A ``ChunkedList`` of non-negative integers with fast prefix sums.
+
+    Each chunk keeps its total in a ``FenwickTree``, so prefix sums and the
+    reverse lookup stay logarithmic in the number of chunks through edits.
+
+    Examples
+    --------
+    >>> lengths = PrefixSumList([2, 3, 1], chunk_size=2)
+    >>> assert lengths.prefix_sum(2) == 5
+    >>> assert lengths.find(4) == 1
+    >>> lengths[1:2] = [4, 4]
+    >>> assert lengths.total() == 11
+    """
+
+    def _rebuild(self) -> None:
+        super()._rebuild()
+        self._sums = FenwickTree(sum(chunk) for chunk in self._chunks)
+
+    def _copy_spine(self) -> None:
+        super()._copy_spine()
+        self._sums = self._sums.copy()
+
+    def _chunk_updated(
+        self, c: int, removed: Iterable[Any], added: Iterable[Any]
+    ) -> None:
+        self._sums.add(c, sum(added) - sum(removed))
+
+    def total(self) -> int:
+        """Sum of all elements."""
+        return self._sums.prefix_sum(len(self._sums))
+
+    def prefix_sum(self, i: int) -> int:
+        """Sum of the first ``i`` elements.
+
+        Parameters
+        ----------
+        i : int
+            The number of elements, from 0 to ``len(self)``.
+
+        Returns
+        -------
+        int
+            The sum.
+        """
+        if not 0 <= i <= self._len:
+            raise IndexError("PrefixSumList index out of range")
+        if i == self._len:
+            return self.total()
+        c, k = self._locate(i)
+        return self._sums.prefix_sum(c) + sum(self._chunks[c][:k])
+
+    def find(self, x: int) -> int:
+        """Find the element that covers the ``x``-th unit.
+
+        Parameters
+        ----------
+        x : int
+            Zero-based position in the concatenation of all units.
+
+        Returns
+        -------
+        int
+            The index of the element ``i`` such that
+            ``prefix_sum(i) <= x < prefix_sum(i + 1)``.
+
+        Raises
+        ------
+        IndexError
+            If ``x`` is negative or not less than ``total()``.
+        """
+        if not 0 <= x < self.total():
+            raise IndexError("PrefixSumList position out of range")
+        c, x = self._sums.search(x)
+        i = self._tree.prefix_sum(c)
+        for value in self._chunks[c]:
+            if x < value:
+                return i
+            x -= value
+            i += 1
+        raise AssertionError("unreachable")  # pragma: no cover
@@ -0,0 +1,313 @@
+import argparse
+import json
+import sys
+from contextlib import ExitStack
+from multiprocessing import Pool
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import __description__, __version__
+from .doc import Doc
+from .errors import InvalidFormatError, ScriptSyntaxError
+from .replace import LemmaReplacer
+from .script import EditScript, compile_script
+from .server import serve
+from .store import CorpusWriter
+from .warm import preload
+
+Task = Tuple[int, str]
+
+
+class _Worker:
+    """
+    Process documents with a tokenizer that is built once per process.
+    """
+
+    def __init__(self, options: Dict[str, Any]) -> None:
+        # inherited from the parent process if it is forked
+        self.conjugation = preload(
+            options["dicdir"], options["node_format"], freeze=False
+        )
+        self.replacer: Optional[LemmaReplacer] = None
+        if options["command"] == "replace":
+            self.replacer = LemmaReplacer(options["mapping"], self.conjugation)
+        self.script: Optional[EditScript] = options.get("script")
+        self.output_format = options["output_format"]
+        self.sep = options["sep"]
+
+    def __call__(self, task: Task) -> Tuple[int, Any]:
+        i, text = task
+        doc = Doc(text, self.conjugation)
+        if self.replacer is not None:
+            self.replacer.replace(doc)
+            text = doc.get_text()
+        elif self.script is not None:
+            self.script.apply(doc)
+            text = doc.get_text()
+        elif self.output_format == "text":
+            text = self.sep.join(word.surface for word in doc.words)
+
+        if self.output_format == "jsonl":
+            record = {"id": i, "text": doc.get_text(), "words": doc.to_word_list()}
+            return i, json.dumps(record, ensure_ascii=False)
+        if self.output_format == "binary":
+            return i, list(doc.words)
+        return i, text
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    global _worker
+    _worker = _Worker(options)
+
+
+def _process(task: Task) -> Tuple[int, Any]:
+    assert _worker is not None
+    return _worker(task)
+
+
+def process(
+    texts: Iterable[str],
+    options: Dict[str, Any],
+    workers: int = 1,
+    chunksize: int = 64,
+    ordered: bool = True,
+) -> Iterator[Tuple[int, Any]]:
+    """Process documents in worker processes.
+
+    Parameters
+    ----------
+    texts : iterable of str
+        The documents.
+    options : dict
+        The options of ``_Worker``, taken from the command line.
+    workers : int, optional
+        The number of worker processes (the default is 1, which processes the
+        documents in this process).
+    chunksize : int, optional
+        The number of documents sent to a worker at a time.
+    ordered : bool, optional
+        If False, the results are yielded as soon as they are ready.
+
+    Yields
+    ------
+    tuple
+        The position of the document in ``texts`` and the result.
+    """
+    tasks = enumerate(texts)
+    if workers <= 1:
+        _init_worker(options)
+        yield from map(_process, tasks)
+        return
+
+    preload(options["dicdir"], options["node_format"], freeze=False)
+    with Pool(workers, initializer=_init_worker, initargs=(options,)) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_process, tasks, chunksize=chunksize)
+
+
+def read_texts(
+    files: Iterable[IO[str]], input_format: str = "text", field: str = "text"
+) -> Iterator[str]:
+    """Read one document per line, or the ``field`` of each JSON line.
+
+    Raises
+    ------
+    InvalidFormatError
+        If a JSON line is not an object with a string ``field``.
+    """
+    for fp in files:
+        for n, line in enumerate(fp, 1):
+            line = line.rstrip("\r\n")
+            if input_format != "jsonl":
+                yield line
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise InvalidFormatError(f"{fp.name}: line {n}: {e}") from None
+            text = record.get(field) if isinstance(record, dict) else None
+            if not isinstance(text, str):
+                raise InvalidFormatError(
+                    f"{fp.name}: line {n}: no string field {field!r}"
+                )
+            yield text
+
+
+def _parse_mapping(items: List[str]) -> Dict[str, str]:
+    mapping = {}
+    for item in items:
+        old, sep, new = item.partition("=")
+        if not sep or not old:
+            raise argparse.ArgumentTypeError(f"Not in the form OLD=NEW: {item}")
+        mapping[old] = new
+    return mapping
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="jadoc", description=__description__)
+    parser.add_argument("--version", action="version", version=__version__)
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "files",
+        nargs="*",
+        metavar="FILE",
+        help="input files (the default is the standard input)",
+    )
+    common.add_argument(
+        "--input-format",
+        choices=["text", "jsonl"],
+        default="text",
+        help="one document per line, or one JSON object per line",
+    )
+    common.add_argument(
+        "--field", default="text", help="the field of the document in JSON lines"
+    )
+    common.add_argument(
+        "-f",
+        "--output-format",
+        choices=["text", "jsonl", "binary"],
+        default="text",
+        help="text, JSON lines with the words, or a corpus store (see jadoc.store)",
+    )
+    common.add_argument(
+        "-o",
+        "--output",
+        help="output file, or the directory of the store for the binary format",
+    )
+    common.add_argument("--sep", default=" ", help="separator of tokenized words")
+    common.add_argument(
+        "-w", "--workers", type=int, default=1, help="number of worker processes"
+    )
+    common.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64,
+        help="number of documents sent to a worker at a time",
+    )
+    common.add_argument(
+        "--unordered",
+        action="store_true",
+        help="write the results as soon as they are ready",
+    )
+    common.add_argument("--dicdir", help="path of the MeCab dictionary directory")
+    common.add_argument("--node-format", help="MeCab node-format")
+
+    commands.add_parser("tokenize", parents=[common], help="split documents into words")
+    replace = commands.add_parser(
+        "replace", parents=[common], help="replace lemmas, conjugating them"
+    )
+    replace.add_argument(
+        "-m",
+        "--map",
+        action="append",
+        required=True,
+        metavar="OLD=NEW",
+        help="a lemma and its replacement, e.g. 購入する=買う",
+    )
+    edit = commands.add_parser(
+        "edit", parents=[common], help="apply an edit script (see jadoc.script)"
+    )
+    edit.add_argument("-s", "--script", required=True, help="file of the edit script")
+
+    serve = commands.add_parser(
+        "serve", help="run an HTTP service with warm taggers (see jadoc.server)"
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=8080, help="port to listen on")
+    serve.add_argument(
+        "--pool-size", type=int, default=4, help="number of MeCab taggers"
+    )
+    serve.add_argument("--dicdir", help="path of the MeCab dictionary directory")
+    serve.add_argument("--node-format", help="MeCab node-format")
+    serve.add_argument("-q", "--quiet", action="store_true", help="no access log")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the ``jadoc`` command.
+
+    Examples
+    --------
+    ``echo 本を購入しました。 | jadoc replace -m 購入する=買う`` prints
+    ``本を買いました。``.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(
+            args.host,
+            args.port,
+            args.pool_size,
+            args.dicdir,
+            args.node_format,
+            args.quiet,
+        )
+        return 0
+    try:
+        mapping = _parse_mapping(args.map) if args.command == "replace" else {}
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if args.output_format == "binary" and args.output is None:
+        parser.error("the binary format needs --output DIR")
+    if args.output_format == "binary" and args.unordered:
+        # the ids of the documents in the store are their positions in the input
+        parser.error("the binary format cannot be written with --unordered")
+    script = None
+    if args.command == "edit":
+        # compiled once here and sent to the workers
+        try:
+            with open(args.script, encoding="utf-8") as f:
+                source = f.read()
+        except OSError as e:
+            parser.error(f"{args.script}: {e.strerror}")
+        conjugation = preload(args.dicdir, args.node_format, freeze=False)
+        try:
+            script = compile_script(source, conjugation)
+        except ScriptSyntaxError as e:
+            parser.error(f"{args.script}: {e}")
+    options = {
+        "command": args.command,
+        "mapping": mapping,
+        "dicdir": args.dicdir,
+        "node_format": args.node_format,
+        "output_format": args.output_format,
+        "sep": args.sep,
+        "script": script,
+    }
+
+    with ExitStack() as stack:
+        files: List[IO[str]] = []
+        for path in args.files or ["-"]:
+            if path == "-":
+                files.append(sys.stdin)
+                continue
+            try:
+                files.append(stack.enter_context(open(path, encoding="utf-8")))
+            except OSError as e:
+                parser.error(f"{path}: {e.strerror}")
+        texts = read_texts(files, args.input_format, args.field)
+        results = process(
+            texts, options, args.workers, args.chunk_size, not args.unordered
+        )
+        try:
+            if args.output_format == "binary":
+                writer = stack.enter_context(CorpusWriter(args.output))
+                for _, words in results:
+                    writer.add(words)
+                return 0
+
+            out = sys.stdout
+            if args.output is not None:
+                out = stack.enter_context(open(args.output, "w", encoding="utf-8"))
+            for _, line in results:
+                out.write(line + "\n")
+        except InvalidFormatError as e:
+            parser.error(str(e))
+    return 0
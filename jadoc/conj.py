@@ -22,6 +22,7 @@ from .word.ctype import (
     AuxiliaryDesu,
     AuxiliaryMasu,
     AuxiliaryNai,
+    ConjugationType,
     Godan,
     GodanI,
     GodanN,
@@ -67,15 +68,16 @@ def _replace_with_vowel(hiragana_text: str) -> str:
 
 def show_details(func):
     def _show_details(self, word: Word, c_form: ConjugationForm) -> Word:
+        if not debug_on():
+            return func(self, word, c_form)
         before = str(word)
         new_word = func(self, word, c_form)
         after = str(new_word)
-        if debug_on():
-            all_args = str(word) + ", " + str(c_form)
-            print(f"{self.__class__.__name__}.{func.__name__}({all_args}): ")
-            if before != after:
-                print(before)
-                print(after)
+        all_args = str(word) + ", " + str(c_form)
+        print(f"{self.__class__.__name__}.{func.__name__}({all_args}): ")
+        if before != after:
+            print(before)
+            print(after)
         return new_word
 
     return _show_details
@@ -102,6 +104,17 @@ class Conjugation:
         if debug_on():
             pprint(self._ending_dic)
 
+    def with_tokenizer(self, tokenize: Callable[[str], List[Word]]) -> "Conjugation":
+        """Make a copy that tokenizes with ``tokenize`` and shares the ending
+        tables of this one, which are not built again.
+
+        ``tokenize`` should use the same dictionary as this one.
+        """
+        conjugation = self.__class__.__new__(self.__class__)
+        conjugation.tokenize = tokenize
+        conjugation._ending_dic = self._ending_dic
+        return conjugation
+
     def _generate_godan_ending_dic(
         self, renyo_onbin: Optional[str] = None
     ) -> Dict[Type[ConjugationForm], str]:
@@ -169,6 +182,35 @@ class Conjugation:
         assert len(cforms) == len(endings)
         return {c: e for c, e in zip(cforms, endings)}
 
+    def conjugate_base(
+        self,
+        base: str,
+        ctype: Type[ConjugationType],
+        cform: Type[ConjugationForm],
+    ) -> Optional[str]:
+        """Get the surface of ``base`` conjugated in ``cform``.
+
+        Parameters
+        ----------
+        base : str
+            Base form.
+        ctype : type of ConjugationType
+            Conjugation type of ``base``.
+        cform : type of ConjugationForm
+            Conjugation form.
+
+        Returns
+        -------
+        str or None
+            The surface, or None if ``ctype`` has no ``cform``.
+        """
+        ending = self._ending_dic.get(ctype, {}).get(cform)
+        if ending is None:
+            return None
+        if not base.endswith("しい") and cform == Gokan:
+            ending = "さ"  # 語幹-サ
+        return ctype.conjugate(base, ending)
+
     @show_details
     def conjugate(self, word: Word, c_form: ConjugationForm) -> Word:
         if not word.has_conjugation:
@@ -177,17 +219,14 @@ class Conjugation:
         ctype = type(word.c_type)
         cform = type(c_form)
 
-        try:
-            if cform == RenyoOnbin and RenyoOnbin not in self._ending_dic[ctype]:
-                c_form = Renyo(value="連用形")
-                cform = type(c_form)
-            ending = self._ending_dic[ctype][cform]
-            if not word.base.endswith("しい") and cform == Gokan:
-                ending = "さ"  # 語幹-サ
-        except KeyError:
+        if cform == RenyoOnbin and RenyoOnbin not in self._ending_dic.get(ctype, {}):
+            c_form = Renyo(value="連用形")
+            cform = type(c_form)
+        surface = self.conjugate_base(word.base, ctype, cform)
+        if surface is None:
             return word
 
-        word.surface = ctype.conjugate(word.base, ending)
+        word.surface = surface
         word.c_form = c_form
 
         return word
@@ -0,0 +1,197 @@
+"""
+Find the base forms of an inflected word without MeCab.
+
+The rules of ``Conjugation.conjugate_base`` are applied once to sample bases to
+learn which ending of a surface replaces which ending of a base, and a surface
+is deinflected by looking up its endings. The candidates are the conjugations
+that would give back the surface, so they may include bases that do not exist,
+which are removed if a ``Lexicon`` is given.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type
+
+from .conj import Conjugation
+from .lexicon import Lexicon
+from .warm import default_conjugation
+from .word.cform import ConjugationForm
+from .word.ctype import (
+    Adjective,
+    AuxiliaryDa,
+    AuxiliaryDesu,
+    AuxiliaryMasu,
+    AuxiliaryNai,
+    ConjugationType,
+    Godan,
+    GodanI,
+    GodanN,
+    GodanU,
+    GodanZ,
+    Ichidan,
+    Kahen,
+    Rahen,
+    Sahen,
+    get_normalized_ctype,
+)
+
+# the stem of the sample bases, which is not a kana
+_STEM = "〇"
+
+_GODAN_BASES = [_STEM + u for u in Godan.JA_CHARS["u"]]
+
+# Sample bases of each conjugation type. The ones without the stem are the only
+# bases of their type.
+_SAMPLE_BASES: Dict[Type[ConjugationType], List[str]] = {
+    Godan: _GODAN_BASES,
+    GodanI: _GODAN_BASES,
+    GodanZ: _GODAN_BASES,
+    GodanN: _GODAN_BASES,
+    GodanU: _GODAN_BASES,
+    Rahen: ["ある"],
+    Ichidan: [_STEM + "る"],
+    Kahen: [_STEM + "くる", _STEM + "来る"],
+    Sahen: [_STEM + "する", _STEM + "ずる"],
+    Adjective: [_STEM + "い", _STEM + "しい"],
+    AuxiliaryNai: ["ない"],
+    AuxiliaryDa: ["だ"],
+    AuxiliaryDesu: ["です"],
+    AuxiliaryMasu: ["ます"],
+}
+
+# part-of-speech and conjugation type given to ``get_normalized_ctype``
+_TAGS: Dict[Type[ConjugationType], Tuple[List[str], str]] = {
+    Godan: (["動詞"], "五段"),
+    GodanI: (["動詞"], "五段"),
+    GodanZ: (["動詞"], "五段"),
+    GodanN: (["動詞"], "五段"),
+    GodanU: (["動詞"], "五段"),
+    Rahen: (["動詞"], "五段"),
+    Ichidan: (["動詞"], "一段"),
+    Kahen: (["動詞"], "カ変"),
+    Sahen: (["動詞"], "サ変"),
+    Adjective: (["形容詞"], "形容詞"),
+    AuxiliaryNai: (["助動詞"], "助動詞"),
+    AuxiliaryDa: (["助動詞"], "助動詞"),
+    AuxiliaryDesu: (["助動詞"], "助動詞"),
+    AuxiliaryMasu: (["助動詞"], "助動詞"),
+}
+
+# surface ending -> base ending, conjugation type, conjugation form
+Rule = Tuple[str, Type[ConjugationType], Type[ConjugationForm]]
+
+
+class Deinflection(NamedTuple):
+    """A base form and the conjugation that gives the surface."""
+
+    base: str
+    c_type: Type[ConjugationType]
+    c_form: Type[ConjugationForm]
+
+
+class Deinflector:
+    """
+    Find the candidate base forms of the surface of a conjugated word.
+
+    Parameters
+    ----------
+    conjugation : Conjugation, optional
+        Conjugation of which the ending tables are inverted. If not specified,
+        the default one is used.
+    lexicon : Lexicon, optional
+        If specified, only the bases in ``lexicon`` with the same conjugation
+        type are kept.
+
+    Examples
+    --------
+    >>> from jadoc.word.cform import RenyoOnbin
+    >>> deinflector = Deinflector()
+    >>> assert ("書く", GodanI, RenyoOnbin) in deinflector.deinflect("書い")
+    """
+
+    def __init__(
+        self,
+        conjugation: Optional[Conjugation] = None,
+        lexicon: Optional[Lexicon] = None,
+    ) -> None:
+        if conjugation is None:
+            conjugation = default_conjugation()
+        self.lexicon = lexicon
+        self._rules: Dict[str, List[Rule]] = {}
+        self._exact: Dict[str, List[Deinflection]] = {}
+        self._max_length = 0
+        for ctype, bases in _SAMPLE_BASES.items():
+            for cform in conjugation._ending_dic.get(ctype, {}):
+                for base in bases:
+                    self._add(conjugation, base, ctype, cform)
+
+    def _add(
+        self,
+        conjugation: Conjugation,
+        base: str,
+        ctype: Type[ConjugationType],
+        cform: Type[ConjugationForm],
+    ) -> None:
+        surface = conjugation.conjugate_base(base, ctype, cform)
+        if surface is None:
+            return
+        if not base.startswith(_STEM):
+            candidates = self._exact.setdefault(surface, [])
+            if (base, ctype, cform) not in candidates:
+                candidates.append(Deinflection(base, ctype, cform))
+            return
+        assert surface.startswith(_STEM)
+        rules = self._rules.setdefault(surface[1:], [])
+        if (base[1:], ctype, cform) not in rules:
+            rules.append((base[1:], ctype, cform))
+        self._max_length = max(self._max_length, len(surface) - 1)
+
+    def _candidates(self, surface: str) -> List[Deinflection]:
+        candidates = list(self._exact.get(surface, []))
+        for n in range(min(len(surface), self._max_length), -1, -1):
+            stem, ending = surface[: len(surface) - n], surface[len(surface) - n :]
+            for base_ending, ctype, cform in self._rules.get(ending, []):
+                base = stem + base_ending
+                if len(base) < 2:
+                    continue
+                pos_info, c_type_info = _TAGS[ctype]
+                if type(get_normalized_ctype(pos_info, base, c_type_info)) != ctype:
+                    continue
+                candidate = Deinflection(base, ctype, cform)
+                if candidate not in candidates:
+                    candidates.append(candidate)
+        return candidates
+
+    def deinflect(self, surface: str) -> List[Deinflection]:
+        """Find the conjugations that give ``surface``.
+
+        Parameters
+        ----------
+        surface : str
+            Surface of a single word, e.g. 書い of 書いた.
+
+        Returns
+        -------
+        list of Deinflection
+            The candidates, those with a longer ending first. A surface in the
+            base form is one of them as ``Shushi``.
+        """
+        candidates = self._candidates(surface)
+        if self.lexicon is None:
+            return candidates
+        lexicon = self.lexicon
+        return [
+            candidate
+            for candidate in candidates
+            if any(
+                type(word.c_type) == candidate.c_type
+                for word in lexicon.lookup(candidate.base)
+            )
+        ]
+
+    def bases(self, surface: str) -> List[str]:
+        """Find the distinct base forms of ``surface`` in the order of
+        ``deinflect``."""
+        bases: List[str] = []
+        for candidate in self.deinflect(surface):
+            if candidate.base not in bases:
+                bases.append(candidate.base)
+        return bases
@@ -1,40 +1,563 @@
-from typing import Dict, List, Optional, Union
-
+from contextlib import contextmanager
+from copy import copy
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .batch import Batch
+from .chunked import ChunkedList, PrefixSumList
 from .conj import Conjugation
-from .mecab.tokenizer import generate_tokenizer
-from .utils import debug_on
+from .events import Listener, TextChange, diff_text
+from .history import History, Splice
+from .index import WordIndex
+from .mecab.reader import FeatureLayout, read_sentences
+from .serialize import dumps_words, loads_words
+from .utils import debug_on, deep_getsizeof
+from .warm import default_conjugation
 from .word.cform import ConjugationForm, Mizen, Renyo, RenyoOnbin
-from .word.ctype import Sahen
+from .word.ctype import ConjugationType, Sahen
+from .word.pos import PartOfSpeech
 from .word.word import Word
 
 
 def show_details(func):
     def _show_details(self, *args, **kwargs) -> None:
+        if not debug_on():
+            return func(self, *args, **kwargs)
         before = self.simple_view()
         result = func(self, *args, **kwargs)
         after = self.simple_view()
-        if debug_on():
-            all_args = ", ".join(
-                [str(a) for a in args] + [f"{k}={str(v)}" for k, v in kwargs.items()]
-            )
-            print(f"{self.__class__.__name__}.{func.__name__}({all_args}): ")
-            if before != after:
-                print(before)
-                print(after)
+        all_args = ", ".join(
+            [str(a) for a in args] + [f"{k}={str(v)}" for k, v in kwargs.items()]
+        )
+        print(f"{self.__class__.__name__}.{func.__name__}({all_args}): ")
+        if before != after:
+            print(before)
+            print(after)
         return result
 
     return _show_details
 
 
+def edit_step(func):
+    """Record the changes made by ``func`` as a single step of the history."""
+
+    def _edit_step(self, *args, **kwargs):
+        with self._edit_step():
+            return func(self, *args, **kwargs)
+
+    return _edit_step
+
+
 class Doc:
-    def __init__(self, text: str, conjugation: Conjugation = None) -> None:
-        if conjugation is None:
-            conjugation = Conjugation(tokenize=generate_tokenizer())
-        self.conjugation = conjugation
-        self.words: List[Word] = self.conjugation.tokenize(text)
+    """
+    A tokenized document that supports CRUD operations on its words.
+
+    Parameters
+    ----------
+    text : str
+        The document.
+    conjugation : Conjugation, optional
+        Conjugation used to tokenize and conjugate words. If not specified,
+        one is generated with the default tokenizer when it is first needed.
+    chunked : bool, optional
+        If True, ``words`` is stored in a ``ChunkedList`` so that positional
+        ``insert`` and ``delete`` on long documents do not shift the whole list.
+    history_size : int, optional
+        The number of edit operations that can be undone (the default is 0, which
+        disables ``undo`` and ``redo``).
+    lazy : bool, optional
+        If True, ``text`` is not tokenized until ``words`` is first accessed, and
+        ``get_text()`` returns ``text`` as it is until the first edit.
+
+    Notes
+    -----
+    Edit ``words`` through the methods of this class. They never modify a
+    ``Word`` in place but replace it with a conjugated copy, which keeps the
+    cached text and the character offset index up to date.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        conjugation: Conjugation = None,
+        chunked: bool = False,
+        history_size: int = 0,
+        lazy: bool = False,
+    ) -> None:
+        self._setup(conjugation, chunked, history_size)
+        self._source = text
+        if lazy:
+            self._words = None
+            return
+        self._words = self._word_list(self.conjugation.tokenize(text))
+        self._source = None
         if debug_on():
             print("Doc.__init__(): \n" + self.simple_view())
 
+    def _setup(
+        self, conjugation: Optional[Conjugation], chunked: bool, history_size: int
+    ) -> None:
+        self._conjugation = conjugation
+        self.chunked = chunked
+        self._words: Optional[MutableSequence[Word]] = []
+        self._words_shared = False  # whether the list is shared with a fork
+        self._source: Optional[str] = None
+        self._text: Optional[str] = None
+        self._offsets: Optional[PrefixSumList] = None
+        self._index: Optional[WordIndex] = None
+        self._batch: Optional[Batch] = None
+        self._listeners: List[Listener] = []
+        self.history: Optional[History] = None
+        if history_size > 0:
+            self.history = History(max_steps=history_size)
+        self._edit_depth = 0
+
+    @classmethod
+    def from_words(
+        cls,
+        words: Iterable[Word],
+        conjugation: Optional[Conjugation] = None,
+        chunked: bool = False,
+        history_size: int = 0,
+    ) -> "Doc":
+        """Construct a document from words without tokenizing.
+
+        Parameters
+        ----------
+        words : iterable of Word
+            The words of the document.
+        conjugation, chunked, history_size
+            See ``Doc``.
+
+        Returns
+        -------
+        Doc
+            The document.
+        """
+        doc = cls.__new__(cls)
+        doc._setup(conjugation, chunked, history_size)
+        doc._words = doc._word_list(list(words))
+        return doc
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, conjugation: Optional[Conjugation] = None, **kwargs
+    ) -> "Doc":
+        """Construct a document from data serialized by ``to_bytes``.
+
+        Loading needs neither MeCab nor the normalizers of ``Word``.
+
+        Parameters
+        ----------
+        data : bytes
+            Serialized document.
+        conjugation : Conjugation, optional
+            See ``Doc``.
+        **kwargs
+            Other arguments of ``from_words``.
+
+        Returns
+        -------
+        Doc
+            The document.
+        """
+        return cls.from_words(loads_words(data), conjugation, **kwargs)
+
+    @classmethod
+    def from_mecab_output(
+        cls,
+        output: Union[str, Iterable[str]],
+        conjugation: Optional[Conjugation] = None,
+        layout: Optional[FeatureLayout] = None,
+        **kwargs,
+    ) -> "Doc":
+        """Construct a document from MeCab output without running MeCab.
+
+        Parameters
+        ----------
+        output : str or iterable of str
+            MeCab output, or its lines. All sentences form a single document.
+            See ``jadoc.mecab.reader.read_sentences`` for the supported formats.
+        conjugation : Conjugation, optional
+            See ``Doc``.
+        layout : FeatureLayout, optional
+            See ``jadoc.mecab.reader.feature_line_to_word``.
+        **kwargs
+            Other arguments of ``from_words``.
+
+        Returns
+        -------
+        Doc
+            The document.
+
+        Examples
+        --------
+        >>> doc = Doc.from_mecab_output("本,名詞-普通名詞,本,,\\nEOS\\n")
+        >>> assert doc.get_text() == "本"
+        """
+        if isinstance(output, str):
+            output = output.splitlines()
+        words = [
+            word for sentence in read_sentences(output, layout) for word in sentence
+        ]
+        return cls.from_words(words, conjugation, **kwargs)
+
+    @classmethod
+    def read_mecab_output(
+        cls,
+        lines: Iterable[str],
+        conjugation: Optional[Conjugation] = None,
+        layout: Optional[FeatureLayout] = None,
+        **kwargs,
+    ) -> Iterator["Doc"]:
+        """Construct a document per sentence of MeCab output, lazily.
+
+        Parameters
+        ----------
+        lines : iterable of str
+            Lines of MeCab output, e.g. an opened file.
+        conjugation, layout, **kwargs
+            See ``from_mecab_output``.
+
+        Yields
+        ------
+        Doc
+            A document per sentence, which ends with ``EOS``.
+        """
+        for words in read_sentences(lines, layout):
+            yield cls.from_words(words, conjugation, **kwargs)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the words of this document.
+
+        Returns
+        -------
+        bytes
+            Data in the format of ``jadoc.serialize.dumps_words``.
+        """
+        return dumps_words(self.words)
+
+    def fork(self) -> "Doc":
+        """Make a copy of this document that can be edited independently.
+
+        The copy shares the ``Conjugation`` and the ``Word`` objects with this
+        document, which is safe because edits never modify a ``Word`` in place.
+        The word storage is shared too and copied on the first edit of either
+        document; a ``chunked`` one copies only the chunks that are modified.
+        Forking takes constant time. The history of the copy starts empty.
+
+        Returns
+        -------
+        Doc
+            The copy.
+
+        Examples
+        --------
+        >>> doc = Doc("本を書きました。")
+        >>> variant = doc.fork()
+        >>> variant.delete(3)
+        >>> assert (doc.get_text(), variant.get_text()) == ("本を書きました。", "本を書いた。")
+        """
+        if self._batch is not None:
+            raise ValueError("Cannot fork a document in a batch.")
+        history_size = 0 if self.history is None else self.history.max_steps
+        doc = self.__class__.__new__(self.__class__)
+        doc._setup(self.conjugation, self.chunked, history_size)
+        doc._source = self._source
+        doc._text = self._text
+        if isinstance(self._words, ChunkedList):
+            doc._words = self._words.fork()
+        else:
+            doc._words = self._words
+            doc._words_shared = self._words_shared = self._words is not None
+        if self._offsets is not None:
+            doc._offsets = self._offsets.fork()
+        return doc
+
+    @property
+    def words(self) -> MutableSequence[Word]:
+        if self._words is None:
+            self._words = self._word_list(self.conjugation.tokenize(self._source))
+        return self._words
+
+    @words.setter
+    def words(self, words: MutableSequence[Word]) -> None:
+        if self._batch is not None:
+            raise ValueError("Cannot set the words of a document in a batch.")
+        if self._words is not None:
+            # a single step of the history, which can be undone
+            with self._edit_step():
+                self._replace_words(0, len(self._words), list(words))
+            return
+        self._words = self._word_list(list(words))
+        self._words_shared = False
+        self._source = None
+        self._text = None
+        self._offsets = None
+        self._index = None
+
+    @property
+    def is_tokenized(self) -> bool:
+        """Whether ``words`` is available without tokenizing."""
+        return self._words is not None
+
+    @property
+    def conjugation(self) -> Conjugation:
+        if self._conjugation is None:
+            self._conjugation = default_conjugation()
+        return self._conjugation
+
+    @conjugation.setter
+    def conjugation(self, conjugation: Conjugation) -> None:
+        self._conjugation = conjugation
+
+    def _word_list(self, words: List[Word]) -> MutableSequence[Word]:
+        if self.chunked:
+            return ChunkedList(words)
+        return words
+
+    def _replace_words(self, start: int, stop: int, words: List[Word]) -> None:
+        """Replace ``self.words[start:stop]`` with ``words``.
+
+        All changes to ``self.words`` go through this method.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self.words))
+        stop = max(start, stop)
+        recording = self.history is not None and self._edit_depth > 0
+        changes: List[TextChange] = []
+        if recording or self._index is not None or self._listeners:
+            old = self.words[start:stop]
+            if recording:
+                self.history.record(Splice(start, tuple(old), tuple(words)))
+            if self._index is not None:
+                self._index.splice(start, stop, old, words)
+            if self._listeners:
+                changes = self._text_changes(start, old, words)
+        if self._offsets is not None:
+            self._offsets[start:stop] = [len(word.surface) for word in words]
+        self._text = None
+        self._source = None
+        if self._words_shared:
+            self._words = list(self._words)
+            self._words_shared = False
+        self.words[start:stop] = words
+        for change in changes:
+            for listener in list(self._listeners):
+                listener(change)
+
+    def _text_changes(
+        self, start: int, old: List[Word], words: List[Word]
+    ) -> List[TextChange]:
+        changes = []
+        if self._source is not None:
+            text = "".join(word.surface for word in self.words)
+            if text != self._source:
+                # the first edit of a lazy document whose text was not joined yet
+                changes.append(TextChange(0, len(self._source), text))
+        change = diff_text(
+            self.word_to_char(start),
+            "".join(word.surface for word in old),
+            "".join(word.surface for word in words),
+        )
+        if change is not None:
+            changes.append(change)
+        return changes
+
+    def subscribe(self, listener: Listener) -> None:
+        """Call ``listener`` with a ``TextChange`` on every change of the text.
+
+        Every change, including the conjugation of neighboring words, is reported
+        as the minimal span of the text before the change and its replacement.
+
+        Parameters
+        ----------
+        listener : function
+            A function that takes a ``jadoc.events.TextChange``.
+
+        Examples
+        --------
+        >>> doc = Doc("本を書きました。")
+        >>> changes = []
+        >>> doc.subscribe(changes.append)
+        >>> doc.delete(3)
+        >>> assert changes == [TextChange(4, 6, ""), TextChange(3, 4, "い")]
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        """Stop calling ``listener``."""
+        self._listeners.remove(listener)
+
+    def _set_word(self, i: int, word: Word) -> None:
+        self._replace_words(i, i + 1, [word])
+
+    @contextmanager
+    def _edit_step(self) -> Iterator[None]:
+        self._edit_depth += 1
+        try:
+            yield
+        finally:
+            self._edit_depth -= 1
+            if self._edit_depth == 0 and self.history is not None:
+                self.history.end_step()
+
+    def _apply(self, splices: List[Splice]) -> None:
+        for splice in splices:
+            self._replace_words(
+                splice.start, splice.start + len(splice.old), list(splice.new)
+            )
+
+    def checkpoint(self) -> int:
+        """Mark the current state so that ``undo`` can return to it.
+
+        Returns
+        -------
+        int
+            A marker to be passed to ``undo``.
+
+        Raises
+        ------
+        ValueError
+            If the history is disabled.
+        """
+        if self.history is None:
+            raise ValueError("The history is disabled. Set history_size.")
+        return self.history.checkpoint()
+
+    def undo(self, checkpoint: Optional[int] = None) -> bool:
+        """Undo the last edit operation, or all of them since ``checkpoint``.
+
+        Parameters
+        ----------
+        checkpoint : int, optional
+            A marker returned by ``checkpoint``.
+
+        Returns
+        -------
+        bool
+            True if something was undone, False otherwise.
+
+        Raises
+        ------
+        ValueError
+            If ``checkpoint`` is no longer in the history.
+        """
+        if self.history is None:
+            return False
+        self.history.end_step()
+        n = 1 if checkpoint is None else self.history.steps_to(checkpoint)
+        undone = False
+        for _ in range(n):
+            step = self.history.pop_undo()
+            if step is None:
+                break
+            self._apply([splice.inverse() for splice in reversed(step.splices)])
+            undone = True
+        return undone
+
+    def redo(self) -> bool:
+        """Redo the last undone edit operation.
+
+        Returns
+        -------
+        bool
+            True if something was redone, False otherwise.
+        """
+        if self.history is None:
+            return False
+        step = self.history.pop_redo()
+        if step is None:
+            return False
+        self._apply(list(step.splices))
+        return True
+
+    def _offset_index(self) -> PrefixSumList:
+        if self._offsets is None:
+            self._offsets = PrefixSumList(len(word.surface) for word in self.words)
+        return self._offsets
+
+    def word_to_char(self, i: int) -> int:
+        """Get the character offset at which the ``i``-th word starts.
+
+        Parameters
+        ----------
+        i : int
+            Word index, from 0 to ``len(self.words)``.
+
+        Returns
+        -------
+        int
+            Character offset in ``self.get_text()``.
+        """
+        return self._offset_index().prefix_sum(i)
+
+    def char_to_word(self, offset: int) -> int:
+        """Get the index of the word that contains a character.
+
+        Parameters
+        ----------
+        offset : int
+            Character offset in ``self.get_text()``.
+
+        Returns
+        -------
+        int
+            Word index.
+
+        Raises
+        ------
+        IndexError
+            If ``offset`` is out of the text.
+        """
+        return self._offset_index().find(offset)
+
+    def find(
+        self,
+        base: Optional[str] = None,
+        pos: Optional[Type[PartOfSpeech]] = None,
+        c_type: Optional[Type[ConjugationType]] = None,
+        c_form: Optional[Type[ConjugationForm]] = None,
+    ) -> List[int]:
+        """Find the words that meet all the given conditions.
+
+        The first call builds a ``WordIndex`` of this document, which is then
+        updated by every edit.
+
+        Parameters
+        ----------
+        base : str, optional
+            Base form.
+        pos : type, optional
+            Subclass of ``PartOfSpeech``. Its subclasses also match.
+        c_type : type, optional
+            Subclass of ``ConjugationType``. Its subclasses also match.
+        c_form : type, optional
+            Subclass of ``ConjugationForm``. Its subclasses also match.
+
+        Returns
+        -------
+        list of int
+            Sorted indices of the words.
+
+        Examples
+        --------
+        >>> from jadoc.word.pos import Verb
+        >>> doc = Doc("本を書いて、手紙を書きます。")
+        >>> assert doc.find(base="書く", pos=Verb) == [2, 7]
+        """
+        if self._index is None:
+            self._index = WordIndex(self.words)
+        return self._index.find(base=base, pos=pos, c_type=c_type, c_form=c_form)
+
     def is_within_range(self, interval: Union[int, range]) -> bool:
         index_max = len(self.words) - 1
         if type(interval) == int:
@@ -44,20 +567,38 @@ class Doc:
 
     def get_text(self, interval: Optional[Union[int, range]] = None) -> str:
         if interval is None:
-            interval = range(0, len(self.words))
+            if self._source is not None:
+                return self._source
+            if self._text is None:
+                self._text = "".join(word.surface for word in self.words)
+            return self._text
         if type(interval) == int:
             interval = range(interval, interval + 1)
 
+        if interval.step == 1 and 0 <= interval.start <= interval.stop <= len(
+            self.words
+        ):
+            if self._text is not None and self._offsets is not None:
+                begin = self.word_to_char(interval.start)
+                end = self.word_to_char(interval.stop)
+                return self._text[begin:end]
+            return "".join(
+                word.surface for word in self.words[interval.start : interval.stop]
+            )
+
         surface = ""
         for i in interval:
             surface += self.words[i].surface
         return surface
 
     @show_details
+    @edit_step
     def retokenize(self, text: Optional[str] = None) -> None:
+        if self._batch is not None:
+            raise ValueError("Cannot retokenize a document in a batch.")
         if text is None:
             text = self.get_text()
-        self.words = self.conjugation.tokenize(text)
+        self._replace_words(0, len(self.words), self.conjugation.tokenize(text))
 
     @show_details
     def _conjugate_irregularly(self, i: int, c_form: ConjugationForm) -> bool:
@@ -81,7 +622,7 @@ class Doc:
             ]
         )
         if is_aru_mizen_case:
-            del self.words[i]
+            self._replace_words(i, i + 1, [])
             return True
 
         # irregular case of 「する」
@@ -90,12 +631,16 @@ class Doc:
         )
         if is_suru_mizen_case:
             if self.words[i + 1].base in ("せる", "れる"):
-                self.words[i].surface = "さ"
-                self.words[i].c_form = Mizen(value="未然形")
+                word = copy(self.words[i])
+                word.surface = "さ"
+                word.c_form = Mizen(value="未然形")
+                self._set_word(i, word)
                 return True
             elif self.words[i + 1].base == "ぬ":
-                self.words[i].surface = "せ"
-                self.words[i].c_form = Mizen(value="未然形")
+                word = copy(self.words[i])
+                word.surface = "せ"
+                word.c_form = Mizen(value="未然形")
+                self._set_word(i, word)
                 return True
 
         return False
@@ -106,16 +651,30 @@ class Doc:
         s = surface[0]
 
         renyo_onbin = RenyoOnbin(value="連用形-音便")
-        self.conjugation.conjugate(self.words[i], renyo_onbin)
+        self._conjugate_word(i, renyo_onbin)
 
-        if self.words[i].base[-1] in "ぬぶむ":
+        if self.words[i].base[-1] in "ぬぶむぐ":
             s = s.replace("た", "だ").replace("て", "で")
         else:
             s = s.replace("だ", "た").replace("で", "て")
-        self.words[i + 1].surface = s + surface[1:]
+        if s + surface[1:] != surface:
+            next_word = copy(self.words[i + 1])
+            next_word.surface = s + surface[1:]
+            self._set_word(i + 1, next_word)
+
+    def _conjugate_word(self, i: int, c_form: ConjugationForm) -> None:
+        """Conjugate a copy of the ``i``-th word and replace it if changed."""
+        word = self.words[i]
+        new_word = self.conjugation.conjugate(copy(word), c_form)
+        if new_word.surface != word.surface or new_word.c_form is not word.c_form:
+            self._set_word(i, new_word)
 
     @show_details
+    @edit_step
     def conjugate(self, i: int, c_form: ConjugationForm) -> None:
+        if self._batch is not None:
+            self._batch.conjugate(i, c_form)
+            return
         if not self.is_within_range(i):
             return
 
@@ -135,20 +694,63 @@ class Doc:
         # normal case
         if cform == RenyoOnbin and not next_is_td:
             c_form = Renyo("連用形")
-        self.conjugation.conjugate(self.words[i], c_form)
+        self._conjugate_word(i, c_form)
+
+    @contextmanager
+    def batch(self) -> Iterator[Batch]:
+        """Collect ``insert``, ``delete`` and ``update`` and apply them at once.
+
+        Inside the ``with`` block these methods and ``conjugate`` only record the
+        edit, with indices that refer to the document before the block. The edits
+        are applied when the block exits without an exception, and discarded
+        otherwise. ``retokenize`` and ``update_surfaces`` cannot be batched and
+        raise ``ValueError`` inside the block.
+
+        Yields
+        ------
+        Batch
+            The collected edits.
+
+        Examples
+        --------
+        >>> doc = Doc("本を書きました。")
+        >>> with doc.batch():
+        ...     doc.delete(3)
+        ...     doc.update(0, doc.conjugation.tokenize("手紙"))
+        >>> assert doc.get_text() == "手紙を書いた。"
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+        batch = Batch(self)
+        self._batch = batch
+        try:
+            yield batch
+        finally:
+            self._batch = None
+        with self._edit_step():
+            batch.commit()
 
     @show_details
+    @edit_step
     def insert(self, i: int, words: Union[Word, List[Word]]) -> None:
+        if self._batch is not None:
+            self._batch.insert(i, words)
+            return
         if type(words) == Word:
             words = [words]
-        self.words[i:i] = words
+        self._replace_words(i, i, words)
 
         c_form = self.words[i - 1].c_form
         self.conjugate(i - 1, c_form)
         self.conjugate(i - 1 + len(words), c_form)
 
     @show_details
+    @edit_step
     def delete(self, interval: Union[int, range]) -> None:
+        if self._batch is not None:
+            self._batch.delete(interval)
+            return
         if type(interval) == int:
             interval = range(interval, interval + 1)
 
@@ -156,13 +758,17 @@ class Doc:
             return
 
         c_form = self.words[interval.stop - 1].c_form
-        del self.words[interval.start : interval.stop]
+        self._replace_words(interval.start, interval.stop, [])
         self.conjugate(interval.start - 1, c_form)
 
     @show_details
+    @edit_step
     def update(
         self, interval: Union[int, range], words: Union[Word, List[Word]]
     ) -> None:
+        if self._batch is not None:
+            self._batch.update(interval, words)
+            return
         if type(interval) == int:
             interval = range(interval, interval + 1)
         if not self.is_within_range(interval):
@@ -170,14 +776,76 @@ class Doc:
         if type(words) == Word:
             words = [words]
 
-        n = len(words)
-        self.insert(interval.start, words)
-        self.delete(range(interval.start + n, interval.stop + n))
+        # The result is that of ``insert(start, words)`` followed by the
+        # ``delete`` of the old words, but the conjugation of the neighbors is
+        # worked out on a copy of the affected words, which are spliced in once.
+        start, stop = interval.start, interval.stop
+        c_form = self.words[start - 1].c_form
+        last_c_form = self.words[stop - 1].c_form
+        left = max(start - 1, 0)
+        right = min(stop + 1, len(self.words))
+
+        segment = Doc.from_words(
+            self.words[left:start] + list(words) + [self.words[start]],
+            self.conjugation,
+        )
+        # fixups of ``insert``, followed by the first old word
+        segment.conjugate(start - left - 1, c_form)
+        segment.conjugate(len(segment.words) - 2, c_form)
+        # fixup of ``delete``, followed by the word after the old words
+        n = len(segment.words)
+        segment._replace_words(n - 1, n, self.words[stop:right])
+        segment.conjugate(len(segment.words) - 1 - (right - stop), last_c_form)
+        self._replace_words(left, right, list(segment.words))
+
+    @show_details
+    @edit_step
+    def apply_edits(self, edits: Iterable[Tuple[int, int, List[Word]]]) -> None:
+        """Replace several spans of words as one edit.
+
+        Unlike ``update``, the words around the spans are not conjugated, so the
+        new words should already fit them.
+
+        Parameters
+        ----------
+        edits : iterable of tuple
+            The start, the stop and the new words of each span. The indices refer
+            to the document before the edits, and the spans must not overlap.
+
+        Raises
+        ------
+        ValueError
+            If a span is out of range, if two spans overlap or if the document is
+            in ``batch``.
+
+        Examples
+        --------
+        >>> doc = Doc("本を書いた。")
+        >>> doc.apply_edits([(0, 1, doc.conjugation.tokenize("手紙")), (4, 5, [])])
+        >>> assert doc.get_text() == "手紙を書いた"
+        """
+        if self._batch is not None:
+            raise ValueError("Cannot apply edits to a document in a batch.")
+        edits = sorted(edits, key=lambda edit: (edit[0], edit[1]))
+        n = len(self.words)
+        for start, stop, _ in edits:
+            if not 0 <= start <= stop <= n:
+                raise ValueError(f"Edit out of range: {start}:{stop}")
+        for left, right in zip(edits, edits[1:]):
+            if left[1] > right[0]:
+                raise ValueError(
+                    f"Overlapping edits: {left[0]}:{left[1]} and {right[0]}:{right[1]}"
+                )
+        for start, stop, words in reversed(edits):
+            self._replace_words(start, stop, list(words))
 
     @show_details
+    @edit_step
     def update_surfaces(
         self, interval: Union[int, range], surfaces: Union[str, List[str]]
     ) -> None:
+        if self._batch is not None:
+            raise ValueError("Cannot update surfaces of a document in a batch.")
         if type(interval) == int:
             interval = range(interval, interval + 1)
         if not self.is_within_range(interval):
@@ -203,3 +871,39 @@ class Doc:
 
     def to_word_list(self) -> List[Dict[str, str]]:
         return [word.to_dict() for word in self.words]
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Estimate the memory used by this document, in bytes.
+
+        The sizes are measured with ``jadoc.utils.deep_getsizeof``, and an object
+        referred to by several parts is counted in the first one only. The
+        ``Conjugation`` is not counted because it is usually shared by many
+        documents. Words shared with a ``fork`` are counted in both documents.
+
+        Returns
+        -------
+        dict
+            The bytes of the ``words``, of the cached ``text``, of the character
+            ``offsets``, of the word ``index``, of the ``history``, of the rest of
+            the document (``other``) and their ``total``.
+
+        Examples
+        --------
+        >>> usage = Doc("本を書きました。").memory_usage()
+        >>> assert usage["total"] == sum(v for k, v in usage.items() if k != "total")
+        """
+        seen = {id(self._conjugation), id(None)}
+        parts = {
+            "words": [self._words],
+            "text": [self._text, self._source],
+            "offsets": [self._offsets],
+            "index": [self._index],
+            "history": [self.history],
+            "other": [self],
+        }
+        usage = {
+            name: sum(deep_getsizeof(obj, seen) for obj in objs)
+            for name, objs in parts.items()
+        }
+        usage["total"] = sum(usage.values())
+        return usage
@@ -36,3 +36,27 @@ class InvalidTokenizerError(JadocError):
     """
 
     pass
+
+
+class InvalidFormatError(JadocError):
+    """
+    Raised when serialized data is not in the expected format.
+    """
+
+    pass
+
+
+class ScriptSyntaxError(JadocError):
+    """
+    Raised when an edit script or a token pattern cannot be parsed.
+    """
+
+    pass
+
+
+class InvalidRequestError(JadocError):
+    """
+    Raised when a request to ``jadoc serve`` is not valid.
+    """
+
+    pass
@@ -0,0 +1,60 @@
+from typing import Callable, NamedTuple, Optional
+
+
+class TextChange(NamedTuple):
+    """
+    ``text[start:end]`` of a document was replaced with ``new``.
+
+    The offsets refer to the text before the change.
+    """
+
+    start: int
+    end: int
+    new: str
+
+    def apply(self, text: str) -> str:
+        """Apply this change to ``text``."""
+        return text[: self.start] + self.new + text[self.end :]
+
+
+Listener = Callable[[TextChange], None]
+
+
+def diff_text(offset: int, before: str, after: str) -> Optional[TextChange]:
+    """Get the minimal change that turns ``before`` into ``after``.
+
+    Parameters
+    ----------
+    offset : int
+        The offset of ``before`` in the whole text.
+    before : str
+        The old substring.
+    after : str
+        The new substring.
+
+    Returns
+    -------
+    TextChange or None
+        The change, or None if the strings are equal.
+
+    Examples
+    --------
+    >>> assert diff_text(10, "書きました", "書いた") == TextChange(11, 14, "い")
+    """
+    if before == after:
+        return None
+    n = min(len(before), len(after))
+    prefix = 0
+    while prefix < n and before[prefix] == after[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < n - prefix
+        and before[len(before) - 1 - suffix] == after[len(after) - 1 - suffix]
+    ):
+        suffix += 1
+    return TextChange(
+        offset + prefix,
+        offset + len(before) - suffix,
+        after[prefix : len(after) - suffix],
+    )
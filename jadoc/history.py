@@ -0,0 +1,110 @@
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional, Tuple
+
+from .word.word import Word
+
+
+class Splice(NamedTuple):
+    """
+    ``words[start:start + len(old)]`` was replaced with ``new``.
+    """
+
+    start: int
+    old: Tuple[Word, ...]
+    new: Tuple[Word, ...]
+
+    def inverse(self) -> "Splice":
+        return Splice(self.start, self.new, self.old)
+
+
+class Step(NamedTuple):
+    id: int
+    splices: Tuple[Splice, ...]
+
+
+class History:
+    """
+    Undo and redo log of a ``Doc``.
+
+    Each step holds the splices made by one edit operation. Since ``Doc`` never
+    modifies a ``Word`` in place, a splice refers to the replaced words instead of
+    copying them, and a step costs memory proportional to what changed.
+
+    Parameters
+    ----------
+    max_steps : int
+        The maximum number of steps that can be undone.
+    """
+
+    def __init__(self, max_steps: int) -> None:
+        if max_steps < 1:
+            raise ValueError("max_steps must be positive.")
+        self.max_steps = max_steps
+        self._undo: Deque[Step] = deque(maxlen=max_steps)
+        self._redo: List[Step] = []
+        self._pending: List[Splice] = []
+        self._last_id = 0
+        self._oldest_id = 0  # the step before the oldest step that can be undone
+
+    def _push_undo(self, step: Step) -> None:
+        if len(self._undo) == self.max_steps:
+            self._oldest_id = self._undo[0].id
+        self._undo.append(step)
+
+    def record(self, splice: Splice) -> None:
+        self._pending.append(splice)
+
+    def end_step(self) -> None:
+        """Close the splices recorded so far into a step."""
+        if not self._pending:
+            return
+        self._last_id += 1
+        self._push_undo(Step(self._last_id, tuple(self._pending)))
+        self._pending = []
+        self._redo = []
+
+    def checkpoint(self) -> int:
+        """Mark the current state.
+
+        Returns
+        -------
+        int
+            A marker to be passed to ``Doc.undo``.
+        """
+        self.end_step()
+        return self._undo[-1].id if self._undo else self._oldest_id
+
+    def can_undo(self) -> bool:
+        return len(self._undo) > 0
+
+    def can_redo(self) -> bool:
+        return len(self._redo) > 0
+
+    def steps_to(self, checkpoint: int) -> int:
+        """Count the steps to be undone to get back to ``checkpoint``.
+
+        Raises
+        ------
+        ValueError
+            If ``checkpoint`` is not in the history.
+        """
+        for n, step in enumerate(reversed(self._undo)):
+            if step.id == checkpoint:
+                return n
+        if checkpoint == self._oldest_id:
+            return len(self._undo)
+        raise ValueError(f"Checkpoint {checkpoint} is not in the history.")
+
+    def pop_undo(self) -> Optional[Step]:
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        return step
+
+    def pop_redo(self) -> Optional[Step]:
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._push_undo(step)
+        return step
@@ -0,0 +1,259 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from .chunked import DEFAULT_CHUNK_SIZE, FenwickTree
+from .word.cform import ConjugationForm
+from .word.ctype import ConjugationType
+from .word.pos import PartOfSpeech
+from .word.word import Word
+
+Key = Tuple[str, Any]
+
+MAX_PENDING_SPLICES = 1024
+
+
+def index_keys(word: Word) -> List[Key]:
+    """Get the keys under which ``word`` is indexed."""
+    return [
+        ("base", word.base),
+        ("pos", type(word.pos)),
+        ("c_type", type(word.c_type)),
+        ("c_form", type(word.c_form)),
+    ]
+
+
+class Postings:
+    """
+    Sorted word positions stored in chunks.
+
+    Each chunk stores its positions minus a shift, and the shifts are kept in a
+    ``FenwickTree`` as differences between consecutive chunks. A splice updates
+    the chunks of the positions it removes and a single value of the tree, so it
+    takes logarithmic time in the number of chunks instead of shifting every
+    position after it.
+
+    Parameters
+    ----------
+    positions : iterable of int
+        Sorted positions.
+    chunk_size : int, optional
+        The number of positions in a chunk when it is built.
+
+    Examples
+    --------
+    >>> postings = Postings([1, 4, 6], chunk_size=1)
+    >>> postings.splice(2, 5, 1)
+    >>> postings.add(2)
+    >>> assert postings.to_list() == [1, 2, 4]
+    """
+
+    def __init__(
+        self, positions: Iterable[int] = (), chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+        positions = list(positions)
+        self._chunk_size = chunk_size
+        self._len = len(positions)
+        self._set_chunks(
+            [
+                positions[i : i + chunk_size]
+                for i in range(0, len(positions), chunk_size)
+            ],
+            [0] * -(-len(positions) // chunk_size),
+        )
+
+    def _set_chunks(self, chunks: List[List[int]], shifts: List[int]) -> None:
+        self._chunks = chunks
+        self._shifts = FenwickTree(b - a for a, b in zip([0] + shifts, shifts))
+
+    def _shift(self, c: int) -> int:
+        return self._shifts.prefix_sum(c + 1)
+
+    def _all_shifts(self) -> List[int]:
+        return [self._shift(c) for c in range(len(self._chunks))]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def to_list(self) -> List[int]:
+        positions: List[int] = []
+        for chunk, shift in zip(self._chunks, self._all_shifts()):
+            positions.extend(p + shift for p in chunk)
+        return positions
+
+    def _find_chunk(self, x: int) -> int:
+        """The first chunk whose last position is not less than ``x``."""
+        lo, hi = 0, len(self._chunks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._chunks[mid][-1] + self._shift(mid) < x:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def splice(self, start: int, stop: int, n: int) -> None:
+        """Remove the positions in ``range(start, stop)`` and shift the ones after
+        them as if ``stop - start`` words were replaced with ``n`` words."""
+        delta = n - (stop - start)
+        chunks = self._chunks
+        c = self._find_chunk(start)
+        emptied = False
+        while c < len(chunks):
+            chunk, shift = chunks[c], self._shift(c)
+            if chunk[0] + shift >= stop:
+                break
+            i = bisect_left(chunk, start - shift)
+            j = bisect_left(chunk, stop - shift)
+            chunk[i:] = [p + delta for p in chunk[j:]]
+            self._len -= j - i
+            emptied = emptied or not chunk
+            c += 1
+        if c < len(chunks) and delta:
+            self._shifts.add(c, delta)
+        if emptied:
+            kept = [(chunk, s) for chunk, s in zip(chunks, self._all_shifts()) if chunk]
+            self._set_chunks([k[0] for k in kept], [k[1] for k in kept])
+
+    def add(self, x: int) -> None:
+        """Insert the position ``x``."""
+        self._len += 1
+        if not self._chunks:
+            self._set_chunks([[x]], [0])
+            return
+        c = min(self._find_chunk(x), len(self._chunks) - 1)
+        chunk = self._chunks[c]
+        insort(chunk, x - self._shift(c))
+        if len(chunk) > 2 * self._chunk_size:
+            shifts = self._all_shifts()
+            half = len(chunk) // 2
+            self._chunks[c : c + 1] = [chunk[:half], chunk[half:]]
+            shifts.insert(c, shifts[c])
+            self._set_chunks(self._chunks, shifts)
+
+
+class WordIndex:
+    """
+    Inverted index from the base form and the classes of ``pos``, ``c_type`` and
+    ``c_form`` to word positions.
+
+    Splices update only the keys of the words they remove or add, in time
+    logarithmic in the number of their positions (see ``Postings``). The shift
+    of the positions after a splice is recorded in a log and applied to the other
+    keys when they are looked up. The classes are listed by kind, so a lookup by
+    class does not go through the keys of the base forms.
+
+    Parameters
+    ----------
+    words : iterable of Word
+        The words to be indexed.
+    """
+
+    def __init__(self, words: Iterable[Word]) -> None:
+        positions: Dict[Key, List[int]] = defaultdict(list)
+        for i, word in enumerate(words):
+            for key in index_keys(word):
+                positions[key].append(i)
+        self._postings: Dict[Key, Postings] = {
+            key: Postings(p) for key, p in positions.items()
+        }
+        self._classes: Dict[str, Set[Type]] = defaultdict(set)
+        for kind, value in self._postings:
+            if kind != "base":
+                self._classes[kind].add(value)
+        self._log: List[Tuple[int, int, int]] = []
+        self._versions: Dict[Key, int] = {key: 0 for key in self._postings}
+
+    def _sync(self, key: Key) -> Postings:
+        postings = self._postings[key]
+        for start, stop, n in self._log[self._versions.get(key, len(self._log)) :]:
+            postings.splice(start, stop, n)
+        self._versions[key] = len(self._log)
+        return postings
+
+    def splice(
+        self, start: int, stop: int, old_words: Iterable[Word], words: List[Word]
+    ) -> None:
+        """Update the index for ``words[start:stop]`` replaced with ``words``.
+
+        Parameters
+        ----------
+        start : int
+            Non-negative index of the first replaced word.
+        stop : int
+            Index after the last replaced word.
+        old_words : iterable of Word
+            The replaced words.
+        words : list of Word
+            The new words.
+        """
+        keys = {key for word in old_words for key in index_keys(word)}
+        keys.update(key for word in words for key in index_keys(word))
+        for key in keys:
+            if key in self._postings:
+                self._sync(key)
+        self._log.append((start, stop, len(words)))
+        for key in keys:
+            if key in self._postings:
+                self._postings[key].splice(start, stop, len(words))
+            else:
+                self._postings[key] = Postings()
+                if key[0] != "base":
+                    self._classes[key[0]].add(key[1])
+            self._versions[key] = len(self._log)
+        for i, word in enumerate(words, start):
+            for key in index_keys(word):
+                self._postings[key].add(i)
+        if len(self._log) > MAX_PENDING_SPLICES:
+            self._compact()
+
+    def _compact(self) -> None:
+        for key in list(self._postings):
+            if not self._sync(key):
+                del self._postings[key]
+                del self._versions[key]
+                if key[0] != "base":
+                    self._classes[key[0]].discard(key[1])
+        self._log = []
+        self._versions = {key: 0 for key in self._postings}
+
+    def positions(self, key: Key) -> List[int]:
+        """Get the sorted positions of the words indexed under ``key``."""
+        if key not in self._postings:
+            return []
+        return self._sync(key).to_list()
+
+    def _class_positions(self, kind: str, cls: Type) -> Set[int]:
+        positions: Set[int] = set()
+        for value in self._classes[kind]:
+            if issubclass(value, cls):
+                positions.update(self._sync((kind, value)).to_list())
+        return positions
+
+    def find(
+        self,
+        base: Optional[str] = None,
+        pos: Optional[Type[PartOfSpeech]] = None,
+        c_type: Optional[Type[ConjugationType]] = None,
+        c_form: Optional[Type[ConjugationForm]] = None,
+    ) -> List[int]:
+        """Find the positions of the words that meet all the given conditions.
+
+        The classes match their subclasses too, e.g. ``ctype.Godan`` matches
+        ``ctype.GodanI``.
+
+        Returns
+        -------
+        list of int
+            Sorted word positions.
+        """
+        candidates: List[Set[int]] = []
+        if base is not None:
+            candidates.append(set(self.positions(("base", base))))
+        for kind, cls in (("pos", pos), ("c_type", c_type), ("c_form", c_form)):
+            if cls is not None:
+                candidates.append(self._class_positions(kind, cls))
+        if not candidates:
+            raise ValueError("Specify at least one condition.")
+        candidates.sort(key=len)
+        return sorted(candidates[0].intersection(*candidates[1:]))
@@ -0,0 +1,278 @@
+"""
+An index of the lemmas of a MeCab dictionary.
+
+A ``Lexicon`` builds the word of a known lemma without running MeCab. It is read
+from the source CSV files of the dictionary if they are installed, or otherwise
+from the feature table of its compiled ``sys.dic``, and is saved in the format of
+``jadoc.serialize`` so that it is built only once per dictionary.
+"""
+
+import csv
+import hashlib
+import os
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from .errors import InvalidFormatError
+from .mecab.config import get_dicdirs
+from .mecab.reader import FeatureLayout
+from .mecab.tokenizer import _find_feature_indices
+from .serialize import FIELDS, decode_words, dumps_words, loads_encoded
+from .word.pos import PartOfSpeech
+from .word.word import Word
+
+PathLike = Union[str, Path]
+
+# c_form of the entries kept for conjugating words (IPAdic, UniDic)
+_BASE_FORMS = ("基本形", "終止形")
+
+_SYS_DIC_MAGIC = 0xE45E4711
+_SYS_DIC_HEADER = struct.Struct("<10I32s")
+_TOKEN = struct.Struct("<HHHhII")  # lcAttr, rcAttr, posid, wcost, feature, compound
+
+
+def _sys_dic_entries(path: Path) -> Iterator[Tuple[int, List[str]]]:
+    """Read the cost and the features of each entry of a compiled ``sys.dic``."""
+    data = path.read_bytes()
+    try:
+        header = _SYS_DIC_HEADER.unpack_from(data)
+    except struct.error as e:
+        raise InvalidFormatError(f"{path}: {e}")
+    magic, _, _, _, _, _, dsize, tsize, fsize, _, charset = header
+    if magic != _SYS_DIC_MAGIC:
+        raise InvalidFormatError(f"{path} is not a MeCab dictionary.")
+    encoding = charset.split(b"\0", 1)[0].decode("ascii") or "utf-8"
+
+    t_offset = _SYS_DIC_HEADER.size + dsize
+    f_offset = t_offset + tsize
+    features = data[f_offset : f_offset + fsize]
+    costs: Dict[int, int] = {}
+    for _, _, _, cost, feature, _ in _TOKEN.iter_unpack(
+        data[t_offset : t_offset + tsize]
+    ):
+        if costs.get(feature, cost) >= cost:
+            costs[feature] = cost
+    for feature, cost in costs.items():
+        end = features.index(b"\0", feature)
+        line = features[feature:end].decode(encoding)
+        yield cost, next(csv.reader([line]))
+
+
+def _csv_entries(paths: List[Path], encoding: str) -> Iterator[Tuple[int, List[str]]]:
+    """Read the cost and the features of each row of the source CSV files."""
+    for path in paths:
+        with path.open(encoding=encoding, newline="") as f:
+            for row in csv.reader(f):
+                if len(row) > 4:
+                    yield int(row[3]), row[4:]
+
+
+def _field(features: List[str], i: int) -> str:
+    if i < len(features) and features[i] != "*":
+        return features[i]
+    return ""
+
+
+def _layout(dicdir: PathLike) -> FeatureLayout:
+    pos_i, base_i, c_type_i, c_form_i = _find_feature_indices(str(dicdir))
+    return FeatureLayout(
+        base=base_i - pos_i, c_type=c_type_i - pos_i, c_form=c_form_i - pos_i
+    )
+
+
+class Lexicon:
+    """
+    Words of the lemmas of a dictionary, by base form.
+
+    Each entry is the base form of a lemma with its part-of-speech and
+    conjugation type, as MeCab would tokenize it. Entries of the same lemma are
+    ordered by their cost in the dictionary, so the first one is the most usual.
+    The words are stored encoded and are decoded when they are looked up.
+
+    Parameters
+    ----------
+    data : bytes
+        Words serialized by ``jadoc.serialize.dumps_words``.
+
+    Examples
+    --------
+    >>> lexicon = Lexicon.from_words([Word("読む", ["動詞"], "読む", "五段", "終止形")])
+    >>> assert "読む" in lexicon and len(lexicon) == 1
+    >>> assert lexicon.word("読む").surface == "読む"
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self._strings, self._values = loads_encoded(data)
+        self._index: Optional[Dict[str, List[int]]] = None
+
+    @classmethod
+    def from_words(cls, words: List[Word]) -> "Lexicon":
+        return cls(dumps_words(words))
+
+    @classmethod
+    def from_dicdir(
+        cls,
+        dicdir: Optional[PathLike] = None,
+        layout: Optional[FeatureLayout] = None,
+        encoding: str = "utf-8",
+    ) -> "Lexicon":
+        """Build the lexicon of a dictionary.
+
+        Parameters
+        ----------
+        dicdir : str or Path, optional
+            Path of MeCab dictionary directory (the default is the first one of
+            ``get_dicdirs``).
+        layout : FeatureLayout, optional
+            Positions of the attributes in the features. If not specified, they
+            are found by MeCab as in ``_find_node_format``.
+        encoding : str, optional
+            Encoding of the CSV files (the default is "utf-8"). The encoding of
+            ``sys.dic`` is read from its header.
+
+        Returns
+        -------
+        Lexicon
+            The lexicon.
+
+        Raises
+        ------
+        InvalidFormatError
+            If the directory has neither CSV files nor ``sys.dic``.
+        """
+        dicdir = Path(dicdir) if dicdir is not None else get_dicdirs()[0]
+        if layout is None:
+            layout = _layout(dicdir)
+        csv_paths = sorted(dicdir.glob("*.csv"))
+        if csv_paths:
+            entries = _csv_entries(csv_paths, encoding)
+        elif (dicdir / "sys.dic").is_file():
+            entries = _sys_dic_entries(dicdir / "sys.dic")
+        else:
+            raise InvalidFormatError(f"No dictionary is found in {dicdir}.")
+
+        best: Dict[Tuple[str, Tuple[str, ...], str], Tuple[int, str]] = {}
+        for cost, features in entries:
+            base = _field(features, layout.base)
+            c_type = _field(features, layout.c_type)
+            c_form = _field(features, layout.c_form)
+            if not base or (c_type and not c_form.startswith(_BASE_FORMS)):
+                continue
+            pos = tuple(f for f in features[: layout.pos_size] if f not in ("", "*"))
+            key = (base, pos, c_type)
+            if key not in best or best[key][0] > cost:
+                best[key] = (cost, c_form)
+
+        entries_by_cost = sorted(best.items(), key=lambda item: item[1][0])
+        words = [
+            Word(base, list(pos) or [""], base, c_type, c_form)
+            for (base, pos, c_type), (_, c_form) in entries_by_cost
+        ]
+        return cls.from_words(words)
+
+    def to_bytes(self) -> bytes:
+        return dumps_words(decode_words(self._values, self._strings))
+
+    def _positions(self) -> Dict[str, List[int]]:
+        if self._index is None:
+            index: Dict[str, List[int]] = {}
+            strings, values = self._strings, self._values
+            for i in range(0, len(values), FIELDS):
+                index.setdefault(strings[values[i + 1]], []).append(i)
+            self._index = index
+        return self._index
+
+    def __contains__(self, lemma: str) -> bool:
+        return lemma in self._positions()
+
+    def __len__(self) -> int:
+        return len(self._values) // FIELDS
+
+    def lookup(self, lemma: str) -> List[Word]:
+        """Get new words of all the entries of ``lemma``, the most usual first."""
+        values = self._values
+        words = []
+        for i in self._positions().get(lemma, []):
+            words.extend(decode_words(values[i : i + FIELDS], self._strings))
+        return words
+
+    def word(
+        self, lemma: str, pos: Optional[Type[PartOfSpeech]] = None
+    ) -> Optional[Word]:
+        """Get a new word of ``lemma``.
+
+        Parameters
+        ----------
+        lemma : str
+            Base form.
+        pos : type of PartOfSpeech, optional
+            If specified, the entries of other parts-of-speech are ignored.
+
+        Returns
+        -------
+        Word or None
+            The most usual entry, or None if there is none.
+        """
+        for word in self.lookup(lemma):
+            if pos is None or isinstance(word.pos, pos):
+                return word
+        return None
+
+
+def _fingerprint(dicdir: Path) -> str:
+    digest = hashlib.sha1(str(dicdir.resolve()).encode("utf-8"))
+    for path in sorted(dicdir.glob("*.csv")) + [dicdir / "sys.dic"]:
+        if path.is_file():
+            stat = path.stat()
+            digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def default_cache_dir() -> Path:
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(cache_home).expanduser() / "jadoc"
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(
+    dicdir: Optional[PathLike] = None, cache_dir: Optional[PathLike] = None
+) -> Lexicon:
+    """Load the lexicon of a dictionary, building and caching it if necessary.
+
+    The lexicon is saved in ``cache_dir`` under a name that changes with the
+    path, size and modification time of the dictionary files, and is kept in
+    memory after it is loaded.
+
+    Parameters
+    ----------
+    dicdir : str or Path, optional
+        Path of MeCab dictionary directory (the default is the first one of
+        ``get_dicdirs``).
+    cache_dir : str or Path, optional
+        Directory of the saved lexicons (the default is ``jadoc`` in
+        ``$XDG_CACHE_HOME`` or ``~/.cache``).
+
+    Returns
+    -------
+    Lexicon
+        The lexicon.
+    """
+    dicdir = Path(dicdir) if dicdir is not None else get_dicdirs()[0]
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    path = cache_dir / f"lexicon-{_fingerprint(dicdir)}.bin"
+    try:
+        return Lexicon(path.read_bytes())
+    except (OSError, InvalidFormatError):
+        pass
+
+    lexicon = Lexicon.from_dicdir(dicdir)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(lexicon.to_bytes())
+        os.replace(str(tmp), str(path))
+    except OSError:  # pragma: no cover
+        pass  # a read-only home still gets the lexicon, just not cached
+    return lexicon
@@ -0,0 +1,354 @@
+"""
+Find sequences of words by patterns of conditions.
+
+The patterns of a ``Matcher`` are compiled into one automaton whose input is,
+for each word, the set of conditions that the word meets. The classes of a word
+are checked against the conditions once per combination of classes, not once
+per word and condition. The automaton follows the matches from every start
+position at once, so a document is scanned from left to right with one table
+lookup per word, and it is determinized lazily as words are read.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Type, Union
+
+from .doc import Doc
+from .errors import ScriptSyntaxError
+from .script import Condition, _parse_condition
+from .word.word import Word
+
+OPERATORS = ("?", "*", "+")
+ANY = "_"
+
+
+class Token(NamedTuple):
+    """
+    A condition on a word and how many times it is repeated: once if ``op`` is
+    empty, at most once if ``?``, any number of times if ``*`` and at least once
+    if ``+``.
+    """
+
+    condition: Condition
+    op: str = ""
+
+
+class Match(NamedTuple):
+    """The key of the pattern and the words ``start:stop`` that match it."""
+
+    key: str
+    start: int
+    stop: int
+
+    @property
+    def range(self) -> range:
+        """The words, to be given to ``Doc.update`` or ``Doc.delete``."""
+        return range(self.start, self.stop)
+
+
+def parse_pattern(pattern: str) -> Tuple[Token, ...]:
+    """Parse a pattern in the syntax of the conditions of edit scripts.
+
+    Words are separated by spaces. Each one is ``_``, which matches any word, or
+    ``field=value`` pairs joined with ``,`` as in ``compile_script``, and may be
+    followed by one of the operators ``?``, ``*`` and ``+``.
+
+    Raises
+    ------
+    ScriptSyntaxError
+        If ``pattern`` is not valid.
+
+    Examples
+    --------
+    >>> tokens = parse_pattern("pos=動詞 base=ます? _*")
+    >>> assert [token.op for token in tokens] == ["", "?", "*"]
+    """
+    tokens = []
+    where = f"pattern {pattern!r}"
+    for element in pattern.split():
+        op = element[-1] if element[-1] in OPERATORS else ""
+        element = element[: len(element) - len(op)]
+        if element == ANY:
+            condition = Condition()
+        elif element:
+            condition = _parse_condition(element, where)
+        else:
+            raise ScriptSyntaxError(f"{where}: {op!r} follows nothing")
+        tokens.append(Token(condition, op))
+    return tuple(tokens)
+
+
+# (Word.pos, Word.c_type, Word.c_form) classes
+Classes = Tuple[Type, Type, Type]
+
+
+class Matcher:
+    """
+    Find the words that match any of several patterns.
+
+    Examples
+    --------
+    >>> matcher = Matcher()
+    >>> matcher.add("polite", "pos=Verb base=ます base=た?")
+    >>> doc = Doc("本を読みます。手紙を書きました。")
+    >>> matches = matcher.find(doc)
+    >>> assert matches == [Match("polite", 2, 4), Match("polite", 7, 10)]
+    >>> with doc.batch():
+    ...     for match in matches:
+    ...         doc.delete(match.range)
+    >>> assert doc.get_text() == "本を。手紙を。"
+    """
+
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self._conditions: List[Condition] = []
+        self._condition_ids: Dict[Condition, int] = {}
+        # the nondeterministic automaton, with the start state 0
+        self._edges: List[List[Tuple[int, int]]] = [[]]  # condition bit, state
+        self._epsilons: List[List[int]] = [[]]
+        self._accepts: Dict[int, int] = {}  # state -> number of the pattern
+        self._reset()
+
+    def _reset(self) -> None:
+        # The deterministic automaton, built as words are read. Its states are
+        # the states of the nondeterministic one in order of their start
+        # positions, the earliest first.
+        self._states: List[Tuple[int, ...]] = []
+        self._state_ids: Dict[Tuple[int, ...], int] = {}
+        self._state_accepts: List[List[Tuple[int, int]]] = []  # slot, pattern
+        # (state, symbol, whether a match starts) -> state, slot of each source
+        self._transitions: Dict[Tuple[int, int, bool], Tuple[int, List[int]]] = {}
+        self._prefixes: Dict[Tuple[int, int], int] = {}
+        self._class_masks: Dict[Classes, int] = {}
+        self._surface_masks: Dict[str, int] = {}
+        self._base_masks: Dict[str, int] = {}
+        self._any_surface = 0
+        self._any_base = 0
+        for i, condition in enumerate(self._conditions):
+            bit = 1 << i
+            if condition.surface is None:
+                self._any_surface |= bit
+            else:
+                masks = self._surface_masks
+                masks[condition.surface] = masks.get(condition.surface, 0) | bit
+            if condition.base is None:
+                self._any_base |= bit
+            else:
+                masks = self._base_masks
+                masks[condition.base] = masks.get(condition.base, 0) | bit
+        self._start_closure = self._closure(0)
+        self._empty = self._state(())
+
+    def _new_state(self) -> int:
+        self._edges.append([])
+        self._epsilons.append([])
+        return len(self._edges) - 1
+
+    def _condition_bit(self, condition: Condition) -> int:
+        i = self._condition_ids.get(condition)
+        if i is None:
+            i = len(self._conditions)
+            self._condition_ids[condition] = i
+            self._conditions.append(condition)
+        return 1 << i
+
+    def add(self, key: str, pattern: Union[str, Sequence[Token]]) -> None:
+        """Add a pattern.
+
+        Parameters
+        ----------
+        key : str
+            The key of the matches of this pattern.
+        pattern : str or sequence of Token
+            The pattern. See ``parse_pattern`` for the syntax of strings.
+
+        Raises
+        ------
+        ScriptSyntaxError
+            If the pattern is not valid or can match no words.
+        """
+        tokens = parse_pattern(pattern) if isinstance(pattern, str) else pattern
+        for token in tokens:
+            if token.op not in ("",) + OPERATORS:
+                raise ScriptSyntaxError(f"pattern {pattern!r}: unknown {token.op!r}")
+        if all(token.op in ("?", "*") for token in tokens):
+            raise ScriptSyntaxError(f"pattern {pattern!r} can match no words")
+
+        state = self._new_state()
+        self._epsilons[0].append(state)
+        for condition, op in tokens:
+            bit = self._condition_bit(condition)
+            end = self._new_state()
+            if op in ("*", "+"):
+                loop = self._new_state()
+                self._edges[loop].append((bit, loop))
+                self._epsilons[loop].append(end)
+                if op == "*":
+                    self._epsilons[state].append(loop)
+                else:
+                    self._edges[state].append((bit, loop))
+            else:
+                self._edges[state].append((bit, end))
+                if op == "?":
+                    self._epsilons[state].append(end)
+            state = end
+        self._accepts[state] = len(self.keys)
+        self.keys.append(key)
+        self._reset()
+
+    def _closure(self, state: int) -> List[int]:
+        closure = [state]
+        stack = [state]
+        while stack:
+            for next_state in self._epsilons[stack.pop()]:
+                if next_state not in closure:
+                    closure.append(next_state)
+                    stack.append(next_state)
+        return closure
+
+    def _state(self, slots: Tuple[int, ...]) -> int:
+        i = self._state_ids.get(slots)
+        if i is None:
+            i = len(self._states)
+            self._state_ids[slots] = i
+            self._states.append(slots)
+            accepts = self._accepts
+            self._state_accepts.append(
+                [(k, accepts[s]) for k, s in enumerate(slots) if s in accepts]
+            )
+        return i
+
+    def _step(self, state: int, symbol: int, start: bool) -> Tuple[int, List[int]]:
+        """The next state and, for each of its slots, the slot of ``state`` that it
+        comes from, or ``len(slots)`` if it comes from a match that starts at this
+        word."""
+        transition = self._transitions.get((state, symbol, start))
+        if transition is None:
+            slots = list(self._states[state])
+            sources = list(range(len(slots)))
+            if start:
+                new = [s for s in self._start_closure if s not in slots]
+                slots.extend(new)
+                sources.extend([len(sources)] * len(new))
+            next_slots: List[int] = []
+            next_sources: List[int] = []
+            for s, source in zip(slots, sources):
+                for bit, target in self._edges[s]:
+                    if symbol & bit:
+                        for t in self._closure(target):
+                            # the same state reached later starts later
+                            if t not in next_slots:
+                                next_slots.append(t)
+                                next_sources.append(source)
+            transition = (self._state(tuple(next_slots)), next_sources)
+            self._transitions[(state, symbol, start)] = transition
+        return transition
+
+    def _prefix(self, state: int, n: int) -> int:
+        """The state of the first ``n`` slots of ``state``."""
+        prefix = self._prefixes.get((state, n))
+        if prefix is None:
+            prefix = self._state(self._states[state][:n])
+            self._prefixes[(state, n)] = prefix
+        return prefix
+
+    def _symbol(self, word: Word) -> int:
+        """The bits of the conditions that ``word`` meets."""
+        classes = (type(word.pos), type(word.c_type), type(word.c_form))
+        mask = self._class_masks.get(classes)
+        if mask is None:
+            mask = 0
+            for i, c in enumerate(self._conditions):
+                if (
+                    (c.pos is None or issubclass(classes[0], c.pos))
+                    and (c.c_type is None or issubclass(classes[1], c.c_type))
+                    and (c.c_form is None or issubclass(classes[2], c.c_form))
+                ):
+                    mask |= 1 << i
+            self._class_masks[classes] = mask
+        return (
+            mask
+            & (self._any_surface | self._surface_masks.get(word.surface, 0))
+            & (self._any_base | self._base_masks.get(word.base, 0))
+        )
+
+    def _leftmost_longest(
+        self,
+        words: Sequence[Word],
+        symbols: List[Optional[int]],
+        i: int,
+        failed: Set[Tuple[int, int]],
+    ) -> Optional[Match]:
+        """Find the leftmost and longest match that starts at ``i`` or later.
+
+        ``failed`` holds the states and positions from which a match that is
+        already found cannot be made longer. Those met on the way are added to
+        it, so that the words after them are not read again.
+        """
+        n = len(words)
+        step, prefix = self._step, self._prefix
+        state, starts = self._empty, []  # the start position of each slot
+        best: Optional[Match] = None
+        read: List[Tuple[int, int]] = []  # since the best match was found
+        j = i
+        while True:
+            accepts = self._state_accepts[state]
+            if accepts:
+                first = min(starts[k] for k, _ in accepts)
+                if best is None or first <= best.start:
+                    number = min(p for k, p in accepts if starts[k] == first)
+                    best = Match(self.keys[number], first, j)
+                    read = []
+                    # the matches that start later cannot be the leftmost
+                    size = bisect_right(starts, first)
+                    if size < len(starts):
+                        state, starts = prefix(state, size), starts[:size]
+            if best is not None:
+                # no more matches start, so the state decides what follows
+                if j == n or not starts or (state, j) in failed:
+                    failed.update(read)
+                    return best
+                read.append((state, j))
+            elif j == n:
+                return None
+            symbol = symbols[j]
+            if symbol is None:
+                symbol = symbols[j] = self._symbol(words[j])
+            state, sources = step(state, symbol, best is None)
+            starts.append(j)
+            starts = [starts[k] for k in sources]
+            j += 1
+
+    def find(self, doc: Union[Doc, Sequence[Word]]) -> List[Match]:
+        """Find the matches that do not overlap, from left to right.
+
+        The match that starts first wins, then the longest one, and of matches
+        of the same length the one of the pattern added first.
+
+        The words are read once, except those after a match that were read while
+        a longer match was still possible and are read again when it fails. They
+        are read again only until a state in which it failed at the same word, so
+        that the time is linear in the number of words.
+
+        Parameters
+        ----------
+        doc : Doc or sequence of Word
+            The words.
+
+        Returns
+        -------
+        list of Match
+            The matches. Their ranges refer to the words before any edit, as do
+            the indices of edits inside ``Doc.batch``.
+        """
+        words = doc.words if isinstance(doc, Doc) else doc
+        symbols: List[Optional[int]] = [None] * len(words)
+        failed: Set[Tuple[int, int]] = set()
+        matches = []
+        i = 0
+        while i < len(words):
+            match = self._leftmost_longest(words, symbols, i, failed)
+            if match is None:
+                break
+            matches.append(match)
+            i = match.stop
+        return matches
@@ -0,0 +1,191 @@
+import csv
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from jadoc.errors import InvalidFormatError
+from jadoc.mecab.tokenizer import BLANK, node_to_word
+from jadoc.word.word import Word
+
+EOS = "EOS"
+
+# columns of the "unidic" output format of the dicrc of UniDic: surface, pron,
+# lForm, lemma, pos joined with "-", cType, cForm and optionally aType
+UNIDIC_COLUMNS = 7
+
+
+class FeatureLayout(NamedTuple):
+    """
+    Positions of the attributes in the feature CSV of a MeCab dictionary.
+
+    The part-of-speech is taken from the first ``pos_size`` fields.
+    """
+
+    base: int
+    c_type: int
+    c_form: int
+    pos_size: int = 4
+
+
+IPADIC = FeatureLayout(base=6, c_type=4, c_form=5)
+UNIDIC = FeatureLayout(base=10, c_type=4, c_form=5)
+
+
+def _guess_layout(features: List[str]) -> FeatureLayout:
+    return UNIDIC if len(features) > 9 else IPADIC
+
+
+def _field(features: List[str], i: int) -> str:
+    if i < len(features) and features[i] != "*":
+        return features[i]
+    return ""
+
+
+def feature_line_to_word(line: str, layout: Optional[FeatureLayout] = None) -> Word:
+    """Convert a line of MeCab output in the default format into a Word object.
+
+    Parameters
+    ----------
+    line : str
+        A line in the format ``surface<TAB>feature CSV``, which is the output of
+        ``mecab`` when no output format is configured.
+    layout : FeatureLayout, optional
+        Positions of the attributes in the feature CSV. If not specified, it is
+        guessed from the number of fields: ``UNIDIC`` if there are more than 9,
+        ``IPADIC`` otherwise.
+
+    Returns
+    -------
+    Word
+        The word.
+
+    Examples
+    --------
+    >>> word = feature_line_to_word("書き\\t動詞,自立,*,*,五段・カ行イ音便,連用形,書く,カキ,カキ")
+    >>> assert (word.surface, word.base) == ("書き", "書く")
+    """
+    surface, _, csv_features = line.partition("\t")
+    features = next(csv.reader([csv_features]))
+    if layout is None:
+        layout = _guess_layout(features)
+
+    pos_info = [f for f in features[: layout.pos_size] if f not in ("", "*")]
+    base = _field(features, layout.base)
+    c_type_info = _field(features, layout.c_type)
+    c_form_info = _field(features, layout.c_form)
+    return Word(
+        surface=surface,
+        pos_info=pos_info or [""],
+        base=base or None,
+        c_type_info=c_type_info,
+        c_form_info=c_form_info,
+    )
+
+
+def unidic_line_to_word(line: str) -> Word:
+    """Convert a line of MeCab output in the "unidic" format into a Word object.
+
+    This is the default output of UniDic dictionaries, e.g. unidic-lite, whose
+    dicrc sets ``output-format-type = unidic``. The base form is the lemma
+    column, which may be written differently from the ``orthBase`` feature
+    used by ``generate_tokenizer``, e.g. ず instead of ぬ.
+
+    Parameters
+    ----------
+    line : str
+        A line of tab-separated columns: surface, pronunciation, lemma reading,
+        lemma, part-of-speech joined with ``-``, cType, cForm and optionally
+        more columns.
+
+    Returns
+    -------
+    Word
+        The word.
+
+    Raises
+    ------
+    InvalidFormatError
+        If ``line`` has fewer columns.
+
+    Examples
+    --------
+    >>> word = unidic_line_to_word("書き\\tカキ\\tカク\\t書く\\t動詞-一般\\t五段-カ行\\t連用形-一般\\t1")
+    >>> assert (word.surface, word.base) == ("書き", "書く")
+    """
+    columns = line.split("\t")
+    if len(columns) < UNIDIC_COLUMNS or not columns[0]:
+        raise InvalidFormatError(f"Not a line of the unidic format: {line!r}")
+    surface, _, _, base, pos, c_type_info, c_form_info = columns[:UNIDIC_COLUMNS]
+    pos_info = [f for f in pos.split("-") if f not in ("", "*")]
+    if c_type_info in BLANK and c_form_info in BLANK:
+        return Word(surface=surface, pos_info=pos_info or [""], base=base or None)
+    return Word(
+        surface=surface,
+        pos_info=pos_info or [""],
+        base=base or None,
+        c_type_info=c_type_info,
+        c_form_info=c_form_info,
+    )
+
+
+def line_to_word(line: str, layout: Optional[FeatureLayout] = None) -> Word:
+    """Convert a line of MeCab output in any supported format.
+
+    Lines with one tab are read by ``feature_line_to_word``, lines with at least
+    ``UNIDIC_COLUMNS`` columns by ``unidic_line_to_word`` and lines without a tab
+    by ``jadoc.mecab.tokenizer.node_to_word``.
+
+    Raises
+    ------
+    InvalidFormatError
+        If ``line`` is in none of these formats.
+    """
+    tabs = line.count("\t")
+    if tabs == 0:
+        if line.count(",") < 4:
+            raise InvalidFormatError(f"Unsupported line of MeCab output: {line!r}")
+        return node_to_word(line)
+    if tabs == 1:
+        return feature_line_to_word(line, layout)
+    if tabs >= UNIDIC_COLUMNS - 1:
+        return unidic_line_to_word(line)
+    raise InvalidFormatError(f"Unsupported line of MeCab output: {line!r}")
+
+
+def read_sentences(
+    lines: Iterable[str], layout: Optional[FeatureLayout] = None
+) -> Iterator[List[Word]]:
+    """Read MeCab output without running MeCab.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        Lines of MeCab output, e.g. an opened file. Each sentence ends with
+        ``EOS``. Lines may be in the ``node_format`` found by
+        ``_find_node_format``, in the ``surface<TAB>feature CSV`` format or in
+        the "unidic" format of UniDic dictionaries.
+    layout : FeatureLayout, optional
+        See ``feature_line_to_word``.
+
+    Yields
+    ------
+    list of Word
+        The words of each sentence.
+
+    Raises
+    ------
+    InvalidFormatError
+        If a line is in none of the supported formats. The message starts with
+        the line number.
+    """
+    words: List[Word] = []
+    for n, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if line == EOS:
+            yield words
+            words = []
+        elif line:
+            try:
+                words.append(line_to_word(line, layout))
+            except InvalidFormatError as e:
+                raise InvalidFormatError(f"line {n}: {e}") from None
+    if words:
+        yield words
@@ -1,5 +1,7 @@
+import os
 import re
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Tuple
+from weakref import WeakSet
 
 import MeCab
 
@@ -47,6 +49,42 @@ def _mecab_tagger(
     return MeCab.Tagger(" ".join(options))
 
 
+class _ForkSafeTagger:
+    """
+    A ``MeCab.Tagger`` that is created again in a child process after ``fork``.
+
+    The native tagger is not shared with children. It is dropped right after a
+    fork and created on the first ``parse`` in the child.
+    """
+
+    def __init__(self, dicdir: Optional[str], node_format: Optional[str]) -> None:
+        self.dicdir = dicdir
+        self.node_format = node_format
+        self.tagger: Optional[MeCab.Tagger] = _mecab_tagger(
+            dicdir=dicdir, node_format=node_format
+        )
+        _fork_safe_taggers.add(self)
+
+    def parse(self, text: str) -> Optional[str]:
+        if self.tagger is None:
+            self.tagger = _mecab_tagger(
+                dicdir=self.dicdir, node_format=self.node_format
+            )
+        return self.tagger.parse(text)
+
+
+_fork_safe_taggers: "WeakSet[_ForkSafeTagger]" = WeakSet()
+
+
+def _drop_taggers_after_fork() -> None:
+    for tagger in list(_fork_safe_taggers):
+        tagger.tagger = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_taggers_after_fork)
+
+
 def _find_index(
     items: List[str], equal_to: Optional[str] = None, include: Optional[str] = None
 ) -> Optional[int]:
@@ -75,8 +113,8 @@ def _find_index(
     return None
 
 
-def _find_node_format(dicdir: Optional[str] = None) -> Optional[str]:
-    """Find the MeCab ``node_format`` automatically.
+def _find_feature_indices(dicdir: Optional[str] = None) -> Tuple[int, int, int, int]:
+    """Find the positions of the attributes in the feature CSV of a dictionary.
 
     Parameters
     ----------
@@ -85,13 +123,14 @@ def _find_node_format(dicdir: Optional[str] = None) -> Optional[str]:
 
     Returns
     -------
-    str or None
-        MeCab ``node_format``, or None if not found.
+    tuple of int
+        The positions of the first part-of-speech field, the base form, the
+        conjugation type and the conjugation form.
 
     Raises
     ------
     NotFoundNodeFormatError
-        If the ``node-format`` could not be set automatically.
+        If the positions could not be found.
     """
     tagger = _mecab_tagger(dicdir=dicdir, node_format=r"%H\\n")
 
@@ -110,7 +149,28 @@ def _find_node_format(dicdir: Optional[str] = None) -> Optional[str]:
             + r"``node-format=surface,pos,baseForm,cType,cForm\\n``"
         )
         raise NotFoundNodeFormatError(msg)
+    return pos_i, base_i, c_type_i, c_form_i
+
 
+def _find_node_format(dicdir: Optional[str] = None) -> Optional[str]:
+    """Find the MeCab ``node_format`` automatically.
+
+    Parameters
+    ----------
+    dicdir : str, optional
+        Path of MeCab dictionary directory (the default is to not specify).
+
+    Returns
+    -------
+    str or None
+        MeCab ``node_format``, or None if not found.
+
+    Raises
+    ------
+    NotFoundNodeFormatError
+        If the ``node-format`` could not be set automatically.
+    """
+    pos_i, base_i, c_type_i, c_form_i = _find_feature_indices(dicdir)
     node_format = (
         ",".join(
             [
@@ -127,6 +187,43 @@ def _find_node_format(dicdir: Optional[str] = None) -> Optional[str]:
     return node_format
 
 
+BLANK = ("", " ", "　")
+
+
+def node_to_word(node: str) -> Word:
+    """Convert a line of MeCab output into a Word object.
+
+    Parameters
+    ----------
+    node : str
+        A line in the format ``surface,pos,baseForm,cType,cForm``, where ``pos``
+        is joined with ``-``. This is the format of the ``node_format`` found by
+        ``_find_node_format``.
+
+    Returns
+    -------
+    Word
+        The word.
+    """
+    attrs = node.split(",")
+
+    surface = attrs[0]
+    pos_info = attrs[1].split("-")
+    base = attrs[2]
+    c_type_info = attrs[3]
+    c_form_info = attrs[4]
+
+    if c_type_info in BLANK and c_form_info in BLANK:
+        return Word(surface=surface, pos_info=pos_info, base=base)
+    return Word(
+        surface=surface,
+        pos_info=pos_info,
+        base=base,
+        c_type_info=c_type_info,
+        c_form_info=c_form_info,
+    )
+
+
 def check_tokenizer(tokenize: Callable[[str], List[Word]]) -> None:
     """Check that the tokenize function is working properly.
 
@@ -176,7 +273,9 @@ def generate_tokenizer(
     Returns
     -------
     function
-        A function that converts the text into a list of Word objects.
+        A function that converts the text into a list of Word objects. It can be
+        used in a process forked after it was generated, where it creates its own
+        MeCab tagger.
 
     See Also
     --------
@@ -192,9 +291,7 @@ def generate_tokenizer(
     if node_format is None:
         node_format = _find_node_format(dicdir)
 
-    mecab_tagger = _mecab_tagger(dicdir=dicdir, node_format=node_format)
-
-    blank = ("", " ", "　")
+    mecab_tagger = _ForkSafeTagger(dicdir, node_format)
 
     def _tokenize(text: str) -> List[Word]:
         parsed = mecab_tagger.parse(text)
@@ -204,30 +301,7 @@ def generate_tokenizer(
 
         nodes = parsed.splitlines()[:-1]
 
-        words = []
-        for node in nodes:
-            attrs = node.split(",")
-
-            surface = attrs[0]
-            pos_info = attrs[1].split("-")
-            base = attrs[2]
-            c_type_info = attrs[3]
-            c_form_info = attrs[4]
-
-            if c_type_info in blank and c_form_info in blank:
-                word = Word(surface=surface, pos_info=pos_info, base=base)
-            else:
-                word = Word(
-                    surface=surface,
-                    pos_info=pos_info,
-                    base=base,
-                    c_type_info=c_type_info,
-                    c_form_info=c_form_info,
-                )
-
-            words.append(word)
-
-        return words
+        return [node_to_word(node) for node in nodes]
 
     check_tokenizer(_tokenize)
 
@@ -0,0 +1,170 @@
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .conj import Conjugation
+from .doc import Doc
+from .warm import default_conjugation, preload
+from .word.word import Word
+
+Pattern = Tuple[Tuple[str, type], ...]
+
+
+def _pattern(words: List[Word]) -> Pattern:
+    return tuple((word.base, type(word.c_type)) for word in words)
+
+
+class LemmaReplacer:
+    """
+    Replace lemmas in documents, conjugating the new lemmas like the old ones.
+
+    Parameters
+    ----------
+    mapping : dict
+        Old lemmas mapped to new lemmas, e.g. ``{"購入する": "買う"}``.
+        A lemma may consist of several words.
+    conjugation : Conjugation, optional
+        Conjugation used to tokenize the lemmas and the documents. If not
+        specified, one is generated with the default tokenizer.
+
+    Examples
+    --------
+    >>> replacer = LemmaReplacer({"購入する": "買う"})
+    >>> assert replacer.replace_text("本を購入しました。") == "本を買いました。"
+    """
+
+    def __init__(
+        self, mapping: Dict[str, str], conjugation: Optional[Conjugation] = None
+    ) -> None:
+        if conjugation is None:
+            conjugation = default_conjugation()
+        self.conjugation = conjugation
+        self._replacements: Dict[Pattern, List[Word]] = {}
+        for old, new in mapping.items():
+            pattern = _pattern(conjugation.tokenize(old))
+            if pattern:
+                self._replacements[pattern] = conjugation.tokenize(new)
+        # longer patterns are tried first
+        self._patterns = sorted(self._replacements, key=len, reverse=True)
+
+    def _match(self, doc: Doc, i: int) -> Optional[Pattern]:
+        for pattern in self._patterns:
+            words = doc.words[i : i + len(pattern)]
+            if _pattern(words) == pattern:
+                return pattern
+        return None
+
+    def replace(self, doc: Doc) -> int:
+        """Replace the lemmas in ``doc``.
+
+        Matches are found through ``Doc.find`` by the base form of their first
+        word, compared by base form and conjugation type, and replaced with
+        ``Doc.update`` in a single ``Doc.batch``.
+
+        Parameters
+        ----------
+        doc : Doc
+            The document to be edited.
+
+        Returns
+        -------
+        int
+            The number of replacements.
+        """
+        candidates = set()
+        for base in {pattern[0][0] for pattern in self._patterns}:
+            candidates.update(doc.find(base=base))
+
+        n = 0
+        end = 0
+        with doc.batch():
+            for i in sorted(candidates):
+                if i < end:
+                    continue
+                pattern = self._match(doc, i)
+                if pattern is None:
+                    continue
+                end = i + len(pattern)
+                doc.update(range(i, end), self._replacements[pattern])
+                n += 1
+        return n
+
+    def replace_text(self, text: str) -> str:
+        """Replace the lemmas in ``text``.
+
+        Parameters
+        ----------
+        text : str
+            A document.
+
+        Returns
+        -------
+        str
+            The rewritten document.
+        """
+        doc = Doc(text, self.conjugation)
+        self.replace(doc)
+        return doc.get_text()
+
+
+_worker_replacer: Optional[LemmaReplacer] = None
+
+
+def _init_worker(
+    mapping: Dict[str, str], dicdir: Optional[str], node_format: Optional[str]
+) -> None:
+    global _worker_replacer
+    conjugation = preload(dicdir, node_format, freeze=False)
+    _worker_replacer = LemmaReplacer(mapping, conjugation)
+
+
+def _replace_in_worker(text: str) -> str:
+    assert _worker_replacer is not None
+    return _worker_replacer.replace_text(text)
+
+
+def replace_corpus(
+    texts: Iterable[str],
+    mapping: Dict[str, str],
+    workers: int = 1,
+    chunksize: int = 64,
+    dicdir: Optional[str] = None,
+    node_format: Optional[str] = None,
+) -> Iterator[str]:
+    """Replace lemmas in every document of a corpus.
+
+    The conjugation tables are built once in this process and inherited by the
+    worker processes if they are forked. Each worker builds its own tokenizer and
+    ``LemmaReplacer`` once. The rewritten documents are yielded in the order of
+    ``texts`` as soon as they are ready.
+
+    Parameters
+    ----------
+    texts : iterable of str
+        The documents.
+    mapping : dict
+        Old lemmas mapped to new lemmas.
+    workers : int, optional
+        The number of worker processes (the default is 1, which processes the
+        documents in this process).
+    chunksize : int, optional
+        The number of documents sent to a worker at a time.
+    dicdir : str, optional
+        Path of MeCab dictionary directory (the default is delegated to MeCab).
+    node_format : str, optional
+        MeCab ``node_format``. See ``generate_tokenizer``.
+
+    Yields
+    ------
+    str
+        The rewritten documents.
+    """
+    initargs = (mapping, dicdir, node_format)
+    if workers <= 1:
+        _init_worker(*initargs)
+        for text in texts:
+            yield _replace_in_worker(text)
+        return
+
+    preload(dicdir, node_format, freeze=False)
+    with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        yield from pool.imap(_replace_in_worker, texts, chunksize=chunksize)
@@ -0,0 +1,289 @@
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from .conj import Conjugation
+from .doc import Doc
+from .errors import ScriptSyntaxError
+from .warm import default_conjugation
+from .word.cform import ALL_CFORM, ConjugationForm
+from .word.ctype import ALL_CTYPE, ConjugationType
+from .word.pos import ALL_POS, PartOfSpeech
+from .word.word import Word
+
+ACTIONS = ("delete", "replace", "cform")
+FIELDS = ("surface", "base", "pos", "c_type", "c_form")
+
+
+def _names(classes: Iterable[Type]) -> Dict[str, Type]:
+    # a class is named by its name or by the Japanese name in its docstring
+    names = {}
+    for cls in classes:
+        names[cls.__name__] = cls
+        names[_japanese_name(cls)] = cls
+    return names
+
+
+def _japanese_name(cls: Type) -> str:
+    return (cls.__doc__ or "").strip().split("\n")[0]
+
+
+CLASS_NAMES: Dict[str, Dict[str, Type]] = {
+    "pos": _names(ALL_POS),
+    "c_type": _names(ALL_CTYPE),
+    "c_form": _names(ALL_CFORM),
+}
+
+
+def get_c_form(name: str) -> ConjugationForm:
+    """Get a conjugation form by its English or Japanese name, e.g. ``Mizen`` or
+    ``未然形``.
+
+    Raises
+    ------
+    KeyError
+        If there is no such conjugation form.
+    """
+    cls = CLASS_NAMES["c_form"][name]
+    return cls(value=_japanese_name(cls))
+
+
+class Condition(NamedTuple):
+    """
+    Conditions on a word. ``None`` matches anything, and a class also matches its
+    subclasses.
+    """
+
+    surface: Optional[str] = None
+    base: Optional[str] = None
+    pos: Optional[Type[PartOfSpeech]] = None
+    c_type: Optional[Type[ConjugationType]] = None
+    c_form: Optional[Type[ConjugationForm]] = None
+
+    def matches(self, word: Word) -> bool:
+        return (
+            (self.surface is None or word.surface == self.surface)
+            and (self.base is None or word.base == self.base)
+            and (self.pos is None or isinstance(word.pos, self.pos))
+            and (self.c_type is None or isinstance(word.c_type, self.c_type))
+            and (self.c_form is None or isinstance(word.c_form, self.c_form))
+        )
+
+    def is_indexed(self) -> bool:
+        """Whether ``Doc.find`` can look up the words that may match."""
+        return any(v is not None for v in self[1:])
+
+
+class Rule(NamedTuple):
+    action: str
+    pattern: Tuple[Condition, ...]
+    words: Tuple[Word, ...] = ()
+    c_form: Optional[ConjugationForm] = None
+
+    def matches(self, words: Sequence[Word], i: int) -> bool:
+        """Whether the pattern matches the words from ``i``."""
+        if i + len(self.pattern) > len(words):
+            return False
+        return all(c.matches(words[i + k]) for k, c in enumerate(self.pattern))
+
+
+def _parse_condition(element: str, where: str) -> Condition:
+    values = {}
+    for item in element.split(","):
+        field, sep, value = item.partition("=")
+        if not sep or field not in FIELDS or not value:
+            raise ScriptSyntaxError(f"{where}: invalid condition {item!r}")
+        if field in CLASS_NAMES:
+            if value not in CLASS_NAMES[field]:
+                raise ScriptSyntaxError(f"{where}: unknown {field} {value!r}")
+            values[field] = CLASS_NAMES[field][value]
+        else:
+            values[field] = value
+    return Condition(**values)
+
+
+def parse_script(source: str) -> List[Tuple[int, str, Tuple[Condition, ...], str]]:
+    """Parse an edit script without compiling it. See ``compile_script``.
+
+    Returns
+    -------
+    list of tuple
+        The line number, the action, the pattern and the argument of each rule.
+
+    Raises
+    ------
+    ScriptSyntaxError
+        If ``source`` is not a valid script.
+    """
+    rules = []
+    for n, line in enumerate(source.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        head, arrow, argument = line.partition("->")
+        tokens = head.split()
+        if not tokens:
+            raise ScriptSyntaxError(f"line {n}: no action")
+        action, argument = tokens[0], argument.strip()
+        if action not in ACTIONS:
+            raise ScriptSyntaxError(f"line {n}: unknown action {action!r}")
+        if len(tokens) == 1:
+            raise ScriptSyntaxError(f"line {n}: no condition")
+        if (action == "delete") == bool(arrow):
+            raise ScriptSyntaxError(
+                f"line {n}: {action} "
+                + ("takes no argument" if arrow else "needs '-> argument'")
+            )
+        if arrow and not argument:
+            raise ScriptSyntaxError(f"line {n}: empty argument")
+        pattern = tuple(_parse_condition(e, f"line {n}") for e in tokens[1:])
+        rules.append((n, action, pattern, argument))
+    return rules
+
+
+class EditScript:
+    """
+    A compiled edit script. See ``compile_script``.
+
+    It holds no tokenizer and can be pickled, e.g. to be sent to worker processes.
+
+    Parameters
+    ----------
+    rules : list of Rule
+        The rules in order of priority.
+    """
+
+    def __init__(self, rules: List[Rule]) -> None:
+        self.rules = rules
+
+    def _candidates(self, doc: Doc) -> Dict[int, List[int]]:
+        """Map the positions where a rule may match to the numbers of the rules."""
+        candidates: Dict[int, List[int]] = defaultdict(list)
+        for k, rule in enumerate(self.rules):
+            first = rule.pattern[0]
+            if first.is_indexed():
+                positions: Iterable[int] = doc.find(
+                    base=first.base,
+                    pos=first.pos,
+                    c_type=first.c_type,
+                    c_form=first.c_form,
+                )
+            else:
+                positions = range(len(doc.words))
+            for i in positions:
+                candidates[i].append(k)
+        return candidates
+
+    def matches(self, doc: Doc) -> List[Tuple[int, int, Rule]]:
+        """Find the matches that do not overlap, from left to right.
+
+        At each position the first rule that matches wins.
+
+        Returns
+        -------
+        list of tuple
+            The start, the stop and the rule of each match.
+        """
+        candidates = self._candidates(doc)
+        words = doc.words
+        matches = []
+        end = 0
+        for i in sorted(candidates):
+            if i < end:
+                continue
+            for k in sorted(candidates[i]):
+                rule = self.rules[k]
+                if rule.matches(words, i):
+                    end = i + len(rule.pattern)
+                    matches.append((i, end, rule))
+                    break
+        return matches
+
+    def apply(self, doc: Doc) -> int:
+        """Apply the script to ``doc`` in a single ``Doc.batch``.
+
+        Returns
+        -------
+        int
+            The number of matches.
+        """
+        matches = self.matches(doc)
+        with doc.batch():
+            for start, stop, rule in matches:
+                if rule.action == "delete":
+                    doc.delete(range(start, stop))
+                elif rule.action == "replace":
+                    doc.update(range(start, stop), list(rule.words))
+                else:
+                    doc.conjugate(stop - 1, rule.c_form)
+        return len(matches)
+
+
+@lru_cache(maxsize=128)
+def compile_script(
+    source: str, conjugation: Optional[Conjugation] = None
+) -> EditScript:
+    """Compile an edit script.
+
+    Each line is a rule ``action condition... [-> argument]``, and ``#`` starts a
+    comment. A condition matches a word by ``field=value`` pairs joined with
+    ``,``, where the field is one of ``surface``, ``base``, ``pos``, ``c_type``
+    and ``c_form``. The classes of ``pos``, ``c_type`` and ``c_form`` are named
+    in English or Japanese, e.g. ``pos=Verb`` or ``pos=動詞``, and match their
+    subclasses. Successive conditions match successive words.
+
+    The actions are
+
+    - ``delete``: delete the matched words.
+    - ``replace``: replace the matched words with the argument, which is conjugated
+      like the last matched word.
+    - ``cform``: conjugate the last matched word into the conjugation form given
+      by the argument.
+
+    Compiled scripts are cached by ``source`` and ``conjugation``.
+
+    Parameters
+    ----------
+    source : str
+        The edit script.
+    conjugation : Conjugation, optional
+        Conjugation used to tokenize the arguments of ``replace``. If not
+        specified, one is generated with the default tokenizer.
+
+    Returns
+    -------
+    EditScript
+        The compiled script.
+
+    Raises
+    ------
+    ScriptSyntaxError
+        If ``source`` is not a valid script.
+
+    Examples
+    --------
+    >>> script = compile_script('''
+    ... delete base=とても
+    ... replace base=購入 base=する -> 買う
+    ... cform base=読む -> 命令形
+    ... ''')
+    >>> doc = Doc("とても本を読む。本を購入しました。")
+    >>> assert script.apply(doc) == 3
+    >>> assert doc.get_text() == "本を読め。本を買いました。"
+    """
+    rules = []
+    for n, action, pattern, argument in parse_script(source):
+        if action == "replace":
+            if conjugation is None:
+                conjugation = default_conjugation()
+            words = tuple(conjugation.tokenize(argument))
+            rules.append(Rule(action, pattern, words=words))
+        elif action == "cform":
+            try:
+                c_form = get_c_form(argument)
+            except KeyError:
+                raise ScriptSyntaxError(f"line {n}: unknown c_form {argument!r}")
+            rules.append(Rule(action, pattern, c_form=c_form))
+        else:
+            rules.append(Rule(action, pattern))
+    return EditScript(rules)
@@ -0,0 +1,217 @@
+import struct
+from array import array
+from typing import BinaryIO, Dict, Iterable, List, Sequence, Tuple, Type
+
+from .errors import InvalidFormatError
+from .word import cform, ctype, pos
+from .word.word import Word
+
+MAGIC = b"JDW1"
+POS_SEP = "\x1f"
+
+POS_CODES: List[Type[pos.PartOfSpeech]] = pos.ALL_POS + [pos.Unknown]
+CTYPE_CODES: List[Type[ctype.ConjugationType]] = ctype.ALL_CTYPE + [ctype.Unknown]
+CFORM_CODES: List[Type[cform.ConjugationForm]] = cform.ALL_CFORM + [cform.Unknown]
+
+_POS_CODE = {cls: i for i, cls in enumerate(POS_CODES)}
+_CTYPE_CODE = {cls: i for i, cls in enumerate(CTYPE_CODES)}
+_CFORM_CODE = {cls: i for i, cls in enumerate(CFORM_CODES)}
+
+# surface, base, pos value, c_type value, c_form value, category codes
+FIELDS = 6
+
+_HEADER = struct.Struct("<4sII")  # magic, number of strings, number of words
+
+
+class StringTable:
+    """
+    Assign an index to each distinct string.
+    """
+
+    def __init__(self, strings: Iterable[str] = ()) -> None:
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+        for string in strings:
+            self.add(string)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def add(self, string: str) -> int:
+        i = self._index.get(string)
+        if i is None:
+            i = len(self.strings)
+            self._index[string] = i
+            self.strings.append(string)
+        return i
+
+    def to_bytes(self, start: int = 0) -> bytes:
+        """Encode the strings from ``start`` as lengths followed by UTF-8 text."""
+        encoded = [string.encode("utf-8") for string in self.strings[start:]]
+        lengths = array("I", [len(b) for b in encoded])
+        return _to_le(lengths).tobytes() + b"".join(encoded)
+
+
+def decode_strings(data: bytes, n: int, offset: int = 0) -> Tuple[List[str], int]:
+    """Decode ``n`` strings encoded by ``StringTable.to_bytes``.
+
+    Returns
+    -------
+    tuple
+        The strings and the offset after them.
+
+    Raises
+    ------
+    InvalidFormatError
+        If the strings run past the end of ``data``.
+    """
+    if offset + 4 * n > len(data):
+        raise InvalidFormatError("The lengths of the strings run past the data.")
+    lengths = _from_le(array("I", data[offset : offset + 4 * n]))
+    offset += 4 * n
+    if offset + sum(lengths) > len(data):
+        raise InvalidFormatError("The strings run past the data.")
+    strings = []
+    for length in lengths:
+        strings.append(data[offset : offset + length].decode("utf-8"))
+        offset += length
+    return strings, offset
+
+
+def _to_le(values: array) -> array:
+    if struct.pack("=I", 1) != struct.pack("<I", 1):  # pragma: no cover
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+_from_le = _to_le
+
+
+def encode_words(words: Iterable[Word], table: StringTable) -> array:
+    """Encode words into integers that refer to ``table``."""
+    values = array("I")
+    for word in words:
+        codes = (
+            _POS_CODE[type(word.pos)]
+            | _CTYPE_CODE[type(word.c_type)] << 8
+            | _CFORM_CODE[type(word.c_form)] << 16
+        )
+        values.extend(
+            (
+                table.add(word.surface),
+                table.add(word.base),
+                table.add(POS_SEP.join(word.pos.value)),
+                table.add(word.c_type.value),
+                table.add(word.c_form.value),
+                codes,
+            )
+        )
+    return values
+
+
+def decode_words(values: Sequence[int], strings: List[str]) -> List[Word]:
+    """Decode words encoded by ``encode_words`` without normalizing them again."""
+    words = []
+    from_normalized = Word.from_normalized
+    try:
+        for i in range(0, len(values), FIELDS):
+            surface, base, pos_value, c_type, c_form, codes = values[i : i + FIELDS]
+            words.append(
+                from_normalized(
+                    strings[surface],
+                    POS_CODES[codes & 0xFF](strings[pos_value].split(POS_SEP)),
+                    strings[base],
+                    CTYPE_CODES[codes >> 8 & 0xFF](strings[c_type]),
+                    CFORM_CODES[codes >> 16 & 0xFF](strings[c_form]),
+                )
+            )
+    except (IndexError, ValueError) as e:
+        raise InvalidFormatError(str(e))
+    return words
+
+
+def dumps_words(words: Iterable[Word]) -> bytes:
+    """Serialize words into a compact binary format.
+
+    The data consists of a header, a table of the distinct strings and six
+    integers per word that refer to the table and to the normalized classes.
+
+    Parameters
+    ----------
+    words : iterable of Word
+        The words.
+
+    Returns
+    -------
+    bytes
+        Serialized words.
+    """
+    table = StringTable()
+    values = encode_words(words, table)
+    header = _HEADER.pack(MAGIC, len(table), len(values) // FIELDS)
+    return header + table.to_bytes() + _to_le(values).tobytes()
+
+
+def loads_words(data: bytes) -> List[Word]:
+    """Deserialize words serialized by ``dumps_words``.
+
+    Parameters
+    ----------
+    data : bytes
+        Serialized words.
+
+    Returns
+    -------
+    list of Word
+        The words.
+
+    Raises
+    ------
+    InvalidFormatError
+        If ``data`` is not serialized words.
+
+    Examples
+    --------
+    >>> words = [Word("本", ["名詞"]), Word("読む", ["動詞"], "読む", "五段", "終止形")]
+    >>> loaded = loads_words(dumps_words(words))
+    >>> assert [w.to_dict() for w in loaded] == [w.to_dict() for w in words]
+    """
+    strings, values = loads_encoded(data)
+    return decode_words(values, strings)
+
+
+def loads_encoded(data: bytes) -> Tuple[List[str], array]:
+    """Deserialize data of ``dumps_words`` into its string table and the values
+    of ``encode_words``, without decoding the words.
+
+    Raises
+    ------
+    InvalidFormatError
+        If ``data`` is not serialized words.
+    """
+    try:
+        magic, n_strings, n_words = _HEADER.unpack_from(data)
+    except struct.error as e:
+        raise InvalidFormatError(str(e))
+    if magic != MAGIC:
+        raise InvalidFormatError("Not serialized words.")
+    try:
+        strings, offset = decode_strings(data, n_strings, _HEADER.size)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidFormatError(str(e))
+    size = 4 * FIELDS * n_words
+    if len(data) - offset != size:
+        raise InvalidFormatError("The data size does not match the header.")
+    values = _from_le(array("I", data[offset : offset + size]))
+    return strings, values
+
+
+def dump_words(words: Iterable[Word], fp: BinaryIO) -> None:
+    """Serialize words into a binary file object. See ``dumps_words``."""
+    fp.write(dumps_words(words))
+
+
+def load_words(fp: BinaryIO) -> List[Word]:
+    """Deserialize words from a binary file object. See ``loads_words``."""
+    return loads_words(fp.read())
@@ -0,0 +1,317 @@
+import json
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from queue import Queue
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from .conj import Conjugation
+from .doc import Doc
+from .errors import InvalidRequestError, JadocError
+from .mecab.tokenizer import generate_tokenizer
+from .replace import LemmaReplacer
+from .script import compile_script, get_c_form
+from .warm import preload, preloaded_node_format
+
+LATENCY_WINDOW = 1024
+
+_CONTENT_LENGTH = re.compile(r"[0-9]+")
+
+
+class TaggerPool:
+    """
+    A fixed number of ``Conjugation`` objects with their own MeCab taggers.
+
+    A tagger is used by one request at a time, and requests wait for a free one.
+
+    Parameters
+    ----------
+    size : int
+        The number of taggers.
+    dicdir : str, optional
+        Path of MeCab dictionary directory (the default is delegated to MeCab).
+    node_format : str, optional
+        MeCab ``node_format``. See ``generate_tokenizer``.
+    """
+
+    def __init__(
+        self, size: int, dicdir: Optional[str] = None, node_format: Optional[str] = None
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be positive.")
+        self.size = size
+        self._idle: "Queue[Conjugation]" = Queue()
+        # the ending tables are built once and shared by the taggers
+        shared = preload(dicdir, node_format, freeze=False)
+        node_format = preloaded_node_format(dicdir, node_format)
+        for _ in range(size):
+            tokenize = generate_tokenizer(dicdir, node_format)
+            self._idle.put(shared.with_tokenizer(tokenize))
+        self._lock = threading.Lock()
+        self.waiting = 0
+
+    @property
+    def idle(self) -> int:
+        return self._idle.qsize()
+
+    @contextmanager
+    def acquire(self) -> Iterator[Conjugation]:
+        with self._lock:
+            self.waiting += 1
+        try:
+            conjugation = self._idle.get()
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        try:
+            yield conjugation
+        finally:
+            self._idle.put(conjugation)
+
+
+class Metrics:
+    """
+    Request counts and latencies of each endpoint.
+
+    The percentiles are computed over the last ``LATENCY_WINDOW`` requests.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._total: Dict[str, float] = defaultdict(float)
+        self._max: Dict[str, float] = defaultdict(float)
+        self._recent: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=LATENCY_WINDOW)
+        )
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._counts[endpoint] += 1
+            if not ok:
+                self._errors[endpoint] += 1
+            self._total[endpoint] += seconds
+            self._max[endpoint] = max(self._max[endpoint], seconds)
+            self._recent[endpoint].append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for endpoint, count in self._counts.items():
+                recent = sorted(self._recent[endpoint])
+                result[endpoint] = {
+                    "count": count,
+                    "errors": self._errors[endpoint],
+                    "mean_ms": 1000 * self._total[endpoint] / count,
+                    "p50_ms": 1000 * recent[len(recent) // 2],
+                    "p95_ms": 1000 * recent[int(len(recent) * 0.95)],
+                    "max_ms": 1000 * self._max[endpoint],
+                }
+            return result
+
+
+def _texts(body: Dict[str, Any]) -> List[str]:
+    texts = body.get("texts")
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        raise InvalidRequestError("'texts' must be a list of strings.")
+    return texts
+
+
+class JadocService:
+    """
+    The endpoints of ``jadoc serve``, independent of HTTP.
+
+    Each endpoint takes a JSON object and returns one. The documents in a request
+    are processed with a single tagger from ``pool``.
+
+    Parameters
+    ----------
+    pool : TaggerPool
+        The taggers shared by all requests.
+    """
+
+    def __init__(self, pool: TaggerPool) -> None:
+        self.pool = pool
+        self.metrics = Metrics()
+        self.started = time.time()
+        self.endpoints: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "tokenize": self.tokenize,
+            "conjugate": self.conjugate,
+            "edit": self.edit,
+        }
+
+    def handle(self, endpoint: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Call ``endpoint`` and record its latency.
+
+        Raises
+        ------
+        KeyError
+            If there is no such endpoint.
+        JadocError
+            If the request is not valid.
+        """
+        func = self.endpoints[endpoint]
+        begin = time.perf_counter()
+        ok = False
+        try:
+            result = func(body)
+            ok = True
+        finally:
+            self.metrics.record(endpoint, time.perf_counter() - begin, ok)
+        return result
+
+    def tokenize(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """``{"texts": [...]}`` to the words of each text."""
+        texts = _texts(body)
+        with self.pool.acquire() as conjugation:
+            results = [
+                [word.to_dict() for word in conjugation.tokenize(text)]
+                for text in texts
+            ]
+        return {"results": results}
+
+    def conjugate(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """``{"texts": [...], "c_form": "連用形"}`` to the conjugated texts.
+
+        The last word of each text is conjugated, e.g. 「本を読む」 into
+        「本を読み」.
+        """
+        texts = _texts(body)
+        try:
+            c_form = get_c_form(str(body.get("c_form")))
+        except KeyError:
+            raise InvalidRequestError("'c_form' must be a conjugation form.")
+        results = []
+        with self.pool.acquire() as conjugation:
+            for text in texts:
+                doc = Doc(text, conjugation)
+                doc.conjugate(len(doc.words) - 1, c_form)
+                results.append(doc.get_text())
+        return {"results": results}
+
+    def edit(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """``{"texts": [...], "script": "..."}`` to the edited texts.
+
+        Instead of ``script``, lemmas can be replaced by ``"mapping": {...}``.
+        See ``jadoc.script.compile_script`` and ``jadoc.replace.LemmaReplacer``.
+        """
+        texts = _texts(body)
+        script, mapping = body.get("script"), body.get("mapping")
+        if (script is None) == (mapping is None):
+            raise InvalidRequestError("Specify either 'script' or 'mapping'.")
+        results = []
+        with self.pool.acquire() as conjugation:
+            if script is not None:
+                editor = compile_script(str(script), conjugation)
+                apply = editor.apply
+            else:
+                if not isinstance(mapping, dict) or not all(
+                    isinstance(v, str) for v in mapping.values()
+                ):
+                    raise InvalidRequestError("'mapping' must be an object of strings.")
+                apply = LemmaReplacer(mapping, conjugation).replace
+            for text in texts:
+                doc = Doc(text, conjugation)
+                apply(doc)
+                results.append(doc.get_text())
+        return {"results": results}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "uptime_s": time.time() - self.started,
+            "pool_size": self.pool.size,
+            "idle_taggers": self.pool.idle,
+            "queue_depth": self.pool.waiting,
+            "endpoints": self.metrics.snapshot(),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "JadocServer"
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send(200, self.server.service.status())
+        else:
+            self._send(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        endpoint = self.path.strip("/")
+        if endpoint not in self.server.service.endpoints:
+            self._send(404, {"error": f"Not found: {self.path}"})
+            return
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self._send(411, {"error": "Content-Length is required."})
+            return
+        if not _CONTENT_LENGTH.fullmatch(length.strip()):
+            self._send(400, {"error": f"Invalid Content-Length: {length}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(length)).decode("utf-8"))
+            if not isinstance(body, dict):
+                raise InvalidRequestError("The body must be a JSON object.")
+            self._send(200, self.server.service.handle(endpoint, body))
+        except (ValueError, JadocError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": repr(e)})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class JadocServer(ThreadingMixIn, HTTPServer):
+    """
+    A threaded HTTP server of a ``JadocService``.
+
+    Examples
+    --------
+    ``POST /tokenize``, ``/conjugate`` or ``/edit`` with a JSON body, and
+    ``GET /metrics`` or ``/health``.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple, service: JadocService, quiet: bool = False
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+        self.quiet = quiet
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    pool_size: int = 4,
+    dicdir: Optional[str] = None,
+    node_format: Optional[str] = None,
+    quiet: bool = False,
+) -> None:
+    """Run ``jadoc serve`` until interrupted.
+
+    See ``TaggerPool`` for ``pool_size``, ``dicdir`` and ``node_format``.
+    """
+    service = JadocService(TaggerPool(pool_size, dicdir, node_format))
+    with JadocServer((host, port), service, quiet) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,268 @@
+import mmap
+import os
+import struct
+from array import array
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+from .conj import Conjugation
+from .doc import Doc
+from .errors import InvalidFormatError
+from .serialize import (
+    FIELDS,
+    StringTable,
+    _from_le,
+    _to_le,
+    decode_strings,
+    decode_words,
+    encode_words,
+)
+from .word.word import Word
+
+WORDS_FILE = "words.bin"
+INDEX_FILE = "index.bin"
+STRINGS_FILE = "strings.bin"
+
+WORDS_MAGIC = b"JDC1"
+INDEX_MAGIC = b"JDX1"
+STRINGS_MAGIC = b"JDS1"
+
+_WORD = struct.Struct(f"<{FIELDS}I")
+# the end of the words and of the strings of each document
+_ENTRY = struct.Struct("<QQ")
+_COUNT = struct.Struct("<I")
+
+
+def _open_new(path: str, magic: bytes) -> BinaryIO:
+    fp = open(path, "wb")
+    fp.write(magic)
+    return fp
+
+
+def _check_magic(data: bytes, magic: bytes, path: str) -> None:
+    if data[: len(magic)] != magic:
+        raise InvalidFormatError(f"{path} is not a file of a corpus store.")
+
+
+def _truncate(path: str, size: int) -> None:
+    with open(path, "r+b") as fp:
+        fp.truncate(size)
+
+
+def _read_strings(path: str, size: int) -> List[str]:
+    """Read the blocks of strings written by ``CorpusWriter.flush`` in the first
+    ``size`` bytes of ``path``."""
+    with open(path, "rb") as fp:
+        data = fp.read(size)
+    _check_magic(data, STRINGS_MAGIC, path)
+    if len(data) < size:
+        raise InvalidFormatError(f"{path} is shorter than its index.")
+    strings: List[str] = []
+    offset = len(STRINGS_MAGIC)
+    try:
+        while offset < len(data):
+            (n,) = _COUNT.unpack_from(data, offset)
+            block, offset = decode_strings(data, n, offset + _COUNT.size)
+            strings.extend(block)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise InvalidFormatError(str(e))
+    return strings
+
+
+class CorpusWriter:
+    """
+    Append tokenized documents to a corpus store.
+
+    A store is a directory of three append-only files: the encoded words of all
+    documents, the offsets of the end of the words and of the strings of each
+    document, and the strings shared by all documents. The words are encoded as
+    in ``jadoc.serialize``. A document is visible to readers once its offsets
+    are written by ``flush`` or ``close``.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the store. It is created if it does not exist.
+    append : bool, optional
+        If True, documents are appended to an existing store. Otherwise the store
+        is overwritten.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> path = tempfile.mkdtemp()
+    >>> with CorpusWriter(path) as writer:
+    ...     i = writer.add([Word("本", ["名詞"])])
+    >>> with CorpusReader(path) as reader:
+    ...     assert reader[i][0].surface == "本"
+    """
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        words_path = os.path.join(path, WORDS_FILE)
+        index_path = os.path.join(path, INDEX_FILE)
+        strings_path = os.path.join(path, STRINGS_FILE)
+        if append and os.path.exists(words_path):
+            with CorpusReader(path) as reader:
+                self._table = StringTable(reader.strings)
+                self._n_docs = len(reader)
+                self._end, strings_end = reader._entry(len(reader) - 1)
+            # drop what an interrupted writer left after the last visible document
+            _truncate(words_path, self._end)
+            _truncate(index_path, len(INDEX_MAGIC) + _ENTRY.size * self._n_docs)
+            _truncate(strings_path, strings_end)
+            self._words = open(words_path, "r+b")
+            self._words.seek(self._end)
+            self._index = open(index_path, "ab")
+            self._strings = open(strings_path, "ab")
+        else:
+            self._table = StringTable()
+            self._n_docs = 0
+            self._end = len(WORDS_MAGIC)
+            self._words = _open_new(words_path, WORDS_MAGIC)
+            self._index = _open_new(index_path, INDEX_MAGIC)
+            self._strings = _open_new(strings_path, STRINGS_MAGIC)
+        self._flushed_strings = len(self._table)
+        self._pending: List[int] = []
+        self.flush()
+
+    def __len__(self) -> int:
+        return self._n_docs
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add(self, words: Iterable[Word]) -> int:
+        """Append a document.
+
+        Parameters
+        ----------
+        words : iterable of Word
+            The words of the document, e.g. ``Doc.words``.
+
+        Returns
+        -------
+        int
+            The id of the document.
+        """
+        values = _to_le(encode_words(words, self._table))
+        self._words.write(values.tobytes())
+        self._end += values.itemsize * len(values)
+        self._pending.append(self._end)
+        self._n_docs += 1
+        return self._n_docs - 1
+
+    def flush(self) -> None:
+        """Make the documents added so far visible to new readers."""
+        if len(self._table) > self._flushed_strings:
+            n = len(self._table) - self._flushed_strings
+            self._strings.write(_COUNT.pack(n))
+            self._strings.write(self._table.to_bytes(self._flushed_strings))
+            self._flushed_strings = len(self._table)
+        self._strings.flush()
+        self._words.flush()
+        # the offsets go last so that a reader never sees a partial document
+        strings_end = self._strings.tell()
+        for end in self._pending:
+            self._index.write(_ENTRY.pack(end, strings_end))
+        self._pending = []
+        self._index.flush()
+
+    def close(self) -> None:
+        if self._words.closed:
+            return
+        self.flush()
+        for fp in (self._words, self._index, self._strings):
+            fp.close()
+
+
+class CorpusReader:
+    """
+    Random access to the documents of a corpus store written by ``CorpusWriter``.
+
+    The words and the offsets are memory-mapped, so that a document is decoded
+    only when it is accessed. Only the shared strings are kept in memory.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the store.
+
+    Raises
+    ------
+    InvalidFormatError
+        If the files in ``path`` are not those of a corpus store.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._files: List[BinaryIO] = []
+        self._index = self._map(os.path.join(path, INDEX_FILE), INDEX_MAGIC)
+        self._n_docs = (len(self._index) - len(INDEX_MAGIC)) // _ENTRY.size
+        self._words = self._map(os.path.join(path, WORDS_FILE), WORDS_MAGIC)
+        # only the strings flushed before the last offset belong to the documents
+        _, strings_end = self._entry(self._n_docs - 1)
+        self.strings = _read_strings(os.path.join(path, STRINGS_FILE), strings_end)
+
+    def _map(self, path: str, magic: bytes) -> mmap.mmap:
+        fp = open(path, "rb")
+        self._files.append(fp)
+        data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_magic(data, magic, path)
+        return data
+
+    def __len__(self) -> int:
+        return self._n_docs
+
+    def __enter__(self) -> "CorpusReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _entry(self, i: int) -> Tuple[int, int]:
+        if i < 0:
+            return len(WORDS_MAGIC), len(STRINGS_MAGIC)
+        return _ENTRY.unpack_from(self._index, len(INDEX_MAGIC) + _ENTRY.size * i)
+
+    def _end(self, i: int) -> int:
+        return self._entry(i)[0]
+
+    def _span(self, i: int) -> Tuple[int, int]:
+        if i < 0:
+            i += self._n_docs
+        if not 0 <= i < self._n_docs:
+            raise IndexError("CorpusReader index out of range")
+        start, stop = self._end(i - 1), self._end(i)
+        if not start <= stop <= len(self._words):
+            raise InvalidFormatError(f"Document {i} is out of the data.")
+        return start, stop
+
+    def __getitem__(self, i: int) -> List[Word]:
+        """Get the words of the ``i``-th document."""
+        start, stop = self._span(i)
+        values = _from_le(array("I", self._words[start:stop]))
+        return decode_words(values, self.strings)
+
+    def __iter__(self) -> Iterator[List[Word]]:
+        for i in range(self._n_docs):
+            yield self[i]
+
+    def iter_words(self, i: int) -> Iterator[Word]:
+        """Decode the words of the ``i``-th document one by one."""
+        start, stop = self._span(i)
+        for offset in range(start, stop, _WORD.size):
+            yield decode_words(_WORD.unpack_from(self._words, offset), self.strings)[0]
+
+    def doc(self, i: int, conjugation: Optional[Conjugation] = None) -> Doc:
+        """Get the ``i``-th document as a ``Doc`` without tokenizing it again."""
+        return Doc.from_words(self[i], conjugation)
+
+    def close(self) -> None:
+        for data in (self._words, self._index):
+            data.close()
+        for fp in self._files:
+            fp.close()
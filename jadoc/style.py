@@ -0,0 +1,354 @@
+"""
+Convert documents between the polite style (です・ます) and the plain style.
+"""
+
+from copy import copy
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from .conj import Conjugation
+from .doc import Doc
+from .script import get_c_form
+from .warm import default_conjugation, preload
+from .word.cform import (
+    ConjugationForm,
+    IshiSuiryo,
+    Katei,
+    Mizen,
+    Rentai,
+    Renyo,
+    RenyoOnbin,
+    Shushi,
+)
+from .word.ctype import AuxiliaryDa, AuxiliaryDesu, AuxiliaryMasu, AuxiliaryNai
+from .word.pos import Adjective, Auxiliary, EndingParticle, Verb
+from .word.word import Word
+
+STYLES = ("plain", "polite")
+SENTENCE_ENDS = ("。", "！", "？", "!", "?")
+
+# the words of the auxiliaries are taken from the tokens 1 to 4, 7 and 10
+TEMPLATE = "読みませんでした。本だ。読まない。"
+
+# start, stop and the new words
+Edit = Tuple[int, int, List[Word]]
+
+
+def _is_past(words: Sequence[Word], i: int) -> bool:
+    """Whether the ``i``-th word is the auxiliary た (or だ) after a verb."""
+    return (
+        0 < i < len(words)
+        and words[i].surface in ("た", "だ")
+        and isinstance(words[i].pos, Auxiliary)
+        and words[i - 1].has_conjugation
+        and isinstance(words[i - 1].c_form, (Renyo, RenyoOnbin))
+    )
+
+
+class StyleConverter:
+    """
+    Rewrite the predicates of documents in the polite or the plain style.
+
+    The words are read once from left to right, and the rewritten predicates
+    are applied to the document as a single edit. The auxiliaries are made by
+    conjugating words tokenized once, through the ending tables of
+    ``AuxiliaryMasu``, ``AuxiliaryDesu``, ``AuxiliaryDa`` and ``AuxiliaryNai``,
+    and the words before them are conjugated by ``Doc.conjugate``.
+
+    To the plain style, ます is removed with the verb conjugated into its
+    form, e.g. 書きました to 書いた and 書きません(でした) to 書かない
+    (書かなかった). です becomes だ after a noun, e.g. でした to だった, and is
+    removed after an adjective or an auxiliary. To the polite style, only the
+    predicates at the end of a sentence are rewritten.
+
+    Parameters
+    ----------
+    style : str, optional
+        "plain" (the default) or "polite".
+    conjugation : Conjugation, optional
+        Conjugation used to tokenize and conjugate words. If not specified, the
+        default one is used.
+
+    Raises
+    ------
+    ValueError
+        If ``style`` is not known, or if the dictionary does not tokenize the
+        auxiliaries as expected.
+
+    Examples
+    --------
+    >>> converter = StyleConverter("plain")
+    >>> assert converter.convert_text("本を書きました。") == "本を書いた。"
+    >>> assert converter.convert_text("本でした。") == "本だった。"
+    >>> polite = StyleConverter("polite")
+    >>> assert polite.convert_text("本を読まなかった。") == "本を読みませんでした。"
+    """
+
+    def __init__(
+        self, style: str = "plain", conjugation: Optional[Conjugation] = None
+    ) -> None:
+        if style not in STYLES:
+            raise ValueError(f"Unknown style: {style}")
+        if conjugation is None:
+            conjugation = default_conjugation()
+        self.style = style
+        self.conjugation = conjugation
+
+        words = conjugation.tokenize(TEMPLATE)
+        self._masu = self._conjugated(words[1], Shushi)
+        self._n = words[2]
+        self._desu = self._conjugated(words[3], Shushi)
+        self._ta = words[4]
+        self._da = words[7]
+        self._nai = words[10]
+        if (
+            type(self._masu.c_type) != AuxiliaryMasu
+            or type(self._desu.c_type) != AuxiliaryDesu
+            or type(self._da.c_type) != AuxiliaryDa
+            or type(self._nai.c_type) != AuxiliaryNai
+        ):
+            raise ValueError(
+                "The dictionary of the tokenizer is not supported: "
+                f"{TEMPLATE} is tokenized as {'/'.join(w.surface for w in words)}"
+                f" ({', '.join(str(w.c_type) for w in words)})."
+            )
+
+    def _conjugated(self, word: Word, cform: Type[ConjugationForm]) -> Word:
+        """A copy of ``word`` conjugated by the ending table of its type."""
+        return self.conjugation.conjugate(copy(word), get_c_form(cform.__name__))
+
+    def _conjugate_before(
+        self, word: Word, cform: Type[ConjugationForm], following: List[Word]
+    ) -> List[Word]:
+        """Conjugate ``word`` into ``cform`` before ``following``, which may also
+        change, e.g. the voicing of た."""
+        segment = Doc.from_words([word] + following, self.conjugation)
+        segment.conjugate(0, get_c_form(cform.__name__))
+        return list(segment.words)
+
+    def _plain_edit(self, words: Sequence[Word], i: int) -> Optional[Edit]:
+        word = words[i]
+        ctype = type(word.c_type)
+        cform = type(word.c_form)
+        prev = words[i - 1] if i > 0 else None
+        following = [w.base for w in words[i + 1 : i + 3]]
+
+        if (
+            ctype == AuxiliaryMasu
+            and prev is not None
+            and prev.has_conjugation
+            and prev.base not in ("ござる", "御座る")  # its plain form is ある
+        ):
+            if cform == Mizen and following[:1] in (["ぬ"], ["ん"]):
+                if following[1:] == ["です"] and _is_past(words, i + 3):
+                    tail = [self._conjugated(self._nai, RenyoOnbin), self._ta]
+                    return i - 1, i + 4, self._conjugate_before(prev, Mizen, tail)
+                tail = [self._nai]
+                return i - 1, i + 2, self._conjugate_before(prev, Mizen, tail)
+            if cform == Renyo and _is_past(words, i + 1):
+                new = self._conjugate_before(prev, Renyo, [words[i + 1]])
+                return i - 1, i + 2, new
+            if cform in (Shushi, Rentai, IshiSuiryo, Katei):
+                return i - 1, i + 1, self._conjugate_before(prev, cform, [])
+            return None
+
+        if ctype == AuxiliaryDesu:
+            after_predicate = prev is not None and (
+                (isinstance(prev.pos, Adjective) and prev.has_conjugation)
+                or (
+                    isinstance(prev.pos, Auxiliary)
+                    and type(prev.c_type) not in (AuxiliaryDa, AuxiliaryDesu)
+                )
+            )
+            if after_predicate:
+                if cform in (Shushi, Rentai):
+                    return i, i + 1, []
+                if cform == IshiSuiryo:
+                    return i, i + 1, [self._conjugated(self._da, IshiSuiryo)]
+                return None
+            if cform == Renyo and _is_past(words, i + 1):
+                return i, i + 1, [self._conjugated(self._da, RenyoOnbin)]
+            if cform == Rentai and words[i + 1 : i + 2] and words[i + 1].base == "の":
+                return i, i + 1, [self._conjugated(self._da, Rentai)]
+            if cform in (Shushi, Rentai, IshiSuiryo):
+                target = Shushi if cform == Rentai else cform
+                return i, i + 1, [self._conjugated(self._da, target)]
+        return None
+
+    def _polite_edit(self, words: Sequence[Word], k: int) -> Optional[Edit]:
+        """Rewrite the predicate that ends with the ``k``-th word, at the end of a
+        sentence."""
+        word = words[k]
+        ctype = type(word.c_type)
+        cform = type(word.c_form)
+        prev = words[k - 1] if k > 0 else None
+        masu = self._masu
+
+        if isinstance(word.pos, Verb) and word.has_conjugation:
+            if cform == Shushi:
+                return k, k + 1, self._conjugate_before(word, Renyo, [masu])
+            if cform == IshiSuiryo:
+                tail = [self._conjugated(masu, IshiSuiryo)]
+                return k, k + 1, self._conjugate_before(word, Renyo, tail)
+            return None
+
+        if _is_past(words, k):
+            assert prev is not None
+            if isinstance(prev.pos, Verb):
+                tail = [self._conjugated(masu, Renyo), self._ta]
+                return k - 1, k + 1, self._conjugate_before(prev, Renyo, tail)
+            if type(prev.c_type) == AuxiliaryDa:
+                tail = [self._conjugated(self._desu, Renyo), self._ta]
+                return k - 1, k + 1, tail
+            if (
+                type(prev.c_type) == AuxiliaryNai
+                and k > 1
+                and isinstance(words[k - 2].pos, Verb)
+            ):
+                tail = [
+                    self._conjugated(masu, Mizen),
+                    self._n,
+                    self._conjugated(self._desu, Renyo),
+                    self._ta,
+                ]
+                return k - 2, k + 1, self._conjugate_before(words[k - 2], Renyo, tail)
+            if isinstance(prev.pos, Adjective):
+                return k, k + 1, [word, self._desu]
+            return None
+
+        if ctype == AuxiliaryNai and cform == Shushi:
+            if prev is not None and isinstance(prev.pos, Verb):
+                tail = [self._conjugated(masu, Mizen), self._n]
+                return k - 1, k + 1, self._conjugate_before(prev, Renyo, tail)
+            return k, k + 1, [word, self._desu]
+
+        if ctype == AuxiliaryDa and cform in (Shushi, IshiSuiryo):
+            return k, k + 1, [self._conjugated(self._desu, cform)]
+
+        if isinstance(word.pos, Adjective) and word.has_conjugation:
+            if cform == Shushi:
+                return k, k + 1, [word, self._desu]
+        return None
+
+    def edits(self, doc: Doc) -> List[Edit]:
+        """Find the rewrites of ``doc`` without applying them.
+
+        Returns
+        -------
+        list of tuple
+            The start, the stop and the new words of each rewrite, from left to
+            right.
+        """
+        words = doc.words
+        n = len(words)
+        edits: List[Edit] = []
+        end = 0
+        if self.style == "plain":
+            i = 0
+            while i < n:
+                edit = self._plain_edit(words, i) if i >= end else None
+                if edit is None or edit[0] < end:
+                    i += 1
+                    continue
+                edits.append(edit)
+                end = i = edit[1]
+            return edits
+
+        for i in range(n + 1):
+            if i < n and words[i].surface not in SENTENCE_ENDS:
+                continue
+            k = i - 1
+            while k >= end and isinstance(words[k].pos, EndingParticle):
+                k -= 1
+            edit = self._polite_edit(words, k) if k >= end else None
+            if edit is not None and edit[0] >= end:
+                edits.append(edit)
+                end = edit[1]
+        return edits
+
+    def convert(self, doc: Doc) -> int:
+        """Rewrite ``doc`` in the style of this converter.
+
+        All the rewrites are recorded as one step of the history.
+
+        Parameters
+        ----------
+        doc : Doc
+            The document to be edited. It must not be in ``Doc.batch``.
+
+        Returns
+        -------
+        int
+            The number of rewritten predicates.
+        """
+        edits = self.edits(doc)
+        doc.apply_edits(edits)
+        return len(edits)
+
+    def convert_text(self, text: str) -> str:
+        """Rewrite ``text`` in the style of this converter."""
+        doc = Doc(text, self.conjugation)
+        self.convert(doc)
+        return doc.get_text()
+
+
+_worker_converter: Optional[StyleConverter] = None
+
+
+def _init_worker(style: str, dicdir: Optional[str], node_format: Optional[str]) -> None:
+    global _worker_converter
+    conjugation = preload(dicdir, node_format, freeze=False)
+    _worker_converter = StyleConverter(style, conjugation)
+
+
+def _convert_in_worker(text: str) -> str:
+    assert _worker_converter is not None
+    return _worker_converter.convert_text(text)
+
+
+def convert_corpus(
+    texts: Iterable[str],
+    style: str = "plain",
+    workers: int = 1,
+    chunksize: int = 64,
+    dicdir: Optional[str] = None,
+    node_format: Optional[str] = None,
+) -> Iterator[str]:
+    """Rewrite every document of a corpus in ``style``.
+
+    As in ``jadoc.replace.replace_corpus``, each worker builds its tokenizer and
+    ``StyleConverter`` once, and the documents are yielded in order.
+
+    Parameters
+    ----------
+    texts : iterable of str
+        The documents.
+    style : str, optional
+        "plain" (the default) or "polite".
+    workers : int, optional
+        The number of worker processes (the default is 1, which processes the
+        documents in this process).
+    chunksize : int, optional
+        The number of documents sent to a worker at a time.
+    dicdir : str, optional
+        Path of MeCab dictionary directory (the default is delegated to MeCab).
+    node_format : str, optional
+        MeCab ``node_format``. See ``generate_tokenizer``.
+
+    Yields
+    ------
+    str
+        The rewritten documents.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown style: {style}")
+    initargs = (style, dicdir, node_format)
+    if workers <= 1:
+        _init_worker(*initargs)
+        for text in texts:
+            yield _convert_in_worker(text)
+        return
+
+    preload(dicdir, node_format, freeze=False)
+    with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        yield from pool.imap(_convert_in_worker, texts, chunksize=chunksize)
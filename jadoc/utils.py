@@ -1,4 +1,8 @@
 import os
+import sys
+import types
+from collections import deque
+from typing import Optional, Set
 
 from . import __title__
 
@@ -21,3 +25,61 @@ def debug_on() -> bool:
         return True
     else:
         return False
+
+
+_NOT_FOLLOWED = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+)
+
+
+def deep_getsizeof(obj: object, seen: Optional[Set[int]] = None) -> int:
+    """Get the size of an object and everything it refers to, in bytes.
+
+    Containers, ``__dict__`` and ``__slots__`` are followed. Classes, modules
+    and functions are not, because they are shared by the whole process.
+
+    Parameters
+    ----------
+    obj : object
+        The object to measure.
+    seen : set of int, optional
+        The ``id`` of the objects that have been counted already. They are
+        skipped, and the objects counted by this call are added.
+
+    Returns
+    -------
+    int
+        The number of bytes.
+
+    Examples
+    --------
+    >>> text = "本"
+    >>> size = deep_getsizeof([text, text])  # the string is counted once
+    >>> assert size == sys.getsizeof([text, text]) + sys.getsizeof(text)
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _NOT_FOLLOWED):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    stack.append(getattr(obj, name))
+    return size
@@ -0,0 +1,83 @@
+import gc
+from typing import Dict, Optional, Tuple
+
+from .conj import Conjugation
+from .mecab.tokenizer import _find_node_format, generate_tokenizer
+
+_conjugations: Dict[Tuple[Optional[str], Optional[str]], Conjugation] = {}
+_node_formats: Dict[Tuple[Optional[str], Optional[str]], Optional[str]] = {}
+
+
+def preload(
+    dicdir: Optional[str] = None, node_format: Optional[str] = None, freeze: bool = True
+) -> Conjugation:
+    """Build the state that can be shared by processes forked afterwards.
+
+    This finds the MeCab ``node_format`` and builds a ``Conjugation`` with its
+    ending tables once, typically in the parent process of a pre-fork server.
+    Children inherit them copy-on-write, and the MeCab tagger, which cannot be
+    shared, is created again in each child when it is first used. The
+    normalization of words needs no preparation because its tables are the class
+    lists built at import.
+
+    Calling this again with the same arguments returns the same object, and the
+    documents, ``LemmaReplacer`` and ``compile_script`` that are not given a
+    ``Conjugation`` use the one preloaded with the default arguments.
+
+    Parameters
+    ----------
+    dicdir : str, optional
+        Path of MeCab dictionary directory (the default is delegated to MeCab).
+    node_format : str, optional
+        MeCab ``node_format``. See ``generate_tokenizer``.
+    freeze : bool, optional
+        If True (the default), ``gc.freeze()`` moves all objects to a permanent
+        generation, so that garbage collections in children do not write to
+        them and copy their memory pages. It has no effect before Python 3.7.
+
+    Returns
+    -------
+    Conjugation
+        The preloaded conjugation.
+
+    Examples
+    --------
+    >>> conjugation = preload(freeze=False)
+    >>> assert preload(freeze=False) is conjugation
+    >>> assert preloaded() is conjugation
+    """
+    key = (dicdir, node_format)
+    conjugation = _conjugations.get(key)
+    if conjugation is None:
+        if node_format is None:
+            node_format = _find_node_format(dicdir)
+        conjugation = Conjugation(generate_tokenizer(dicdir, node_format))
+        _conjugations[key] = conjugation
+        _node_formats[key] = node_format
+    if freeze and hasattr(gc, "freeze"):  # Python 3.7+
+        gc.freeze()
+    return conjugation
+
+
+def preloaded(
+    dicdir: Optional[str] = None, node_format: Optional[str] = None
+) -> Optional[Conjugation]:
+    """Get the conjugation preloaded with the same arguments, if any."""
+    return _conjugations.get((dicdir, node_format))
+
+
+def preloaded_node_format(
+    dicdir: Optional[str] = None, node_format: Optional[str] = None
+) -> Optional[str]:
+    """Get the ``node_format`` found by ``preload`` with the same arguments, to
+    create more taggers without finding it again."""
+    return _node_formats.get((dicdir, node_format), node_format)
+
+
+def default_conjugation() -> Conjugation:
+    """Get the conjugation preloaded with the default arguments, or a new one
+    with the default tokenizer if there is none."""
+    conjugation = preloaded()
+    if conjugation is None:
+        conjugation = Conjugation(tokenize=generate_tokenizer())
+    return conjugation
@@ -1,8 +1,8 @@
 from typing import Dict, List, Optional
 
-from .cform import get_normalized_cform
-from .ctype import Nothing, Unknown, get_normalized_ctype
-from .pos import get_normalized_pos
+from .cform import ConjugationForm, get_normalized_cform
+from .ctype import ConjugationType, Nothing, Unknown, get_normalized_ctype
+from .pos import PartOfSpeech, get_normalized_pos
 
 
 class Word:
@@ -34,6 +34,46 @@ class Word:
             type(self.c_type) != Nothing and type(self.c_type) != Unknown
         )
 
+    @classmethod
+    def from_normalized(
+        cls,
+        surface: str,
+        pos: PartOfSpeech,
+        base: str,
+        c_type: ConjugationType,
+        c_form: ConjugationForm,
+    ) -> "Word":
+        """Construct a word from already normalized attributes.
+
+        Unlike ``__init__``, this does not run the normalizers.
+
+        Parameters
+        ----------
+        surface : str
+            Surface form.
+        pos : PartOfSpeech
+            Normalized part-of-speech.
+        base : str
+            Base form.
+        c_type : ConjugationType
+            Normalized conjugation type.
+        c_form : ConjugationForm
+            Normalized conjugation form.
+
+        Returns
+        -------
+        Word
+            The word.
+        """
+        word = cls.__new__(cls)
+        word.surface = surface
+        word.pos = pos
+        word.base = base
+        word.c_type = c_type
+        word.c_form = c_form
+        word.has_conjugation = type(c_type) != Nothing and type(c_type) != Unknown
+        return word
+
     def to_dict(self) -> Dict[str, str]:
         """Convert this word to a ``dict`` object.
 
@@ -0,0 +1,112 @@
+import pytest
+
+from jadoc.doc import Doc
+from jadoc.errors import InvalidFormatError
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.reader import (
+    IPADIC,
+    feature_line_to_word,
+    line_to_word,
+    read_sentences,
+)
+from jadoc.mecab.tokenizer import _find_node_format, _mecab_tagger, generate_tokenizer
+from jadoc.word.ctype import GodanI
+from jadoc.word.pos import Noun, Verb
+
+dicdirs = [None] + get_dicdirs()
+
+TEXTS = ["本を書きました。", "毎日とても歩きます。", "美しゅうございません。"]
+
+
+def same_words(a, b):
+    return [word.to_dict() for word in a] == [word.to_dict() for word in b]
+
+
+@pytest.mark.parametrize("dicdir", dicdirs)
+@pytest.mark.parametrize("feature_format", [False, True])
+def test_read_sentences_should_equal_tokenize(dicdir, feature_format):
+    if feature_format:
+        node_format = r"%m\\t%H\\n"
+    else:
+        node_format = _find_node_format(dicdir)
+    tagger = _mecab_tagger(dicdir=dicdir, node_format=node_format)
+    output = "".join(tagger.parse(text) for text in TEXTS)
+
+    tokenize = generate_tokenizer(dicdir)
+    sentences = list(read_sentences(output.splitlines(keepends=True)))
+    assert len(sentences) == len(TEXTS)
+    for words, text in zip(sentences, TEXTS):
+        assert same_words(words, tokenize(text))
+
+
+@pytest.mark.parametrize("dicdir", dicdirs)
+def test_read_sentences_of_default_output(dicdir):
+    # the default output of the dictionary, e.g. the "unidic" format of UniDic
+    output = "".join(_mecab_tagger(dicdir=dicdir).parse(text) for text in TEXTS)
+
+    tokenize = generate_tokenizer(dicdir)
+    sentences = list(read_sentences(output.splitlines()))
+    assert len(sentences) == len(TEXTS)
+    for words, text in zip(sentences, TEXTS):
+        expected = tokenize(text)
+        # the base may be written differently, e.g. 御座る instead of ござる
+        assert [word.surface for word in words] == [word.surface for word in expected]
+        for word, expected_word in zip(words, expected):
+            assert type(word.pos) == type(expected_word.pos)
+            assert type(word.c_type) == type(expected_word.c_type)
+            assert type(word.c_form) == type(expected_word.c_form)
+    assert sentences[0][2].base == "書く"
+
+    doc = Doc.from_mecab_output(output.split("EOS")[0])
+    doc.delete(3)
+    assert doc.get_text() == "本を書いた。"
+
+
+@pytest.mark.parametrize(
+    "line", ["本\tホン\tホン\t本", "\t本\tホン\tホン\t本\t名詞\t\t\t"]
+)
+def test_unsupported_line(line):
+    with pytest.raises(InvalidFormatError):
+        line_to_word(line)
+
+
+@pytest.mark.parametrize("line", ["foo", "a,b"])
+def test_malformed_line_should_be_reported_with_its_number(line):
+    with pytest.raises(InvalidFormatError, match="^line 3: "):
+        list(read_sentences(["本,名詞,本,,", "EOS", line]))
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "書き\t動詞,自立,*,*,五段・カ行イ音便,連用形,書く,カキ,カキ",
+        "書き\tカキ\tカク\t書く\t動詞-一般\t五段-カ行\t連用形-一般\t1",
+        "書き\t動詞,一般,*,*,五段-カ行,連用形-一般,カク,書く,書き,カキ,書く,カク,和",
+        "書き,動詞-一般,書く,五段-カ行,連用形-一般",
+    ],
+)
+def test_line_to_word(line):
+    word = line_to_word(line)
+    assert word.surface == "書き"
+    assert word.base == "書く"
+    assert type(word.pos) == Verb
+    assert type(word.c_type) == GodanI
+
+
+def test_unknown_word_without_base():
+    word = feature_line_to_word("ｘｙｚ\t名詞,普通名詞,一般,*,*,*", IPADIC)
+    assert word.base == "ｘｙｚ"
+    assert type(word.pos) == Noun
+    assert not word.has_conjugation
+
+
+def test_read_sentences_without_last_eos():
+    lines = ["本\t名詞,一般,*,*,*,*,本,ホン,ホン", "EOS", "", "本\t名詞,一般"]
+    assert [len(words) for words in read_sentences(lines)] == [1, 1]
+
+
+def test_docs_from_mecab_output():
+    output = "本,名詞,本,,\nEOS\n本,名詞,本,,\nを,助詞,を,,\nEOS\n"
+    assert Doc.from_mecab_output(output).get_text() == "本本を"
+    docs = Doc.read_mecab_output(output.splitlines())
+    assert [doc.get_text() for doc in docs] == ["本", "本を"]
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from jadoc.batch import GapBuffer
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.word.cform import Meirei
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+TEXT = "本を書きました。毎日とても歩きます。そうでありません。音楽を聞きました。"
+REPLACEMENTS = ["読む", "走る", "静かだ", "美しい", "見る", "公園で"]
+
+
+def start_of(edit):
+    return edit[1] if type(edit[1]) == int else edit[1].start
+
+
+class TestGapBuffer:
+    def test_random_edits_should_match_list(self):
+        rand = random.Random(0)
+        expect = list(range(20))
+        items = GapBuffer(expect)
+        for _ in range(500):
+            n = len(expect)
+            a, b = rand.randint(-2, n + 2), rand.randint(-2, n + 2)
+            r = rand.random()
+            if r < 0.4:
+                new = [rand.random() for _ in range(rand.randint(0, 5))]
+                expect[a:b] = new
+                items[a:b] = new
+            elif r < 0.6:
+                del expect[a:b]
+                del items[a:b]
+            elif r < 0.8:
+                expect.insert(a, r)
+                items.insert(a, r)
+            elif n > 0:
+                i = rand.randrange(-n, n)
+                expect[i] = items[i] = r
+            assert items.to_list() == expect
+            assert items[a:b] == expect[a:b]
+
+
+class TestBatch:
+    @pytest.mark.parametrize("conjugation", conjugations)
+    @pytest.mark.parametrize("seed", range(10))
+    def test_batch_should_equal_edits_from_right_to_left(self, conjugation, seed):
+        rand = random.Random(seed)
+        batched = Doc(TEXT, conjugation)
+        n = len(batched.words)
+        starts = sorted(rand.sample(range(n), 4))
+        edits = []
+        for start, stop in zip(starts, starts[1:] + [n]):
+            stop = rand.randint(start, stop)
+            words = conjugation.tokenize(rand.choice(REPLACEMENTS))
+            if start == stop:
+                edits.append(("insert", start, words))
+            elif rand.random() < 0.5:
+                edits.append(("delete", range(start, stop)))
+            else:
+                edits.append(("update", range(start, stop), words))
+        rand.shuffle(edits)
+
+        with batched.batch():
+            for method, *args in edits:
+                getattr(batched, method)(*args)
+            assert batched.get_text() == TEXT
+
+        expect = Doc(TEXT, conjugation)
+        for method, *args in sorted(edits, key=start_of, reverse=True):
+            getattr(expect, method)(*args)
+        assert batched.simple_view() == expect.simple_view()
+        assert batched.get_text() == expect.get_text()
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_insertions_at_the_same_index_keep_their_order(self, conjugation):
+        doc = Doc("本を読む。", conjugation)
+        with doc.batch():
+            doc.insert(0, conjugation.tokenize("今日"))
+            doc.insert(0, conjugation.tokenize("は"))
+        assert doc.get_text() == "今日は本を読む。"
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_conjugate_should_be_batched(self, conjugation):
+        doc = Doc("本を読む。", conjugation)
+        with doc.batch():
+            doc.conjugate(2, Meirei("命令形"))
+            doc.insert(0, conjugation.tokenize("今日は"))
+            assert doc.get_text() == "本を読む。"
+        assert doc.get_text() == "今日は本を読め。"
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_overlapping_edits_should_raise_error(self, conjugation):
+        doc = Doc(TEXT, conjugation)
+        with pytest.raises(ValueError):
+            with doc.batch():
+                doc.delete(range(1, 3))
+                doc.delete(2)
+        assert doc.get_text() == TEXT
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_edits_should_be_discarded_on_error(self, conjugation):
+        doc = Doc(TEXT, conjugation)
+        with pytest.raises(RuntimeError):
+            with doc.batch():
+                doc.delete(0)
+                raise RuntimeError
+        assert doc.get_text() == TEXT
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_retokenizing_edits_should_not_be_batched(self, conjugation):
+        doc = Doc(TEXT, conjugation)
+        with pytest.raises(ValueError):
+            with doc.batch():
+                doc.delete(0)
+                doc.update_surfaces(3, "読み")
+        with pytest.raises(ValueError):
+            with doc.batch():
+                doc.retokenize()
+        assert doc.get_text() == TEXT
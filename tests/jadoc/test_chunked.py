@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from jadoc.chunked import ChunkedList, FenwickTree, PrefixSumList
+
+
+class TestFenwickTree:
+    def test_prefix_sum(self):
+        values = [3, 0, 2, 5, 1]
+        tree = FenwickTree(values)
+        for i in range(len(values) + 1):
+            assert tree.prefix_sum(i) == sum(values[:i])
+
+    def test_add(self):
+        tree = FenwickTree([1, 1, 1])
+        tree.add(1, 4)
+        assert tree.prefix_sum(2) == 6
+        assert tree.prefix_sum(3) == 7
+
+    @pytest.mark.parametrize(
+        "k, expect",
+        [(0, (0, 0)), (2, (0, 2)), (3, (2, 0)), (9, (3, 4)), (11, (5, 0))],
+    )
+    def test_search(self, k, expect):
+        tree = FenwickTree([3, 0, 2, 5, 1])
+        assert tree.search(k) == expect
+
+
+class TestChunkedList:
+    def test_should_behave_like_a_list(self):
+        items = ChunkedList(range(10), chunk_size=3)
+        assert len(items) == 10
+        assert list(items) == list(range(10))
+        assert items[-1] == 9
+        assert items[2:5] == [2, 3, 4]
+
+    def test_index_out_of_range(self):
+        items = ChunkedList([1, 2, 3])
+        with pytest.raises(IndexError):
+            items[3]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5])
+    def test_random_edits_should_match_list(self, chunk_size):
+        rand = random.Random(chunk_size)
+        expect = list(range(20))
+        items = ChunkedList(expect, chunk_size=chunk_size)
+        for _ in range(500):
+            n = len(expect)
+            a, b = rand.randint(-2, n + 2), rand.randint(-2, n + 2)
+            r = rand.random()
+            if r < 0.4:
+                new = [rand.random() for _ in range(rand.randint(0, 8))]
+                expect[a:b] = new
+                items[a:b] = new
+            elif r < 0.7:
+                del expect[a:b]
+                del items[a:b]
+            else:
+                expect.insert(a, r)
+                items.insert(a, r)
+            assert list(items) == expect
+            assert items[a:b] == expect[a:b]
+
+    def test_forks_should_not_affect_each_other(self):
+        rand = random.Random(0)
+        lists = [list(range(30))]
+        items = [ChunkedList(lists[0], chunk_size=4)]
+        for _ in range(300):
+            k = rand.randrange(len(items))
+            if rand.random() < 0.1:
+                lists.append(list(lists[k]))
+                items.append(items[k].fork())
+                continue
+            n = len(lists[k])
+            a, b = sorted([rand.randint(0, n), rand.randint(0, n)])
+            new = [rand.random() for _ in range(rand.randint(0, 6))]
+            lists[k][a:b] = new
+            items[k][a:b] = new
+            for expect, actual in zip(lists, items):
+                assert list(actual) == expect
+
+    def test_small_edits_should_not_rebalance(self, monkeypatch):
+        rand = random.Random(0)
+        items = ChunkedList(range(10000), chunk_size=16)
+        rebuilds = []
+        rebuild = items._rebuild
+        monkeypatch.setattr(items, "_rebuild", lambda: rebuilds.append(1) or rebuild())
+        expect = list(items)
+        for _ in range(4000):
+            # mostly in the same region, which splits the same chunks
+            i = rand.randrange(100 if rand.random() < 0.9 else len(expect))
+            if rand.random() < 0.8:
+                items.insert(i, -1)
+                expect.insert(i, -1)
+            else:
+                del items[i]
+                del expect[i]
+        assert list(items) == expect
+        assert len(rebuilds) <= 5
+
+
+class TestPrefixSumList:
+    @pytest.mark.parametrize("chunk_size", [1, 3])
+    def test_random_edits_should_keep_prefix_sums(self, chunk_size):
+        rand = random.Random(chunk_size)
+        expect = [rand.randint(0, 3) for _ in range(20)]
+        values = PrefixSumList(expect, chunk_size=chunk_size)
+        for _ in range(300):
+            n = len(expect)
+            a, b = sorted([rand.randint(0, n), rand.randint(0, n)])
+            new = [rand.randint(0, 3) for _ in range(rand.randint(0, 5))]
+            expect[a:b] = new
+            values[a:b] = new
+            if expect:
+                i = rand.randrange(len(expect))
+                expect[i] = values[i] = rand.randint(0, 3)
+            for i in range(len(expect) + 1):
+                assert values.prefix_sum(i) == sum(expect[:i])
+            for x in range(sum(expect)):
+                i = values.find(x)
+                assert sum(expect[:i]) <= x < sum(expect[: i + 1])
+
+    def test_find_out_of_range(self):
+        values = PrefixSumList([1, 2])
+        with pytest.raises(IndexError):
+            values.find(3)
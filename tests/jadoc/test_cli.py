@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from jadoc.cli import main
+from jadoc.mecab.config import get_dicdirs
+from jadoc.store import CorpusReader
+
+dicdirs = [str(dicdir) for dicdir in get_dicdirs()]
+
+TEXTS = ["本を購入しました。", "毎日とても歩きます。", "", "手紙を購入する。"]
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("".join(text + "\n" for text in TEXTS), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("dicdir", dicdirs)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_replace(dicdir, workers, input_file, capsys):
+    args = ["replace", "-m", "購入する=買う", input_file, "--dicdir", dicdir]
+    assert main(args + ["-w", str(workers), "--chunk-size", "1"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["本を買いました。", "毎日とても歩きます。", "", "手紙を買う。"]
+
+
+@pytest.mark.parametrize("dicdir", dicdirs)
+def test_edit(dicdir, input_file, tmp_path, capsys):
+    script = tmp_path / "script.txt"
+    source = "replace base=購入 base=する -> 買う\ndelete base=とても\n"
+    script.write_text(source, encoding="utf-8")
+    args = ["edit", "-s", str(script), input_file, "--dicdir", dicdir, "-w", "2"]
+    assert main(args) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["本を買いました。", "毎日歩きます。", "", "手紙を買う。"]
+
+
+@pytest.mark.parametrize("dicdir", dicdirs)
+def test_tokenize(dicdir, input_file, capsys):
+    main(["tokenize", "--sep", "/", input_file, "--dicdir", dicdir])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1] == "毎日/とても/歩き/ます/。"
+    assert len(lines) == len(TEXTS)
+
+
+@pytest.mark.parametrize("dicdir", dicdirs)
+def test_unordered_jsonl(dicdir, tmp_path):
+    path = tmp_path / "input.jsonl"
+    path.write_text(
+        "".join(json.dumps({"body": text}) + "\n" for text in TEXTS), encoding="utf-8"
+    )
+    output = str(tmp_path / "output.jsonl")
+    args = ["tokenize", str(path), "--input-format", "jsonl", "--field", "body"]
+    args += ["-f", "jsonl", "-o", output, "-w", "2", "--unordered"]
+    main(args + ["--chunk-size", "1", "--dicdir", dicdir])
+    with open(output, encoding="utf-8") as f:
+        records = sorted((json.loads(line) for line in f), key=lambda r: r["id"])
+    assert [r["text"] for r in records] == TEXTS
+    assert records[0]["words"][0]["surface"] == "本"
+
+
+@pytest.mark.parametrize("dicdir", dicdirs)
+def test_binary(dicdir, input_file, tmp_path):
+    output = str(tmp_path / "store")
+    main(["tokenize", input_file, "-f", "binary", "-o", output, "--dicdir", dicdir])
+    with CorpusReader(output) as reader:
+        texts = ["".join(word.surface for word in words) for words in reader]
+    assert texts == TEXTS
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["tokenize", "-f", "binary"],
+        ["replace", "-m", "購入する"],
+        ["replace"],
+        ["tokenize", "-f", "binary", "-o", "store", "--unordered"],
+        ["tokenize", "no-such-file.txt"],
+        ["edit", "-s", "no-such-script.txt"],
+    ],
+)
+def test_invalid_arguments(args):
+    with pytest.raises(SystemExit) as e:
+        main(args)
+    assert e.value.code == 2
+
+
+@pytest.mark.parametrize("dicdir", dicdirs)
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize(
+    "line, message",
+    [("{", "line 2: Expecting"), ('{"body": ""}', "line 2: no string field 'text'")],
+)
+def test_invalid_json_line(dicdir, workers, line, message, tmp_path, capsys):
+    path = tmp_path / "input.jsonl"
+    path.write_text('{"text": "本"}\n' + line + "\n", encoding="utf-8")
+    args = ["tokenize", str(path), "--input-format", "jsonl", "-w", str(workers)]
+    with pytest.raises(SystemExit) as e:
+        main(args + ["--dicdir", dicdir])
+    assert e.value.code == 2
+    assert f"{path}: {message}" in capsys.readouterr().err
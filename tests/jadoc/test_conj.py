@@ -5,7 +5,8 @@ import pytest
 from jadoc.conj import Conjugation, _replace_with_vowel
 from jadoc.mecab.config import get_dicdirs
 from jadoc.mecab.tokenizer import generate_tokenizer
-from jadoc.word.cform import Gokan, Meirei, RenyoOnbin
+from jadoc.word.cform import Gokan, Meirei, RenyoNi, RenyoOnbin
+from jadoc.word.ctype import Adjective, GodanI, Kahen
 from jadoc.word.word import Word
 
 tokenizers = [generate_tokenizer(dicdir) for dicdir in get_dicdirs()]
@@ -92,3 +93,19 @@ class TestConjugation:
         conjugation = Conjugation(tokenize)
         conjugated_word = conjugation.conjugate(word, c_form)
         assert are_same_word([conjugated_word, expect])
+
+    @pytest.mark.parametrize("tokenize", tokenizers)
+    def test_with_tokenizer_should_share_ending_tables(self, tokenize):
+        conjugation = Conjugation(tokenize)
+        copied = conjugation.with_tokenizer(tokenize)
+        assert copied.tokenize is tokenize
+        assert copied._ending_dic is conjugation._ending_dic
+
+    @pytest.mark.parametrize("tokenize", tokenizers)
+    def test_conjugate_base(self, tokenize):
+        conjugation = Conjugation(tokenize)
+        assert conjugation.conjugate_base("書く", GodanI, RenyoOnbin) == "書い"
+        assert conjugation.conjugate_base("来る", Kahen, Meirei) == "来い"
+        assert conjugation.conjugate_base("良い", Adjective, Gokan) == "良さ"
+        assert conjugation.conjugate_base("美しい", Adjective, Gokan) == "美し"
+        assert conjugation.conjugate_base("書く", GodanI, RenyoNi) is None
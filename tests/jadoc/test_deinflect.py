@@ -0,0 +1,71 @@
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.deinflect import Deinflection, Deinflector
+from jadoc.lexicon import Lexicon
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.word.cform import Gokan, Mizen, Renyo, RenyoOnbin, Shushi
+from jadoc.word.ctype import (
+    Adjective,
+    AuxiliaryDa,
+    AuxiliaryDesu,
+    GodanI,
+    GodanN,
+    GodanZ,
+    Ichidan,
+    Kahen,
+    Rahen,
+    Sahen,
+)
+from jadoc.word.word import Word
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+SURFACES = ["書い", "読ん", "読ま", "見", "来", "し", "美しく", "高さ", "でし", "だっ"]
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+@pytest.mark.parametrize(
+    "surface, expect",
+    [
+        ("書い", Deinflection("書く", GodanI, RenyoOnbin)),
+        ("読ん", Deinflection("読む", GodanN, RenyoOnbin)),
+        ("読ま", Deinflection("読む", GodanN, Mizen)),
+        ("待っ", Deinflection("待つ", GodanZ, RenyoOnbin)),
+        ("あっ", Deinflection("ある", Rahen, RenyoOnbin)),
+        ("見", Deinflection("見る", Ichidan, Renyo)),
+        ("来", Deinflection("来る", Kahen, Renyo)),
+        ("し", Deinflection("する", Sahen, Renyo)),
+        ("美しく", Deinflection("美しい", Adjective, Renyo)),
+        ("高さ", Deinflection("高い", Adjective, Gokan)),
+        ("でし", Deinflection("です", AuxiliaryDesu, Renyo)),
+        ("だっ", Deinflection("だ", AuxiliaryDa, RenyoOnbin)),
+        ("読む", Deinflection("読む", GodanN, Shushi)),
+    ],
+)
+def test_deinflect(conjugation, surface, expect):
+    assert expect in Deinflector(conjugation).deinflect(surface)
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_candidates_should_conjugate_to_the_surface(conjugation):
+    deinflector = Deinflector(conjugation)
+    for surface in SURFACES:
+        for base, ctype, cform in deinflector.deinflect(surface):
+            assert conjugation.conjugate_base(base, ctype, cform) == surface
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_deinflect_with_lexicon(conjugation):
+    lexicon = Lexicon.from_words(
+        [
+            Word("書く", ["動詞"], "書く", "五段-カ行", "終止形-一般"),
+            Word("見る", ["動詞"], "見る", "上一段-マ行", "終止形-一般"),
+        ]
+    )
+    deinflector = Deinflector(conjugation, lexicon)
+    assert deinflector.deinflect("書い") == [Deinflection("書く", GodanI, RenyoOnbin)]
+    assert deinflector.bases("見") == ["見る"]
+    assert deinflector.deinflect("読ん") == []
+    assert len(Deinflector(conjugation).bases("書い")) > 1
@@ -1,5 +1,8 @@
+import random
+
 import pytest
 
+from jadoc.chunked import ChunkedList
 from jadoc.conj import Conjugation
 from jadoc.doc import Doc
 from jadoc.mecab.config import get_dicdirs
@@ -85,6 +88,27 @@ class TestDoc:
         doc.insert(i, words)
         assert doc.get_text() == expect
 
+    @pytest.mark.parametrize("conjugation", conjugations)
+    def test_apply_edits(self, conjugation):
+        doc = Doc("本を書きました。", conjugation, history_size=10)
+        doc.apply_edits(
+            [
+                (5, 6, conjugation.tokenize("！")),
+                (0, 1, conjugation.tokenize("手紙")),
+                (2, 2, conjugation.tokenize("すぐ")),
+            ]
+        )
+        assert doc.get_text() == "手紙をすぐ書きました！"
+        doc.undo()
+        assert doc.get_text() == "本を書きました。"
+        for edits in ([(0, 2, []), (1, 3, [])], [(5, 9, [])]):
+            with pytest.raises(ValueError):
+                doc.apply_edits(edits)
+        with pytest.raises(ValueError):
+            with doc.batch():
+                doc.apply_edits([])
+        assert doc.get_text() == "本を書きました。"
+
     @pytest.mark.parametrize("conjugation", conjugations)
     @pytest.mark.parametrize(
         "text, interval, expect",
@@ -93,6 +117,7 @@ class TestDoc:
             (TEXT, 0, "".join(SURFACES[1:])),
             ("本を書きました", range(3, 4), "本を書いた"),
             ("本を書きました", 1, "本書きました"),
+            ("泳ぎました", range(1, 2), "泳いだ"),
         ],
     )
     def test_delete(self, conjugation, text, interval, expect):
@@ -125,6 +150,30 @@ class TestDoc:
         doc.update(interval, words)
         assert doc.get_text() == expect
 
+    @pytest.mark.parametrize("conjugation", conjugations)
+    @pytest.mark.parametrize("seed", range(3))
+    def test_update_should_equal_insert_and_delete(self, conjugation, seed):
+        texts = ["本を書きました。", "美しゅうございません。", "彼は走って、泳いだ。", "勉強させられた。"]
+        surfaces = ["", "読む", "走る", "静かだ", "美しい", "公園で", "する", "ます", "た"]
+        rand = random.Random(seed)
+        for _ in range(100):
+            text = rand.choice(texts)
+            docs = [Doc(text, conjugation), Doc(text, conjugation)]
+            start = rand.randrange(len(docs[0].words))
+            stop = rand.randint(start + 1, len(docs[0].words))
+            words = conjugation.tokenize(rand.choice(surfaces))
+            docs[0].update(range(start, stop), words)
+            docs[1].insert(start, words)
+            n = len(words)
+            docs[1].delete(range(start + n, stop + n))
+            assert docs[0].simple_view() == docs[1].simple_view()
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_update_should_splice_once(self, conjugation):
+        doc = Doc("本を書きました。", conjugation, history_size=1)
+        doc.update(range(2, 4), conjugation.tokenize("読む"))
+        assert len(doc.history.pop_undo().splices) == 1
+
     @pytest.mark.parametrize("conjugation", conjugations)
     @pytest.mark.parametrize(
         "text, interval, surfaces, expect",
@@ -140,6 +189,70 @@ class TestDoc:
         doc.update_surfaces(interval, surfaces)
         assert doc.get_text() == expect
 
+    @pytest.mark.parametrize("conjugation", conjugations)
+    def test_chunked_doc_should_be_edited_like_a_list_doc(self, conjugation):
+        text = "本を書きました。毎日とても歩きます。"
+        docs = [Doc(text, conjugation), Doc(text, conjugation, chunked=True)]
+        assert type(docs[1].words) == ChunkedList
+        for doc in docs:
+            doc.delete(3)
+            doc.update(2, conjugation.tokenize("読む"))
+            doc.insert(5, conjugation.tokenize("いつも"))
+        assert docs[0].get_text() == docs[1].get_text()
+        assert docs[0].simple_view() == docs[1].simple_view()
+
+    @pytest.mark.parametrize("conjugation", conjugations)
+    @pytest.mark.parametrize("chunked", [False, True])
+    def test_offsets_should_follow_edits(self, conjugation, chunked):
+        doc = Doc("本を書きました。", conjugation, chunked=chunked)
+        assert doc.char_to_word(2) == 2
+        doc.delete(3)  # 書き -> 書い, まし is deleted and た is unchanged
+        doc.update(2, conjugation.tokenize("読む"))  # 読ん/だ
+        text = doc.get_text()
+        assert text == "本を読んだ。"
+        for i in range(len(doc.words) + 1):
+            assert doc.word_to_char(i) == len(doc.get_text(range(0, i)))
+        for offset in range(len(text)):
+            i = doc.char_to_word(offset)
+            begin = doc.word_to_char(i)
+            assert begin <= offset < begin + len(doc.words[i].surface)
+        assert doc.get_text(range(2, 4)) == "読んだ"
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    @pytest.mark.parametrize("offset", [-1, len(TEXT)])
+    def test_char_to_word_out_of_range(self, conjugation, offset):
+        doc = Doc(TEXT, conjugation)
+        with pytest.raises(IndexError):
+            doc.char_to_word(offset)
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_edits_should_not_modify_inserted_words(self, conjugation):
+        doc = Doc("本を書きました。", conjugation)
+        words = conjugation.tokenize("読む")
+        doc.update(2, words)
+        assert words[0].surface == "読む"
+        assert doc.get_text() == "本を読みました。"
+
+    @pytest.mark.parametrize("conjugation", conjugations)
+    def test_lazy_doc_should_not_tokenize_until_words_are_needed(self, conjugation):
+        calls = []
+
+        def tokenize(text):
+            calls.append(text)
+            return conjugation.tokenize(text)
+
+        text = "本を 書きました。"
+        doc = Doc(text, Conjugation(tokenize), lazy=True)
+        calls.clear()
+        assert not doc.is_tokenized
+        assert doc.get_text() == text
+        assert calls == []
+        assert len(doc.words) == 6
+        assert calls == [text]
+        assert doc.get_text() == text
+        doc.delete(3)
+        assert doc.get_text() == "本を書いた。"
+
     def test_simple_view(self):
         doc = Doc(TEXT)
         assert len(doc.simple_view()) > 0
@@ -148,3 +261,58 @@ class TestDoc:
         doc = Doc(TEXT)
         for dic in doc.to_word_list():
             assert type(dic) == dict
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_memory_usage(self, conjugation):
+        doc = Doc(TEXT, conjugation, history_size=5)
+        usage = doc.memory_usage()
+        assert usage["words"] > 0
+        assert usage["text"] == usage["offsets"] == 0
+        doc.delete(0)
+        doc.word_to_char(1)
+        doc.get_text()
+        edited = doc.memory_usage()
+        assert min(edited["text"], edited["offsets"]) > 0
+        assert edited["history"] > usage["history"]
+        assert edited["total"] == sum(v for k, v in edited.items() if k != "total")
+        longer = Doc(TEXT * 2, conjugation)
+        assert longer.memory_usage()["words"] > edited["words"]
+
+
+class TestFork:
+    @pytest.mark.parametrize("conjugation", conjugations)
+    @pytest.mark.parametrize("chunked", [False, True])
+    def test_forks_should_be_independent(self, conjugation, chunked):
+        text = "本を書きました。" * 3
+        doc = Doc(text, conjugation, chunked=chunked)
+        doc.char_to_word(0)
+        forks = [doc.fork() for _ in range(3)]
+        assert all(f.conjugation is doc.conjugation for f in forks)
+        forks[0].delete(3)
+        forks[1].update(2, conjugation.tokenize("読む"))
+        with forks[2].batch():
+            forks[2].delete(9)
+            forks[2].delete(3)
+        grandchild = forks[0].fork()
+        grandchild.delete(0)
+
+        assert doc.get_text() == text
+        assert forks[0].get_text() == "本を書いた。" + "本を書きました。" * 2
+        assert forks[1].get_text() == "本を読みました。" + "本を書きました。" * 2
+        assert forks[2].get_text() == "本を書いた。" * 2 + "本を書きました。"
+        assert grandchild.get_text() == "を書いた。" + "本を書きました。" * 2
+        for d in [doc, grandchild] + forks:
+            offsets = [d.word_to_char(i) for i in range(len(d.words) + 1)]
+            assert offsets[-1] == len(d.get_text())
+            assert all(
+                offsets[i + 1] - offsets[i] == len(w.surface)
+                for i, w in enumerate(d.words)
+            )
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_fork_should_share_unchanged_chunks(self, conjugation):
+        doc = Doc("本を書きました。" * 200, conjugation, chunked=True)
+        child = doc.fork()
+        child.delete(0)
+        shared = set(map(id, doc.words._chunks)) & set(map(id, child.words._chunks))
+        assert len(shared) == len(doc.words._chunks) - 1
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.events import TextChange, diff_text
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+TEXT = "本を書きました。毎日とても歩きます。手紙を書いて、音楽を聞きました。"
+REPLACEMENTS = ["読む", "走る", "静かだ", "美しい", "見る", "公園で"]
+
+
+class Mirror:
+    def __init__(self, text):
+        self.text = text
+
+    def __call__(self, change):
+        assert 0 <= change.start <= change.end <= len(self.text)
+        self.text = change.apply(self.text)
+
+
+@pytest.mark.parametrize(
+    "before, after, expect",
+    [
+        ("abc", "abc", None),
+        ("abc", "abd", TextChange(2, 3, "d")),
+        ("aaa", "aa", TextChange(2, 3, "")),
+        ("", "x", TextChange(0, 0, "x")),
+    ],
+)
+def test_diff_text(before, after, expect):
+    assert diff_text(0, before, after) == expect
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+@pytest.mark.parametrize("seed", range(5))
+def test_changes_should_reproduce_the_text(conjugation, seed):
+    rand = random.Random(seed)
+    doc = Doc(TEXT, conjugation, history_size=5)
+    mirror = Mirror(doc.get_text())
+    doc.subscribe(mirror)
+    for _ in range(20):
+        n = len(doc.words)
+        i = rand.randrange(n)
+        interval = range(i, min(n, i + rand.randint(1, 3)))
+        words = conjugation.tokenize(rand.choice(REPLACEMENTS))
+        r = rand.random()
+        if r < 0.2:
+            doc.insert(i, words)
+        elif r < 0.4 and n > 5:
+            doc.delete(interval)
+        elif r < 0.7:
+            doc.update(interval, words)
+        elif r < 0.8:
+            doc.update_surfaces(interval, rand.choice(REPLACEMENTS))
+        elif r < 0.9:
+            with doc.batch():
+                doc.delete(n - 1)
+                doc.update(0, words)
+        else:
+            doc.undo()
+        assert mirror.text == doc.get_text()
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+def test_first_change_of_lazy_doc(conjugation):
+    text = "本を 書きました。"
+    doc = Doc(text, conjugation, lazy=True)
+    mirror = Mirror(text)
+    doc.subscribe(mirror)
+    doc.delete(3)
+    assert mirror.text == doc.get_text() == "本を書いた。"
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+def test_unsubscribe(conjugation):
+    doc = Doc(TEXT, conjugation)
+    changes = []
+    doc.subscribe(changes.append)
+    doc.delete(0)
+    doc.unsubscribe(changes.append)
+    doc.delete(0)
+    assert len(changes) == 1
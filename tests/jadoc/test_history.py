@@ -0,0 +1,102 @@
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.history import History, Splice
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+TEXT = "本を書きました。"
+
+
+class TestHistory:
+    def test_empty_steps_should_not_be_recorded(self):
+        history = History(max_steps=3)
+        history.end_step()
+        assert not history.can_undo()
+
+    def test_old_steps_should_be_dropped(self):
+        history = History(max_steps=2)
+        first = history.checkpoint()
+        for i in range(3):
+            history.record(Splice(i, (), ()))
+            history.end_step()
+        with pytest.raises(ValueError):
+            history.steps_to(first)
+        assert history.steps_to(history.checkpoint()) == 0
+
+
+class TestDocHistory:
+    @pytest.mark.parametrize("conjugation", conjugations)
+    @pytest.mark.parametrize("chunked", [False, True])
+    def test_undo_and_redo(self, conjugation, chunked):
+        doc = Doc(TEXT, conjugation, chunked=chunked, history_size=10)
+        words = list(doc.words)
+        doc.delete(3)
+        assert doc.get_text() == "本を書いた。"
+        doc.update(2, conjugation.tokenize("読む"))
+        assert doc.get_text() == "本を読んだ。"
+
+        assert doc.undo()
+        assert doc.get_text() == "本を書いた。"
+        assert doc.undo()
+        assert doc.get_text() == TEXT
+        assert all(a is b for a, b in zip(doc.words, words))
+        assert not doc.undo()
+
+        assert doc.redo()
+        assert doc.redo()
+        assert doc.get_text() == "本を読んだ。"
+        assert not doc.redo()
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_undo_to_checkpoint(self, conjugation):
+        doc = Doc(TEXT, conjugation, history_size=10)
+        checkpoint = doc.checkpoint()
+        doc.delete(3)
+        doc.update_surfaces(0, "手紙")
+        with doc.batch():
+            doc.delete(0)
+            doc.delete(1)
+        doc.undo(checkpoint)
+        assert doc.get_text() == TEXT
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_new_edit_should_clear_redo(self, conjugation):
+        doc = Doc(TEXT, conjugation, history_size=10)
+        doc.delete(0)
+        doc.undo()
+        doc.delete(1)
+        assert not doc.redo()
+        assert doc.get_text() == "本書きました。"
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    @pytest.mark.parametrize("chunked", [False, True])
+    def test_setting_words_should_be_undone(self, conjugation, chunked):
+        doc = Doc(TEXT, conjugation, chunked=chunked, history_size=5)
+        doc.delete(3)
+        doc.words = conjugation.tokenize("猫が鳴く。")
+        assert doc.get_text() == "猫が鳴く。"
+        assert doc.chunked == (type(doc.words) != list)
+        assert doc.undo()
+        assert doc.get_text() == "本を書いた。"
+        assert doc.undo()
+        assert doc.get_text() == TEXT
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_history_size(self, conjugation):
+        doc = Doc(TEXT, conjugation, history_size=1)
+        doc.delete(0)
+        doc.delete(0)
+        assert doc.undo()
+        assert not doc.undo()
+        assert doc.get_text() == "を書きました。"
+
+    def test_history_is_disabled_by_default(self):
+        doc = Doc(TEXT)
+        doc.delete(0)
+        assert not doc.undo()
+        with pytest.raises(ValueError):
+            doc.checkpoint()
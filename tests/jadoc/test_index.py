@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from jadoc import index as MODULE_TO_BE_TESTED
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.index import Postings, WordIndex
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.word.cform import Renyo
+from jadoc.word.ctype import Godan
+from jadoc.word.pos import Noun, Verb
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+TEXT = "本を書きました。毎日とても歩きます。手紙を書いて、音楽を聞きました。"
+REPLACEMENTS = ["書く", "走る", "静かだ", "美しい", "見る", "公園で"]
+CONDITIONS = [
+    {"base": "書く"},
+    {"pos": Verb},
+    {"pos": Noun},
+    {"c_type": Godan},
+    {"c_form": Renyo},
+    {"base": "書く", "c_form": Renyo},
+]
+
+
+def scan(words, base=None, pos=None, c_type=None, c_form=None):
+    return [
+        i
+        for i, word in enumerate(words)
+        if (base is None or word.base == base)
+        and (pos is None or isinstance(word.pos, pos))
+        and (c_type is None or isinstance(word.c_type, c_type))
+        and (c_form is None or isinstance(word.c_form, c_form))
+    ]
+
+
+class TestPostings:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_splices_should_match_list(self, seed):
+        rand = random.Random(seed)
+        expect = sorted(rand.sample(range(100), 30))
+        postings = Postings(expect, chunk_size=2)
+        for _ in range(300):
+            start = rand.randint(0, 110)
+            stop = start + rand.randint(0, 5)
+            n = rand.randint(0, 5)
+            postings.splice(start, stop, n)
+            delta = n - (stop - start)
+            expect = [
+                p if p < start else p + delta for p in expect if p >= stop or p < start
+            ]
+            for i in range(start, start + n):
+                if rand.random() < 0.5:
+                    postings.add(i)
+                    expect.append(i)
+            expect.sort()
+            assert postings.to_list() == expect
+            assert len(postings) == len(expect)
+
+
+class TestWordIndex:
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_should_be_compacted(self, conjugation, monkeypatch):
+        monkeypatch.setattr(MODULE_TO_BE_TESTED, "MAX_PENDING_SPLICES", 2)
+        words = conjugation.tokenize(TEXT)
+        index = WordIndex(words)
+        for _ in range(5):
+            new = conjugation.tokenize("読む")
+            index.splice(0, 1, words[0:1], new)
+            words[0:1] = new
+        assert index.find(base="読む") == [0]
+        assert index.find(base="書く") == scan(words, base="書く")
+
+    def test_find_without_conditions(self):
+        with pytest.raises(ValueError):
+            WordIndex([]).find()
+
+
+class TestDocFind:
+    @pytest.mark.parametrize("conjugation", conjugations)
+    @pytest.mark.parametrize("seed", range(5))
+    def test_find_should_follow_edits(self, conjugation, seed):
+        rand = random.Random(seed)
+        doc = Doc(TEXT, conjugation)
+        for _ in range(20):
+            for condition in CONDITIONS:
+                assert doc.find(**condition) == scan(doc.words, **condition)
+            n = len(doc.words)
+            i = rand.randrange(n)
+            interval = range(i, min(n, i + rand.randint(1, 3)))
+            words = conjugation.tokenize(rand.choice(REPLACEMENTS))
+            r = rand.random()
+            if r < 0.3:
+                doc.insert(i, words)
+            elif r < 0.5 and n > 5:
+                doc.delete(interval)
+            elif r < 0.9:
+                doc.update(interval, words)
+            else:
+                doc.retokenize()
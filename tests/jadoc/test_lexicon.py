@@ -0,0 +1,95 @@
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.errors import InvalidFormatError
+from jadoc.lexicon import Lexicon, load_lexicon
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.reader import IPADIC
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.word.pos import Noun, Verb
+
+dicdirs = [str(dicdir) for dicdir in get_dicdirs()]
+
+CSV = """\
+読む,1,1,6000,動詞,自立,*,*,五段・マ行,基本形,読む,ヨム,ヨム
+読ま,1,1,6000,動詞,自立,*,*,五段・マ行,未然形,読む,ヨマ,ヨマ
+読み,1,1,7000,名詞,一般,*,*,*,*,読み,ヨミ,ヨミ
+読み,1,1,5000,動詞,自立,*,*,五段・マ行,連用形,読む,ヨミ,ヨミ
+本,1,1,3000,名詞,一般,*,*,*,*,本,ホン,ホン
+本,1,1,5000,接頭詞,名詞接続,*,*,*,*,本,ホン,ホン
+本,1,1,2000,名詞,一般,*,*,*,*,本,モト,モト
+"""
+
+
+@pytest.fixture
+def csv_dicdir(tmp_path):
+    (tmp_path / "dicrc").write_text("", encoding="utf-8")
+    (tmp_path / "Noun.csv").write_text(CSV, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def lexicons(tmp_path_factory):
+    cache_dir = tmp_path_factory.mktemp("cache")
+    return cache_dir, [load_lexicon(dicdir, cache_dir) for dicdir in dicdirs]
+
+
+def test_lexicon_from_csv(csv_dicdir):
+    lexicon = Lexicon.from_dicdir(csv_dicdir, IPADIC)
+    assert len(lexicon) == 4
+    assert "読む" in lexicon and "読ま" not in lexicon
+    assert [w.surface for w in lexicon.lookup("読む")] == ["読む"]
+    # ordered by cost, without the duplicate of 本 as a noun
+    words = lexicon.lookup("本")
+    assert len(words) == 2
+    assert isinstance(words[0].pos, Noun)
+    assert lexicon.word("本", Verb) is None
+    assert lexicon.word("ない") is None
+
+
+def test_lookup_should_return_new_words(csv_dicdir):
+    lexicon = Lexicon.from_dicdir(csv_dicdir, IPADIC)
+    word = lexicon.word("読む")
+    word.surface = "読んだ"
+    assert lexicon.word("読む").surface == "読む"
+
+
+def test_lexicon_should_be_restored(csv_dicdir):
+    lexicon = Lexicon.from_dicdir(csv_dicdir, IPADIC)
+    loaded = Lexicon(lexicon.to_bytes())
+    assert len(loaded) == len(lexicon)
+    for lemma in ("読む", "本", "読み"):
+        assert [w.to_dict() for w in loaded.lookup(lemma)] == [
+            w.to_dict() for w in lexicon.lookup(lemma)
+        ]
+
+
+def test_lexicon_without_dictionary(tmp_path):
+    with pytest.raises(InvalidFormatError):
+        Lexicon.from_dicdir(tmp_path, IPADIC)
+    with pytest.raises(InvalidFormatError):
+        Lexicon(b"")
+
+
+@pytest.mark.parametrize("i", range(len(dicdirs)))
+def test_lexicon_should_match_the_tokenizer(lexicons, i):
+    _, lexicons = lexicons
+    conjugation = Conjugation(generate_tokenizer(dicdirs[i]))
+    for lemma in ("読む", "美しい", "する", "本"):
+        expected = conjugation.tokenize(lemma)[0]
+        word = lexicons[i].word(lemma, type(expected.pos))
+        assert type(word.pos) == type(expected.pos)
+        assert type(word.c_type) == type(expected.c_type)
+        assert type(word.c_form) == type(expected.c_form)
+        assert word.base == expected.base
+
+
+@pytest.mark.parametrize("i", range(len(dicdirs)))
+def test_lexicon_should_be_cached(lexicons, i):
+    cache_dir, lexicons = lexicons
+    assert len(list(cache_dir.glob("lexicon-*.bin"))) == len(dicdirs)
+    assert load_lexicon(dicdirs[i], cache_dir) is lexicons[i]
+    load_lexicon.cache_clear()
+    loaded = load_lexicon(dicdirs[i], cache_dir)
+    assert loaded is not lexicons[i]
+    assert len(loaded) == len(lexicons[i])
@@ -0,0 +1,174 @@
+import random
+
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.errors import ScriptSyntaxError
+from jadoc.matcher import Match, Matcher, Token, parse_pattern
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.script import Condition
+from jadoc.word.pos import Noun, Verb
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+TEXT = "本を読みます。手紙を書きました。美しい花が咲いた。"
+
+
+def matcher(*patterns):
+    m = Matcher()
+    for i, pattern in enumerate(patterns):
+        m.add(str(i), pattern)
+    return m
+
+
+def brute_force(doc, pattern):
+    """The positions where a pattern of single conditions matches."""
+    conditions = [token.condition for token in parse_pattern(pattern)]
+    return [
+        i
+        for i in range(len(doc.words) - len(conditions) + 1)
+        if all(c.matches(doc.words[i + k]) for k, c in enumerate(conditions))
+    ]
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "pos=Verb base=ます",
+        "pos=Noun",
+        "pos=名詞 base=を",
+        "c_type=Godan,c_form=Renyo",
+        "surface=美しい pos=Noun",
+        "base=ない",
+    ],
+)
+def test_find_should_match_conditions(conjugation, pattern):
+    doc = Doc(TEXT, conjugation)
+    starts = [match.start for match in matcher(pattern).find(doc)]
+    assert starts == brute_force(doc, pattern)
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_operators(conjugation):
+    doc = Doc("本を読みます。本と手紙を書いた。", conjugation)
+    words = [w.surface for w in doc.words]
+    assert [words[m.start : m.stop] for m in matcher("pos=Noun+").find(doc)] == [
+        ["本"],
+        ["本"],
+        ["手紙"],
+    ]
+    found = matcher("pos=Noun base=と? pos=Noun? base=を").find(doc)
+    assert [words[m.start : m.stop] for m in found] == [
+        ["本", "を"],
+        ["本", "と", "手紙", "を"],
+    ]
+    # the longest match
+    found = matcher("base=を _* base=。").find(doc)
+    assert [(m.start, m.stop) for m in found] == [(1, 12)]
+
+
+def naive_find(words, patterns):
+    """Try every pattern at every position, as ``Matcher.find`` should behave."""
+
+    def ends(tokens, i):
+        if not tokens:
+            return {i}
+        (condition, op), rest = tokens[0], tokens[1:]
+        result = ends(rest, i) if op in ("?", "*") else set()
+        if i < len(words) and condition.matches(words[i]):
+            result |= ends(rest, i + 1)
+            if op in ("*", "+"):
+                result |= ends((Token(condition, "*"),) + rest, i + 1)
+        return result
+
+    parsed = [parse_pattern(pattern) for pattern in patterns]
+    matches = []
+    i = 0
+    while i < len(words):
+        best = None
+        for number, tokens in enumerate(parsed):
+            stops = [stop for stop in ends(tokens, i) if stop > i]
+            if stops and (best is None or max(stops) > best.stop):
+                best = Match(str(number), i, max(stops))
+        if best is None:
+            i += 1
+        else:
+            matches.append(best)
+            i = best.stop
+    return matches
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+@pytest.mark.parametrize("seed", range(10))
+def test_find_should_equal_naive_search(conjugation, seed):
+    rand = random.Random(seed)
+    words = conjugation.tokenize(TEXT * 2)
+    elements = ["pos=Noun", "pos=Verb", "base=を", "base=た", "pos=Auxiliary", "_"]
+    patterns = [
+        " ".join(
+            rand.choice(elements) + rand.choice(["", "", "?", "*", "+"])
+            for _ in range(rand.randint(1, 3))
+        )
+        for _ in range(rand.randint(1, 3))
+    ]
+    patterns = [p for p in patterns if not all(t.op in "?*" for t in parse_pattern(p))]
+    found = matcher(*patterns).find(words)
+    assert found == naive_find(words, patterns)
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+def test_words_should_be_read_once(conjugation):
+    words = conjugation.tokenize("本を読む" * 500)
+    m = matcher("_+ base=。", "pos=Verb _* base=。")
+    steps = []
+    step = m._step
+    m._step = lambda *args: steps.append(args) or step(*args)
+    assert m.find(words) == []
+    assert len(steps) == len(words)
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+def test_failed_longer_matches_should_not_be_read_again(conjugation):
+    words = conjugation.tokenize("本" * 1000)
+    m = matcher("base=本 _* base=猫", "base=本")
+    steps = []
+    step = m._step
+    m._step = lambda *args: steps.append(args) or step(*args)
+    assert m.find(words) == [Match("1", i, i + 1) for i in range(len(words))]
+    assert len(steps) <= 3 * len(words)
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_longest_and_first_pattern_should_win(conjugation):
+    doc = Doc("本を読みます。", conjugation)
+    m = matcher("pos=Verb", "pos=Verb base=ます", "pos=Verb _")
+    assert m.find(doc) == [Match("1", 2, 4)]
+    assert m.find(doc.words[:3]) == [Match("0", 2, 3)]
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_matches_should_be_edited_in_batch(conjugation):
+    doc = Doc(TEXT, conjugation)
+    m = Matcher()
+    m.add("noun", [Token(Condition(pos=Noun)), Token(Condition(base="を"))])
+    m.add("verb", [Token(Condition(pos=Verb)), Token(Condition(base="ます"), "?")])
+    matches = m.find(doc)
+    with doc.batch():
+        for match in matches:
+            if match.key == "noun":
+                doc.delete(match.range)
+    assert doc.get_text() == "読みます。書きました。美しい花が咲いた。"
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["", "pos=Verb?", "_*", "pos=Nothing", "word=本", "? pos=Verb", "base="],
+)
+def test_invalid_patterns(pattern):
+    with pytest.raises(ScriptSyntaxError):
+        Matcher().add("x", pattern)
+    with pytest.raises(ScriptSyntaxError):
+        Matcher().add("x", [Token(Condition(), "!")])
@@ -0,0 +1,43 @@
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.replace import LemmaReplacer, replace_corpus
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+MAPPING = {"購入する": "買う", "書く": "読む"}
+
+
+class TestLemmaReplacer:
+    @pytest.mark.parametrize("conjugation", conjugations)
+    @pytest.mark.parametrize(
+        "text, expect",
+        [
+            ("本を購入しました。", "本を買いました。"),
+            ("本を書きました。", "本を読みました。"),
+            ("本を書いた。車を購入した。", "本を読んだ。車を買った。"),
+            ("購入者は本を書かない。", "購入者は本を読まない。"),
+            ("雨が降った。", "雨が降った。"),
+        ],
+    )
+    def test_replace_text(self, conjugation, text, expect):
+        replacer = LemmaReplacer(MAPPING, conjugation)
+        assert replacer.replace_text(text) == expect
+
+    @pytest.mark.parametrize("conjugation", [conjugations[0]])
+    def test_replace_returns_the_number_of_replacements(self, conjugation):
+        replacer = LemmaReplacer(MAPPING, conjugation)
+        doc = Doc("本を書いて、手紙を書きます。", conjugation)
+        assert replacer.replace(doc) == 2
+        assert doc.get_text() == "本を読んで、手紙を読みます。"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_replace_corpus(workers):
+    texts = ["本を購入しました。", "本を書きました。", "雨が降った。"] * 3
+    expect = ["本を買いました。", "本を読みました。", "雨が降った。"] * 3
+    result = replace_corpus(texts, MAPPING, workers=workers, chunksize=2)
+    assert list(result) == expect
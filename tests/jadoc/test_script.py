@@ -0,0 +1,100 @@
+import pickle
+
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.errors import ScriptSyntaxError
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.script import Condition, compile_script, parse_script
+from jadoc.word.ctype import GodanI
+from jadoc.word.pos import Verb
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+SCRIPT = """
+# comments and blank lines are ignored
+
+delete base=とても
+replace base=購入 base=する -> 買う  # two words
+cform base=読む -> 命令形
+"""
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+@pytest.mark.parametrize(
+    "text, expect",
+    [
+        ("とても本を読む。", "本を読め。"),
+        ("本を購入しました。とても良い。", "本を買いました。良い。"),
+        ("購入者はとてもとても少ない。", "購入者は少ない。"),
+        ("雨が降った。", "雨が降った。"),
+    ],
+)
+def test_apply(conjugation, text, expect):
+    script = compile_script(SCRIPT, conjugation)
+    doc = Doc(text, conjugation)
+    script.apply(doc)
+    assert doc.get_text() == expect
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_classes_should_match_subclasses(conjugation):
+    doc = Doc("本を書いて読んだ。", conjugation)
+    script = compile_script("delete c_type=五段活用 pos=Auxiliary", conjugation)
+    assert [(start, stop) for start, stop, _ in script.matches(doc)] == [(4, 6)]
+    script = compile_script("cform pos=動詞,c_type=Godan -> Shushi", conjugation)
+    assert script.apply(doc) == 2
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+def test_first_rule_should_win(conjugation):
+    source = "replace base=本 -> 手紙\ndelete pos=Noun\nreplace base=本 -> 紙"
+    script = compile_script(source, conjugation)
+    doc = Doc("本と紙", conjugation)
+    assert script.apply(doc) == 2
+    assert doc.get_text() == "手紙と"
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+def test_compiled_script_should_be_cached_and_picklable(conjugation):
+    script = compile_script(SCRIPT, conjugation)
+    assert compile_script(SCRIPT, conjugation) is script
+    loaded = pickle.loads(pickle.dumps(script))
+    doc = Doc("とても本を購入しました。", conjugation)
+    loaded.apply(doc)
+    assert doc.get_text() == "本を買いました。"
+
+
+def test_parse_script():
+    rules = parse_script("cform pos=動詞,c_type=GodanI surface=て -> Renyo")
+    assert rules == [
+        (
+            1,
+            "cform",
+            (Condition(pos=Verb, c_type=GodanI), Condition(surface="て")),
+            "Renyo",
+        )
+    ]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "remove base=本",
+        "delete",
+        "delete base=本 -> 紙",
+        "replace base=本",
+        "replace base=本 ->",
+        "delete base",
+        "delete lemma=本",
+        "delete pos=Noun,base=",
+        "delete pos=Nouns",
+        "cform base=読む -> 命令",
+        "-> 買う",
+    ],
+)
+def test_syntax_errors(source):
+    with pytest.raises(ScriptSyntaxError):
+        compile_script(source, conjugations[0])
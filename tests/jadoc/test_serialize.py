@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.errors import InvalidFormatError
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.serialize import (
+    decode_strings,
+    dump_words,
+    dumps_words,
+    load_words,
+    loads_words,
+)
+from jadoc.word.word import Word
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+TEXT = "美しい本を書きました。そうでありません。"
+
+
+def same_words(a, b):
+    return [word.to_dict() for word in a] == [word.to_dict() for word in b]
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_words_should_be_restored(conjugation):
+    words = conjugation.tokenize(TEXT) + [Word("x", ["x"], c_type_info="x")]
+    loaded = loads_words(dumps_words(words))
+    assert same_words(loaded, words)
+    for a, b in zip(loaded, words):
+        assert type(a.pos) == type(b.pos)
+        assert a.pos.value == b.pos.value
+        assert type(a.c_type) == type(b.c_type)
+        assert type(a.c_form) == type(b.c_form)
+
+
+def test_strings_should_be_shared():
+    word = Word("本", ["名詞"])
+    one = dumps_words([word])
+    many = dumps_words([word] * 10)
+    assert len(many) - len(one) == 9 * 6 * 4
+
+
+def test_file_objects():
+    words = [Word("本", ["名詞"])]
+    fp = io.BytesIO()
+    dump_words(words, fp)
+    fp.seek(0)
+    assert same_words(load_words(fp), words)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"XXXX" + bytes(8), dumps_words([Word("本", ["名詞"])])[:-1]],
+)
+def test_invalid_data_should_raise_error(data):
+    with pytest.raises(InvalidFormatError):
+        loads_words(data)
+
+
+@pytest.mark.parametrize("n, data", [(1, b"\x05\x00\x00\x00abc"), (2, bytes(4))])
+def test_strings_past_the_data_should_raise_error(n, data):
+    with pytest.raises(InvalidFormatError, match="past the data"):
+        decode_strings(data, n)
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_doc_should_be_restored(conjugation):
+    doc = Doc(TEXT, conjugation)
+    loaded = Doc.from_bytes(doc.to_bytes(), conjugation)
+    assert loaded.simple_view() == doc.simple_view()
+    loaded.delete(4)
+    doc.delete(4)
+    assert loaded.get_text() == doc.get_text()
@@ -0,0 +1,146 @@
+import json
+import threading
+from http.client import HTTPConnection
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from jadoc.errors import InvalidRequestError
+from jadoc.mecab import tokenizer
+from jadoc.mecab.config import get_dicdirs
+from jadoc.server import JadocServer, JadocService, TaggerPool
+
+dicdir = str(get_dicdirs()[0])
+
+
+@pytest.fixture(scope="module")
+def service():
+    return JadocService(TaggerPool(2, dicdir))
+
+
+@pytest.fixture(scope="module")
+def url(service):
+    server = JadocServer(("127.0.0.1", 0), service, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, path, body=None):
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    try:
+        with urlopen(Request(url + path, data=data)) as response:
+            return response.status, json.loads(response.read().decode("utf-8"))
+    except HTTPError as e:
+        return e.code, json.loads(e.read().decode("utf-8"))
+
+
+class TestJadocService:
+    def test_tokenize(self, service):
+        result = service.handle("tokenize", {"texts": ["本を読む", ""]})
+        words = result["results"]
+        assert [word["surface"] for word in words[0]] == ["本", "を", "読む"]
+        assert words[1] == []
+
+    @pytest.mark.parametrize("c_form", ["連用形", "Renyo"])
+    def test_conjugate(self, service, c_form):
+        result = service.handle("conjugate", {"texts": ["本を読む"], "c_form": c_form})
+        assert result["results"] == ["本を読み"]
+
+    def test_edit(self, service):
+        texts = ["本を購入しました。", "とても良い。"]
+        result = service.handle(
+            "edit", {"texts": texts, "script": "delete base=とても"}
+        )
+        assert result["results"] == ["本を購入しました。", "良い。"]
+        result = service.handle(
+            "edit", {"texts": texts, "mapping": {"購入する": "買う"}}
+        )
+        assert result["results"] == ["本を買いました。", "とても良い。"]
+
+    @pytest.mark.parametrize(
+        "endpoint, body",
+        [
+            ("tokenize", {"texts": "本"}),
+            ("conjugate", {"texts": ["本"], "c_form": "連用"}),
+            ("edit", {"texts": ["本"]}),
+            ("edit", {"texts": ["本"], "script": "x", "mapping": {}}),
+            ("edit", {"texts": ["本"], "mapping": []}),
+            ("edit", {"texts": ["本"], "mapping": {"本": 1}}),
+        ],
+    )
+    def test_invalid_requests(self, service, endpoint, body):
+        with pytest.raises(InvalidRequestError):
+            service.handle(endpoint, body)
+
+    def test_pool_should_be_returned(self, service):
+        with service.pool.acquire():
+            assert service.pool.idle == 1
+        assert service.pool.idle == 2
+        assert service.pool.waiting == 0
+
+    def test_pool_should_not_find_node_format_again(self, service, monkeypatch):
+        def find_node_format(dicdir=None):
+            raise AssertionError("node_format is found again")
+
+        monkeypatch.setattr(tokenizer, "_find_node_format", find_node_format)
+        pool = TaggerPool(2, dicdir)
+        with pool.acquire() as conjugation:
+            assert conjugation.tokenize("本")[0].base == "本"
+
+
+class TestJadocServer:
+    def test_requests(self, url):
+        assert request(url, "/health") == (200, {"status": "ok"})
+        status, body = request(url, "/tokenize", {"texts": ["本"]})
+        assert status == 200
+        assert body["results"][0][0]["surface"] == "本"
+
+    @pytest.mark.parametrize(
+        "path, body, status",
+        [
+            ("/unknown", None, 404),
+            ("/unknown", {}, 404),
+            ("/tokenize", [], 400),
+            ("/edit", {"texts": ["本"], "script": "oops"}, 400),
+            ("/edit", {"texts": ["本"], "mapping": {"本": None}}, 400),
+        ],
+    )
+    def test_errors(self, url, path, body, status):
+        code, response = request(url, path, body)
+        assert code == status
+        assert "error" in response
+
+    @pytest.mark.parametrize(
+        "length, status", [(None, 411), ("-1", 400), ("ten", 400), ("1_0", 400)]
+    )
+    def test_invalid_content_length(self, url, length, status):
+        connection = HTTPConnection(url[len("http://") :])
+        connection.putrequest("POST", "/tokenize")
+        if length is not None:
+            connection.putheader("Content-Length", length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == status
+        assert "error" in json.loads(response.read().decode("utf-8"))
+        connection.close()
+
+    def test_metrics(self, url):
+        threads = [
+            threading.Thread(target=request, args=(url, "/tokenize", {"texts": ["本"]}))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        status, metrics = request(url, "/metrics")
+        assert status == 200
+        assert metrics["pool_size"] == metrics["idle_taggers"] == 2
+        assert metrics["queue_depth"] == 0
+        tokenize = metrics["endpoints"]["tokenize"]
+        assert tokenize["count"] >= 8
+        assert 0 <= tokenize["p50_ms"] <= tokenize["p95_ms"] <= tokenize["max_ms"]
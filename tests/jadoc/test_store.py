@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.errors import InvalidFormatError
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.store import STRINGS_FILE, WORDS_FILE, CorpusReader, CorpusWriter
+from jadoc.word.word import Word
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+TEXTS = ["美しい本を書きました。", "", "そうでありません。", "本を読む。"]
+
+
+def same_words(a, b):
+    return [word.to_dict() for word in a] == [word.to_dict() for word in b]
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_documents_should_be_restored_by_id(conjugation, tmp_path):
+    docs = [conjugation.tokenize(text) for text in TEXTS]
+    with CorpusWriter(str(tmp_path)) as writer:
+        ids = [writer.add(words) for words in docs]
+    assert ids == list(range(len(TEXTS)))
+    with CorpusReader(str(tmp_path)) as reader:
+        assert len(reader) == len(TEXTS)
+        for i in reversed(ids):
+            assert same_words(reader[i], docs[i])
+            assert same_words(list(reader.iter_words(i)), docs[i])
+        assert same_words(reader[-1], docs[-1])
+        assert [len(words) for words in reader] == [len(words) for words in docs]
+        doc = reader.doc(0, conjugation)
+        doc.delete(4)
+        assert doc.get_text() == "美しい本を書いた。"
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+def test_append(conjugation, tmp_path):
+    path = str(tmp_path)
+    with CorpusWriter(path) as writer:
+        writer.add(conjugation.tokenize(TEXTS[0]))
+    with CorpusWriter(path, append=True) as writer:
+        assert writer.add(conjugation.tokenize(TEXTS[2])) == 1
+    with CorpusWriter(path, append=True) as writer:
+        writer.add(conjugation.tokenize(TEXTS[0]))
+    with CorpusReader(path) as reader:
+        assert len(reader) == 3
+        assert same_words(reader[1], conjugation.tokenize(TEXTS[2]))
+        assert same_words(reader[2], reader[0])
+        assert len(reader.strings) == len(set(reader.strings))
+
+
+def test_documents_should_be_visible_after_flush(tmp_path):
+    path = str(tmp_path)
+    writer = CorpusWriter(path)
+    writer.add([Word("本", ["名詞"])])
+    with CorpusReader(path) as reader:
+        assert len(reader) == 0
+    writer.flush()
+    writer.add([Word("紙", ["名詞"])])
+    with CorpusReader(path) as reader:
+        assert len(reader) == 1
+        assert reader[0][0].surface == "本"
+    writer.close()
+    writer.close()
+
+
+def test_append_should_drop_unflushed_words(tmp_path):
+    path = str(tmp_path)
+    with CorpusWriter(path) as writer:
+        writer.add([Word("本", ["名詞"])])
+    with open(os.path.join(path, WORDS_FILE), "ab") as fp:
+        fp.write(b"\x00" * 10)
+    with CorpusWriter(path, append=True) as writer:
+        writer.add([Word("紙", ["名詞"])])
+    with CorpusReader(path) as reader:
+        assert [words[0].surface for words in reader] == ["本", "紙"]
+
+
+def test_append_should_drop_unflushed_strings(tmp_path):
+    path = str(tmp_path)
+    with CorpusWriter(path) as writer:
+        writer.add([Word("本", ["名詞"])])
+    # a block of strings flushed by a writer that died before its offsets
+    with open(os.path.join(path, STRINGS_FILE), "ab") as fp:
+        fp.write(b"\x01\x00\x00\x00\x03\x00\x00\x00")
+    with CorpusReader(path) as reader:
+        assert reader[0][0].surface == "本"
+    with CorpusWriter(path, append=True) as writer:
+        writer.add([Word("紙", ["名詞"])])
+    with CorpusReader(path) as reader:
+        assert [words[0].surface for words in reader] == ["本", "紙"]
+
+
+@pytest.mark.parametrize("i", [2, -3])
+def test_index_out_of_range(i, tmp_path):
+    with CorpusWriter(str(tmp_path)) as writer:
+        writer.add([])
+        writer.add([])
+    with CorpusReader(str(tmp_path)) as reader:
+        with pytest.raises(IndexError):
+            reader[i]
+
+
+def test_invalid_store(tmp_path):
+    with CorpusWriter(str(tmp_path)):
+        pass
+    with open(os.path.join(str(tmp_path), WORDS_FILE), "wb") as fp:
+        fp.write(b"JDW1")
+    with pytest.raises(InvalidFormatError):
+        CorpusReader(str(tmp_path))
@@ -0,0 +1,100 @@
+import pytest
+
+from jadoc.conj import Conjugation
+from jadoc.doc import Doc
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import generate_tokenizer
+from jadoc.style import StyleConverter, convert_corpus
+
+conjugations = [Conjugation(generate_tokenizer(dicdir)) for dicdir in get_dicdirs()]
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+@pytest.mark.parametrize(
+    "text, expect",
+    [
+        ("本を読みます。", "本を読む。"),
+        ("本を読みました。", "本を読んだ。"),
+        ("本を書きました。", "本を書いた。"),
+        ("川で泳ぎました。", "川で泳いだ。"),
+        ("本を読みません。", "本を読まない。"),
+        ("本を読みませんでした。", "本を読まなかった。"),
+        ("本を読みましょう。", "本を読もう。"),
+        ("本です。", "本だ。"),
+        ("本でした。", "本だった。"),
+        ("本でしょう。", "本だろう。"),
+        ("美しいです。", "美しい。"),
+        ("美しかったです。", "美しかった。"),
+        ("本を読んだ。", "本を読んだ。"),
+        ("分かりませんです", "分からない"),
+    ],
+)
+def test_to_plain(conjugation, text, expect):
+    converter = StyleConverter("plain", conjugation)
+    assert converter.convert_text(text) == expect
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+@pytest.mark.parametrize(
+    "text, expect",
+    [
+        ("本を読む。", "本を読みます。"),
+        ("本を読んだ。", "本を読みました。"),
+        ("川で泳いだ。", "川で泳ぎました。"),
+        ("本を読まない。", "本を読みません。"),
+        ("本を読まなかった。", "本を読みませんでした。"),
+        ("本を読もう。", "本を読みましょう。"),
+        ("本だ。", "本です。"),
+        ("本だった。", "本でした。"),
+        ("本だろう。", "本でしょう。"),
+        ("美しい。", "美しいです。"),
+        ("美しかった。", "美しかったです。"),
+        ("本を読むよ。", "本を読みますよ。"),
+        ("本を読む本だ。", "本を読む本です。"),
+        ("本を読みます。", "本を読みます。"),
+    ],
+)
+def test_to_polite(conjugation, text, expect):
+    converter = StyleConverter("polite", conjugation)
+    assert converter.convert_text(text) == expect
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_convert_should_be_one_step(conjugation):
+    doc = Doc("本を読みました。本でした。", conjugation, history_size=10)
+    assert StyleConverter("plain", conjugation).convert(doc) == 2
+    assert doc.get_text() == "本を読んだ。本だった。"
+    doc.undo()
+    assert doc.get_text() == "本を読みました。本でした。"
+
+
+@pytest.mark.parametrize("conjugation", conjugations)
+def test_convert_in_batch(conjugation):
+    doc = Doc("本を読みました。", conjugation)
+    converter = StyleConverter("plain", conjugation)
+    with doc.batch():
+        with pytest.raises(ValueError):
+            converter.convert(doc)
+
+
+@pytest.mark.parametrize("conjugation", [conjugations[0]])
+def test_unexpected_tokenizer(conjugation):
+    tokenize = conjugation.tokenize
+    unexpected = conjugation.with_tokenizer(lambda t: tokenize(t.replace("だ", "です")))
+    with pytest.raises(ValueError):
+        StyleConverter("plain", unexpected)
+
+
+def test_unknown_style():
+    with pytest.raises(ValueError):
+        StyleConverter("formal", conjugations[0])
+    with pytest.raises(ValueError):
+        next(convert_corpus(["本です。"], "formal"))
+
+
+@pytest.mark.parametrize("dicdir", [str(dicdir) for dicdir in get_dicdirs()])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_corpus(dicdir, workers):
+    texts = ["本を読みました。", "本でした。", "本を読んだ。"] * 5
+    converted = convert_corpus(texts, "plain", workers, chunksize=2, dicdir=dicdir)
+    assert list(converted) == ["本を読んだ。", "本だった。", "本を読んだ。"] * 5
@@ -1,8 +1,9 @@
 import os
+import sys
 
 import pytest
 
-from jadoc.utils import ENV_DEBUG, debug_on
+from jadoc.utils import ENV_DEBUG, debug_on, deep_getsizeof
 
 
 class TestUtils:
@@ -22,3 +23,18 @@ class TestUtils:
     def test_debug_mode_should_be_disabled(self, env_value):
         os.environ[ENV_DEBUG] = env_value
         assert not debug_on()
+
+    def test_deep_getsizeof(self):
+        class Slotted:
+            __slots__ = ("value",)
+
+            def __init__(self, value):
+                self.value = value
+
+        items = ["a" * 100, {"key": ("b" * 100,)}]
+        size = deep_getsizeof(items)
+        assert size > sys.getsizeof(items) + 200
+        assert deep_getsizeof(Slotted(items)) == sys.getsizeof(Slotted(None)) + size
+        seen = set()
+        assert deep_getsizeof(items, seen) == size
+        assert deep_getsizeof([items], seen) == sys.getsizeof([items])
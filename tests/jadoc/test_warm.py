@@ -0,0 +1,60 @@
+import gc
+import os
+
+import pytest
+
+import jadoc
+from jadoc.doc import Doc
+from jadoc.mecab.config import get_dicdirs
+from jadoc.mecab.tokenizer import _fork_safe_taggers
+from jadoc.replace import LemmaReplacer
+from jadoc.warm import default_conjugation, preload, preloaded
+
+dicdir = str(get_dicdirs()[0])
+
+
+def test_preload_should_be_shared():
+    conjugation = preload(dicdir, freeze=False)
+    assert preload(dicdir, freeze=False) is conjugation
+    assert jadoc.preload(dicdir, freeze=False) is conjugation
+    assert preloaded(dicdir) is conjugation
+    assert preloaded(dicdir, r"%m\\n") is None
+
+
+def test_defaults_should_use_the_preloaded_conjugation():
+    conjugation = jadoc.preload(freeze=False)
+    assert default_conjugation() is conjugation
+    assert Doc("本を読む").conjugation is conjugation
+    assert LemmaReplacer({"読む": "書く"}).conjugation is conjugation
+
+
+@pytest.mark.skipif(not hasattr(gc, "freeze"), reason="Python 3.7+")
+def test_preload_should_freeze_objects():
+    preload(dicdir)
+    try:
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork is not available")
+def test_forked_child_should_create_its_own_tagger():
+    conjugation = preload(dicdir, freeze=False)
+    taggers = list(_fork_safe_taggers)
+    assert all(tagger.tagger is not None for tagger in taggers)
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        try:
+            dropped = all(tagger.tagger is None for tagger in taggers)
+            words = conjugation.tokenize("本を読む")
+            ok = dropped and [word.surface for word in words] == ["本", "を", "読む"]
+            os.write(write, b"1" if ok else b"0")
+        finally:
+            os._exit(0)
+    os.close(write)
+    result = os.read(read, 1)
+    os.close(read)
+    os.waitpid(pid, 0)
+    assert result == b"1"
+    assert all(tagger.tagger is not None for tagger in taggers)